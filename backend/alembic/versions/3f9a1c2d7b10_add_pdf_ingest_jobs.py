@@ -0,0 +1,54 @@
+"""add pdf ingest jobs
+
+Revision ID: 3f9a1c2d7b10
+Revises: 75cf19be12c7
+Create Date: 2026-10-18 10:12:04.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b10'
+down_revision: Union[str, None] = '75cf19be12c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pdf_ingest_jobs',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('pdf_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('stage', sa.String(length=20), nullable=True),
+    sa.Column('pages_total', sa.Integer(), nullable=True),
+    sa.Column('pages_done', sa.Integer(), nullable=True),
+    sa.Column('text_pages_total', sa.Integer(), nullable=True),
+    sa.Column('text_pages_done', sa.Integer(), nullable=True),
+    sa.Column('chunks_total', sa.Integer(), nullable=True),
+    sa.Column('chunks_done', sa.Integer(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['pdf_id'], ['pdf_notes.pdf_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index(op.f('ix_pdf_ingest_jobs_job_id'), 'pdf_ingest_jobs', ['job_id'], unique=False)
+    op.create_index(op.f('ix_pdf_ingest_jobs_pdf_id'), 'pdf_ingest_jobs', ['pdf_id'], unique=False)
+    op.create_index(op.f('ix_pdf_ingest_jobs_status'), 'pdf_ingest_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pdf_ingest_jobs_status'), table_name='pdf_ingest_jobs')
+    op.drop_index(op.f('ix_pdf_ingest_jobs_pdf_id'), table_name='pdf_ingest_jobs')
+    op.drop_index(op.f('ix_pdf_ingest_jobs_job_id'), table_name='pdf_ingest_jobs')
+    op.drop_table('pdf_ingest_jobs')
@@ -0,0 +1,41 @@
+"""add pdf blobs (content-addressed pdf files)
+
+Revision ID: a41c8e5f02d9
+Revises: 3f9a1c2d7b10
+Create Date: 2026-10-18 13:02:41.553120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c8e5f02d9'
+down_revision: Union[str, None] = '3f9a1c2d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pdf_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_path', sa.Text(), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('pdf_notes', sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_pdf_notes_blob_sha256'), 'pdf_notes', ['blob_sha256'], unique=False)
+    op.create_foreign_key('fk_pdf_notes_blob_sha256', 'pdf_notes', 'pdf_blobs', ['blob_sha256'], ['sha256'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_pdf_notes_blob_sha256', 'pdf_notes', type_='foreignkey')
+    op.drop_index(op.f('ix_pdf_notes_blob_sha256'), table_name='pdf_notes')
+    op.drop_column('pdf_notes', 'blob_sha256')
+    op.drop_table('pdf_blobs')
@@ -0,0 +1,28 @@
+"""add packed stroke data to pdf_annotation
+
+Revision ID: b5e1d7c3a820
+Revises: e3b8f6a2c914
+Create Date: 2026-10-18 18:05:41.553120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1d7c3a820'
+down_revision: Union[str, None] = 'e3b8f6a2c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pdf_annotation', sa.Column('stroke_data', sa.LargeBinary(length=16777216), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pdf_annotation', 'stroke_data')
@@ -0,0 +1,46 @@
+"""add pdf upload sessions (resumable upload)
+
+Revision ID: c7d2e9b41a55
+Revises: a41c8e5f02d9
+Create Date: 2026-10-18 14:20:17.902311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9b41a55'
+down_revision: Union[str, None] = 'a41c8e5f02d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pdf_upload_sessions',
+    sa.Column('upload_id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=True),
+    sa.Column('folder_id', sa.Integer(), nullable=True),
+    sa.Column('total_size', sa.BigInteger(), nullable=False),
+    sa.Column('offset', sa.BigInteger(), nullable=False),
+    sa.Column('part_path', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('pdf_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['folder_id'], ['folders.folder_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('upload_id')
+    )
+    op.create_index(op.f('ix_pdf_upload_sessions_user_id'), 'pdf_upload_sessions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pdf_upload_sessions_user_id'), table_name='pdf_upload_sessions')
+    op.drop_table('pdf_upload_sessions')
@@ -0,0 +1,50 @@
+"""add per-page annotation versions for incremental sync
+
+Revision ID: d91c4a7e2f36
+Revises: b5e1d7c3a820
+Create Date: 2026-10-18 19:12:08.340517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91c4a7e2f36'
+down_revision: Union[str, None] = 'b5e1d7c3a820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pdf_pages', sa.Column('annotation_version', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('pdf_annotation', sa.Column('stroke_uid', sa.String(length=64), nullable=True))
+    op.add_column('pdf_annotation', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('pdf_annotation', sa.Column('deleted_version', sa.Integer(), nullable=True))
+    op.create_index('ix_pdf_annotation_page_stroke', 'pdf_annotation', ['page_id', 'stroke_uid'], unique=True)
+    op.create_index('ix_pdf_annotation_page_version', 'pdf_annotation', ['page_id', 'version'])
+
+    # 기존 필기는 버전 1에 만들어진 것으로, id 는 legacy-{annotations_id}
+    annotation = sa.table('pdf_annotation', sa.column('annotations_id', sa.Integer), sa.column('stroke_uid'), sa.column('version'))
+    op.execute(annotation.update().values(
+        version=1,
+        stroke_uid=sa.literal('legacy-') + sa.cast(annotation.c.annotations_id, sa.String(20)),
+    ))
+    op.execute(
+        "UPDATE pdf_pages SET annotation_version = 1 "
+        "WHERE page_id IN (SELECT DISTINCT page_id FROM pdf_annotation)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM pdf_annotation WHERE deleted_version IS NOT NULL")
+    op.drop_index('ix_pdf_annotation_page_version', table_name='pdf_annotation')
+    op.drop_index('ix_pdf_annotation_page_stroke', table_name='pdf_annotation')
+    op.drop_column('pdf_annotation', 'deleted_version')
+    op.drop_column('pdf_annotation', 'version')
+    op.drop_column('pdf_annotation', 'stroke_uid')
+    op.drop_column('pdf_pages', 'annotation_version')
@@ -0,0 +1,28 @@
+"""add packed per-page metadata to pdf_notes
+
+Revision ID: e3b8f6a2c914
+Revises: c7d2e9b41a55
+Create Date: 2026-10-18 15:40:12.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8f6a2c914'
+down_revision: Union[str, None] = 'c7d2e9b41a55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pdf_notes', sa.Column('page_meta', sa.LargeBinary(length=16777216), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pdf_notes', 'page_meta')
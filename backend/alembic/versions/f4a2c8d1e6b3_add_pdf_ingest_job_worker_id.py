@@ -0,0 +1,28 @@
+"""add worker_id to pdf ingest jobs
+
+Revision ID: f4a2c8d1e6b3
+Revises: d91c4a7e2f36
+Create Date: 2026-10-18 21:40:51.207318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a2c8d1e6b3'
+down_revision: Union[str, None] = 'd91c4a7e2f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pdf_ingest_jobs', sa.Column('worker_id', sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pdf_ingest_jobs', 'worker_id')
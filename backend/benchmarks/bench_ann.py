@@ -0,0 +1,126 @@
+# backend/benchmarks/bench_ann.py
+"""
+근사 검색(ANN) 벤치마크: flat(정확) vs ivf_flat / hnsw / ivf_pq 의 recall@k 와 질의 지연
+
+- 합성 코퍼스: 주제(군집) 중심 + 저차원 변형으로 만든 단위 벡터 (실제 문서 임베딩처럼 주제별로 뭉쳐 있음)
+- 정답은 flat 검색 결과, 각 모드는 같은 질의 k개 중 정답과 겹치는 비율(recall@k)로 비교
+- 질의는 채팅과 같이 한 번에 1개씩, nprobe / efSearch 를 바꿔 가며 재현율-지연 곡선을 출력
+- 인덱스 생성은 서비스와 같은 코드(services/ann_index.build_index)를 사용
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_ann --vectors 50000 --dim 1536
+    python -m benchmarks.bench_ann --vectors 200000 --dim 384 --modes ivf_flat,ivf_pq --nprobe 8,32,128
+"""
+import argparse
+import time
+
+import numpy as np
+
+from services import ann_index
+
+
+def make_corpus(n: int, d: int, clusters: int, queries: int, latent: int = 32, seed: int = 0):
+    """
+    주제 중심 + 저차원(latent) 변형 + 약한 잡음 → 단위 벡터
+    (문서 임베딩은 차원은 높아도 실제로는 낮은 차원 구조를 가짐. 등방성 잡음만 쓰면 이웃 구분이 안 돼 비현실적)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, d)).astype("float32")
+    basis = rng.standard_normal((latent, d)).astype("float32")
+    labels = rng.integers(0, clusters, n + queries)
+    data = (
+        centers[labels]
+        + 0.25 * rng.standard_normal((n + queries, latent)).astype("float32") @ basis
+        + 0.1 * rng.standard_normal((n + queries, d)).astype("float32")
+    )
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data[:n], data[n:]
+
+
+def _index_bytes(index) -> int:
+    import faiss
+    return len(faiss.serialize_index(index))
+
+
+def _measure(index, queries: np.ndarray, k: int, params, threads: int) -> tuple:
+    import faiss
+    build_threads = faiss.omp_get_max_threads()
+    faiss.omp_set_num_threads(threads)
+    labels = np.empty((len(queries), k), dtype="int64")
+    latencies = []
+    for i, q in enumerate(queries):
+        started = time.perf_counter()
+        _, labels[i] = index.search(q[None, :], k, params=params)
+        latencies.append(time.perf_counter() - started)
+    faiss.omp_set_num_threads(build_threads)
+    return labels, np.array(latencies) * 1000
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=200, help="합성 코퍼스 주제(군집) 수")
+    parser.add_argument("--latent", type=int, default=32, help="군집 안 변형의 실제 차원 (클수록 어려운 코퍼스)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--modes", default="ivf_flat,hnsw,ivf_pq")
+    parser.add_argument("--nprobe", default="1,4,16,64")
+    parser.add_argument("--ef-search", default="16,64,256")
+    parser.add_argument("--threads", type=int, default=1, help="검색 시 faiss OpenMP 스레드 수 (생성은 전체 코어 사용)")
+    args = parser.parse_args()
+
+    import faiss
+
+    corpus, queries = make_corpus(args.vectors, args.dim, args.clusters, args.queries, args.latent)
+    ids = np.arange(len(corpus), dtype="int64")
+    print(f"corpus={args.vectors}x{args.dim}, queries={args.queries}, k={args.k}, "
+          f"auto → {ann_index.choose_kind(args.vectors)} (VECTOR_INDEX_AUTO={ann_index.AUTO_POLICY})")
+
+    started = time.perf_counter()
+    flat = ann_index.build_index(corpus, ids, kind="flat")
+    flat_build = time.perf_counter() - started
+    truth, flat_ms = _measure(flat, queries, args.k, None, args.threads)
+
+    header = f"{'mode':<10} {'param':<14} {'build(s)':>9} {'MB':>8} {'recall@' + str(args.k):>10} {'p50(ms)':>9} {'p95(ms)':>9}"
+    print()
+    print(header)
+    print("-" * len(header))
+
+    def _row(mode, param, build, size, recall, ms):
+        print(f"{mode:<10} {param:<14} {build:9.2f} {size / 1024 / 1024:8.1f} {recall:10.4f} "
+              f"{np.percentile(ms, 50):9.3f} {np.percentile(ms, 95):9.3f}")
+
+    _row("flat", "exact", flat_build, _index_bytes(flat), 1.0, flat_ms)
+
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        started = time.perf_counter()
+        index = ann_index.build_index(corpus, ids, kind=mode)
+        build = time.perf_counter() - started
+        size = _index_bytes(index)
+
+        if mode in ("ivf_flat", "ivf_pq"):
+            nlist = faiss.extract_index_ivf(index).nlist
+            sweep = [("nprobe", int(v)) for v in args.nprobe.split(",") if int(v) <= nlist]
+        elif mode == "hnsw":
+            sweep = [("efSearch", int(v)) for v in args.ef_search.split(",")]
+        else:
+            sweep = [("", None)]
+
+        for name, value in sweep:
+            params = ann_index.search_params(
+                index,
+                nprobe=value if name == "nprobe" else None,
+                ef_search=value if name == "efSearch" else None,
+            )
+            found, ms = _measure(index, queries, args.k, params, args.threads)
+            _row(mode, f"{name}={value}" if name else "-", build, size, _recall(found, truth), ms)
+
+
+if __name__ == "__main__":
+    main()
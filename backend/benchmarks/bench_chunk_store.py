@@ -0,0 +1,95 @@
+# backend/benchmarks/bench_chunk_store.py
+"""
+검색 결과 청크 조회 벤치마크: pickle 청크 목록 vs mmap 청크 저장소 (utils/chunk_store.py)
+
+- 같은 청크 N개를 두 포맷으로 저장한 뒤, 질의마다 파일을 열어 top_k개 원문을 꺼내는 시간
+  (예전 search_similar_chunks 는 매 질의마다 pkl 전체를 언피클했음)
+- 열어 둔 상태에서 k개 조회만 하는 시간, 파일 크기, 조회 중 늘어난 메모리(tracemalloc)도 출력
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_chunk_store --chunks 200000 --k 3
+"""
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from utils.chunk_store import ChunkMeta, ChunkStore, write_chunk_store
+
+
+def _timeit(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def _peak_kb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--chunk-chars", type=int, default=300)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    base = ("선형대수 고유값 분해와 대각화 예제. Eigenvalue decomposition. " * 20)[: args.chunk_chars]
+    chunks = [f"{i} {base}" for i in range(args.chunks)]
+    metas = [ChunkMeta(1, i // 10 + 1, i * 250, i * 250 + len(c)) for i, c in enumerate(chunks)]
+    rng = np.random.default_rng(0)
+    hits = [rng.integers(0, args.chunks, args.k).tolist() for _ in range(args.repeat)]
+
+    tmp_dir = tempfile.mkdtemp(prefix="chunk_store_bench_")
+    try:
+        pkl_path = os.path.join(tmp_dir, "chunks.pkl")
+        store_path = os.path.join(tmp_dir, "chunks.cstore")
+        with open(pkl_path, "wb") as f:
+            pickle.dump(chunks, f)
+        write_chunk_store(store_path, chunks, metas)
+
+        queries = iter(hits * 3)
+
+        def pkl_query():
+            with open(pkl_path, "rb") as f:
+                data = pickle.load(f)
+            return [data[i] for i in next(queries)]
+
+        def store_query():
+            store = ChunkStore(store_path)
+            return [store[i] for i in next(queries)]
+
+        pkl_ms = _timeit(pkl_query, args.repeat)
+        store_ms = _timeit(store_query, args.repeat)
+        queries = iter(hits * 3)
+        pkl_kb = _peak_kb(pkl_query)
+        store_kb = _peak_kb(store_query)
+
+        opened = ChunkStore(store_path)
+        with open(pkl_path, "rb") as f:
+            loaded = pickle.load(f)
+        assert all(opened[i] == loaded[i] for i in hits[0]), "두 포맷의 청크 내용이 다릅니다."
+        lookup_us = _timeit(lambda: [(opened[i], opened.meta(i)) for i in hits[0]], 1000) * 1000
+
+        print()
+        print(f"chunks={args.chunks}, chunk_chars={args.chunk_chars}, k={args.k}")
+        print(f"  pickle  : {os.path.getsize(pkl_path) / 1024 / 1024:7.1f}MB, open+lookup {pkl_ms:8.2f}ms, peak {pkl_kb / 1024:8.1f}MB")
+        print(f"  cstore  : {os.path.getsize(store_path) / 1024 / 1024:7.1f}MB, open+lookup {store_ms:8.2f}ms, peak {store_kb / 1024:8.1f}MB")
+        print(f"  cstore lookup only (opened, text+meta × {args.k}): {lookup_us:.1f}µs")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_embeddings.py
+"""
+임베딩 벤치마크: 청크마다 get_embedding 순차 호출 vs embed_texts(배치 + 동시 전송) vs 캐시 적중
+
+로컬 stub 서버(scripts/stub_embedding_server.py)를 띄워서 측정하므로 API 키/과금 없음.
+요청당 지연(--latency)으로 실제 API 왕복 시간을 흉내 낸다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_embeddings --chunks 1000 --latency 80
+    python -m benchmarks.bench_embeddings --chunks 1000 --fail-rate 0.2   # 재시도/누락 없음 확인
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from scripts.stub_embedding_server import start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--chunk-chars", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=80, help="stub 요청당 지연(ms)")
+    parser.add_argument("--per-input", type=float, default=0.2, help="stub 입력당 지연(ms)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--sequential-sample", type=int, default=100, help="순차 호출은 이만큼만 재고 전체로 환산")
+    args = parser.parse_args()
+
+    server, base_url, stats = start_stub_server(
+        latency_ms=args.latency, per_input_ms=args.per_input, fail_rate=args.fail_rate
+    )
+    # 클라이언트/캐시는 import 시점에 설정되므로 먼저 환경변수 설정 (캐시는 빈 임시 파일)
+    cache_dir = tempfile.mkdtemp(prefix="emb_cache_bench_")
+    os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(cache_dir, "cache.sqlite3")
+    os.environ["EMBEDDING_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("EMBEDDING_BACKOFF_BASE", "0.05")
+    from services.embedding_client import embed_texts, BATCH_MAX_INPUTS, CONCURRENCY
+    from services.embedding_service import get_embedding
+    from services import embedding_cache
+
+    chunks = [f"청크 {i}: " + ("선형대수 고유값 분해 예제 " * 40)[: args.chunk_chars] for i in range(args.chunks)]
+
+    try:
+        # 1) 기존 방식: 청크마다 HTTP 1회 (샘플만 측정, 뒤 측정과 캐시가 겹치지 않도록 다른 텍스트)
+        sample = [f"seq {c}" for c in chunks[: args.sequential_sample]]
+        started = time.perf_counter()
+        ok = sum(1 for c in sample if get_embedding(c) is not None)
+        seq_per_chunk = (time.perf_counter() - started) / len(sample)
+        seq_estimate = seq_per_chunk * len(chunks)
+
+        # 2) 배치 + 동시 전송
+        requests_before = stats["requests"]
+        report = embed_texts(chunks)
+        batch_requests = stats["requests"] - requests_before
+
+        # 3) 같은 청크 다시 (다른 사용자가 같은 교재 업로드) → 캐시 적중
+        requests_before = stats["requests"]
+        warm = embed_texts(chunks)
+        warm_requests = stats["requests"] - requests_before
+
+        print()
+        print(f"chunks={args.chunks}, latency={args.latency}ms, fail_rate={args.fail_rate}, "
+              f"batch_inputs={BATCH_MAX_INPUTS}, concurrency={CONCURRENCY}")
+        print(f"  sequential get_embedding : ~{seq_estimate:7.2f}s  ({len(sample)}개 샘플 {ok}개 성공, 전체 환산)")
+        print(f"  embed_texts (batched)    :  {report['elapsed']:7.2f}s  requests={batch_requests}, retries={report['retries']}")
+        print(f"  succeeded={report['succeeded']}, failed={len(report['failed'])}, skipped={len(report['skipped'])}")
+        if report["elapsed"] > 0:
+            print(f"  speedup                  : {seq_estimate / report['elapsed']:7.1f}x")
+        print(f"  embed_texts (cache warm) :  {warm['elapsed']:7.2f}s  requests={warm_requests}, cache_hits={warm['cache_hits']}")
+        cache = embedding_cache.stats()
+        print(f"  cache: entries={cache['entries']}, {cache['bytes'] / 1024:.0f}KB ({cache['dtype']}), hit_rate={cache['hit_rate']}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
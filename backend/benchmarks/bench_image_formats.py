@@ -0,0 +1,45 @@
+# backend/benchmarks/bench_image_formats.py
+"""
+페이지 이미지 포맷별 크기/인코딩 시간 비교 (PNG vs JPEG vs WebP vs AVIF)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_image_formats static/pdf/*.pdf --max-pages 20
+"""
+import argparse
+import time
+
+import fitz  # PyMuPDF
+
+from utils.image_format import encode_pixmap, SUPPORTED_FORMATS, IMAGE_QUALITY
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--max-pages", type=int, default=20, help="PDF당 최대 페이지 수")
+    parser.add_argument("--scale", type=float, default=2.0)
+    parser.add_argument("--quality", type=int, default=IMAGE_QUALITY)
+    args = parser.parse_args()
+
+    totals = {fmt: 0 for fmt in SUPPORTED_FORMATS}
+    times = {fmt: 0.0 for fmt in SUPPORTED_FORMATS}
+    pages = 0
+    for path in args.pdfs:
+        with fitz.open(path) as doc:
+            for page in list(doc)[:args.max_pages]:
+                pix = page.get_pixmap(matrix=fitz.Matrix(args.scale, args.scale))
+                pages += 1
+                for fmt in SUPPORTED_FORMATS:
+                    started = time.perf_counter()
+                    totals[fmt] += len(encode_pixmap(pix, fmt, args.quality))
+                    times[fmt] += time.perf_counter() - started
+
+    png = totals["png"] or 1
+    print(f"\n{len(args.pdfs)} PDFs, {pages} pages @ {args.scale}x, quality={args.quality}")
+    for fmt in SUPPORTED_FORMATS:
+        print(f"  {fmt:5s}: {totals[fmt] / pages / 1024:8.1f} KB/page  "
+              f"({totals[fmt] / png * 100:5.1f}% of PNG)  encode {times[fmt] / pages * 1000:6.1f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_lazy_pages.py
+"""
+ingest 페이지 단계 벤치마크: 전체 썸네일 선생성(eager) vs 지연 생성(lazy)
+
+- eager: 모든 페이지 비율 계산 + 모든 페이지 썸네일 렌더링 (기존 방식)
+- lazy : 모든 페이지 비율 계산(메타데이터만) + 앞쪽 INGEST_EAGER_THUMBNAIL_PAGES장만 렌더링
+- 이후 사용자가 앞쪽 --viewed 페이지만 열어 본다고 가정했을 때 디스크 사용량도 비교
+  (페이지 행 INSERT 비용은 두 방식이 같으므로 제외)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_lazy_pages --pages 300 --viewed 10
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from benchmarks.bench_thumbnails import make_fixture
+from services.pdf_ingest_service import EAGER_THUMBNAIL_PAGES
+from utils.thumbnail import generate_thumbnails, THUMBNAIL_EXT
+
+
+def _aspect_ratios(pdf_path: str) -> list:
+    with fitz.open(pdf_path) as doc:
+        return [round(p.rect.width / p.rect.height, 5) for p in doc]
+
+
+def _dir_bytes(path: str) -> int:
+    if not os.path.isdir(path):
+        return 0
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--viewed", type=int, default=10, help="업로드 후 실제로 열어 보는 앞쪽 페이지 수")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="lazy_bench_")
+    try:
+        pdf_path = os.path.join(work_dir, "fixture.pdf")
+        make_fixture(pdf_path, args.pages)
+        pages = list(range(1, args.pages + 1))
+
+        # 1) eager
+        eager_dir = os.path.join(work_dir, "eager")
+        started = time.perf_counter()
+        _aspect_ratios(pdf_path)
+        generate_thumbnails(pdf_path, pages, os.path.join(eager_dir, f"thumb_{{page}}.{THUMBNAIL_EXT}"), workers=args.workers)
+        eager_elapsed = time.perf_counter() - started
+        eager_bytes = _dir_bytes(eager_dir)
+
+        # 2) lazy (ingest 시점)
+        lazy_dir = os.path.join(work_dir, "lazy")
+        lazy_pattern = os.path.join(lazy_dir, f"thumb_{{page}}.{THUMBNAIL_EXT}")
+        started = time.perf_counter()
+        _aspect_ratios(pdf_path)
+        generate_thumbnails(pdf_path, pages[:EAGER_THUMBNAIL_PAGES], lazy_pattern, workers=1)
+        lazy_elapsed = time.perf_counter() - started
+        lazy_ingest_bytes = _dir_bytes(lazy_dir)
+
+        # 3) lazy: 사용자가 앞쪽 N페이지를 열어 봄 (첫 요청 시 생성)
+        viewed = [n for n in pages[:args.viewed] if n > EAGER_THUMBNAIL_PAGES]
+        started = time.perf_counter()
+        if viewed:
+            generate_thumbnails(pdf_path, viewed, lazy_pattern, workers=1)
+        on_demand_elapsed = time.perf_counter() - started
+        lazy_viewed_bytes = _dir_bytes(lazy_dir)
+
+        print()
+        print(f"pages={args.pages}, eager thumbnails in lazy mode={EAGER_THUMBNAIL_PAGES}, viewed={args.viewed}, format={THUMBNAIL_EXT}")
+        print(f"  ingest eager            : {eager_elapsed:7.2f}s   disk {eager_bytes / 1024:9.1f}KB")
+        print(f"  ingest lazy             : {lazy_elapsed:7.2f}s   disk {lazy_ingest_bytes / 1024:9.1f}KB")
+        print(f"  lazy + {args.viewed:3d} viewed pages  : +{on_demand_elapsed:6.2f}s   disk {lazy_viewed_bytes / 1024:9.1f}KB")
+        if lazy_elapsed > 0:
+            print(f"  ingest speedup          : {eager_elapsed / lazy_elapsed:7.1f}x")
+        if eager_bytes:
+            print(f"  disk saved (viewed)     : {100 * (1 - lazy_viewed_bytes / eager_bytes):6.1f}%")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# backend/benchmarks/bench_ocr_raster.py
+"""
+OCR 렌더링 단계 벤치마크 (합성 스캔 PDF, 기본 200페이지 A4 전면 이미지)
+
+OCR 워커로 넘기기 전까지(렌더링 → 워커에 넘길 배열)의 처리량과 최대 RSS 비교:
+1) legacy : pm.samples → Image.frombytes → np.array(img.convert("RGB"))  (페이지마다 전체 프레임 복사 2번 이상)
+2) inline : pixmap 샘플을 NumPy 뷰로 보고 공유 메모리에 한 번만 복사 (services/ocr_pool._render_to_shared)
+3) pool   : 2) 를 렌더 워커 프로세스 풀에서 페이지 구간 단위로 (_rasterize_range), 부모는 공유 메모리 이름만 받음
+- 모드마다 새 프로세스에서 실행해서 최대 RSS(ru_maxrss)가 서로 섞이지 않게 함
+  (시작 시점 대비 증가량도 출력, pool 은 렌더 워커 최대 RSS 도 출력)
+- 넘겨받은 쪽은 OCR 대신 배열을 열어 보고 바로 해제
+
+--ocr 를 주면 PaddleOCR 워커까지 포함해서 OcrPool.ocr_pdf 를 렌더 워커 없이/있이 비교 (paddleocr 필요)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_ocr_raster --pages 200 --raster-workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from services import ocr_pool
+from services.ocr_pool import OCR_ZOOM, _rasterize_range, _render_to_shared
+
+MODES = ("legacy", "inline", "pool")
+
+
+def make_scan_pdf(path: str, pages: int, variants: int = 8, seed: int = 0):
+    """A4 페이지 전체를 덮는 150dpi 그레이스케일 '스캔' 이미지 (variants 장을 돌려 씀)"""
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(variants):
+        h, w = 1754, 1240
+        gradient = np.linspace(200, 255, w, dtype=np.float32)[None, :]
+        noise = rng.normal(0, 12, (h, w)).astype(np.float32)
+        arr = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        for row in rng.integers(100, h - 100, 60):  # 글자 줄 흉내
+            arr[row:row + 14, 120:w - 120] //= 3
+        pm = fitz.Pixmap(fitz.csGRAY, w, h, arr.tobytes(), False)
+        images.append(pm.tobytes("jpg", jpg_quality=80))
+
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=images[p % variants])
+    doc.save(path)
+    doc.close()
+
+
+def _consume_shared(name: str, shape, dtype: str) -> int:
+    """OCR 워커 대신: 공유 메모리 배열을 열어 보고 해제"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        value = int(arr[0, 0, 0])
+        del arr
+    finally:
+        shm.close()
+        shm.unlink()
+    return value
+
+
+def run_legacy(pdf_path: str, zoom: float) -> int:
+    from PIL import Image
+
+    pages = 0
+    with fitz.open(pdf_path) as doc:
+        mat = fitz.Matrix(zoom, zoom)
+        for page in doc:
+            pm = page.get_pixmap(matrix=mat)
+            mode = "RGB" if pm.alpha == 0 else "RGBA"
+            img = Image.frombytes(mode, [pm.width, pm.height], pm.samples)
+            arr = np.array(img.convert("RGB"))
+            int(arr[0, 0, 0])
+            pages += 1
+    return pages
+
+
+def run_inline(pdf_path: str, zoom: float) -> int:
+    pages = 0
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            name, shape, dtype, _ = _render_to_shared(page, zoom)
+            _consume_shared(name, shape, dtype)
+            pages += 1
+    return pages
+
+
+def run_pool(pdf_path: str, zoom: float, workers: int, pages_per_task: int, in_flight: int) -> tuple:
+    with fitz.open(pdf_path) as doc:
+        page_numbers = list(range(1, doc.page_count + 1))
+    ranges = [page_numbers[i:i + pages_per_task] for i in range(0, len(page_numbers), pages_per_task)]
+
+    pages = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(time.sleep, [0.01] * workers))  # 워커 기동 시간은 제외
+        started = time.perf_counter()
+        futures = []
+        for chunk in ranges:
+            futures.append(pool.submit(_rasterize_range, os.path.abspath(pdf_path), chunk, zoom))
+            # OcrPool 처럼 대기 중인 구간 수 제한 (공유 메모리가 쌓이지 않게)
+            while len(futures) >= in_flight:
+                for item in futures.pop(0).result():
+                    _consume_shared(*item[:3])
+                    pages += 1
+        for f in futures:
+            for item in f.result():
+                _consume_shared(*item[:3])
+                pages += 1
+        elapsed = time.perf_counter() - started
+    return pages, elapsed
+
+
+def _child(mode: str, pdf_path: str, args, out):
+    from PIL import Image  # noqa: F401  모드마다 같은 모듈을 올려 둔 상태에서 기준 RSS 측정
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    started = time.perf_counter()
+    if mode == "legacy":
+        pages = run_legacy(pdf_path, args.zoom)
+    elif mode == "inline":
+        pages = run_inline(pdf_path, args.zoom)
+    else:
+        pages, elapsed = run_pool(pdf_path, args.zoom, args.raster_workers, args.pages_per_task, args.in_flight)
+        started = time.perf_counter() - elapsed
+    elapsed = time.perf_counter() - started
+    out.put({
+        "pages": pages,
+        "elapsed": elapsed,
+        "baseline_mb": baseline,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    })
+
+
+def measure(mode: str, pdf_path: str, args) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(mode, pdf_path, args, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def run_ocr(pdf_path: str, args):
+    for raster_workers in (0, args.raster_workers):
+        pool = ocr_pool.OcrPool(raster_workers=raster_workers)
+        pool.warm_up()
+        started = time.perf_counter()
+        pool.ocr_pdf(pdf_path)
+        elapsed = time.perf_counter() - started
+        print(f"  OCR raster_workers={raster_workers}: {elapsed:.2f}s ({args.pages / elapsed:.2f} pages/sec), {pool.stats()['render_ms']}")
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--zoom", type=float, default=OCR_ZOOM)
+    parser.add_argument("--raster-workers", type=int, default=4)
+    parser.add_argument("--pages-per-task", type=int, default=4)
+    parser.add_argument("--in-flight", type=int, default=8, help="pool 모드에서 동시에 대기시킬 구간 수")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--ocr", action="store_true", help="PaddleOCR 워커까지 포함해서 비교")
+    args = parser.parse_args()
+
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf", prefix="ocr_raster_bench_")
+    os.close(fd)
+    try:
+        make_scan_pdf(pdf_path, args.pages)
+        with fitz.open(pdf_path) as doc:
+            rect = doc[0].rect
+        frame_mb = rect.width * args.zoom * rect.height * args.zoom * 3 / 1024 / 1024
+        print(f"pages={args.pages}, PDF {os.path.getsize(pdf_path) / 1024 / 1024:.1f}MB, zoom={args.zoom}, "
+              f"프레임 {frame_mb:.1f}MB, raster_workers={args.raster_workers}, pages_per_task={args.pages_per_task}")
+
+        for mode in args.modes.split(","):
+            r = measure(mode, pdf_path, args)
+            extra = f", 렌더 워커 최대 RSS {r['child_rss_mb']:7.1f}MB" if mode == "pool" else ""
+            print(f"  {mode:<7}: {r['elapsed']:6.2f}s ({r['pages'] / r['elapsed']:6.2f} pages/sec), "
+                  f"최대 RSS {r['rss_mb']:7.1f}MB (시작 대비 +{r['rss_mb'] - r['baseline_mb']:5.1f}MB){extra}")
+
+        if args.ocr:
+            run_ocr(pdf_path, args)
+    finally:
+        os.remove(pdf_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backend/benchmarks/bench_page_insert.py
+"""
+PdfPage 1,000행 INSERT 벤치마크: 기존 ORM 루프(db.add × N) vs bulk_insert_pages (executemany 1회)
+
+- 기본은 임시 SQLite 파일, --url 로 실제 DB(MySQL 등)에서도 측정 가능 (bench용 pdf_id를 쓰고 끝나면 삭제)
+- --echo 를 주면 SQL 로그 출력 비용까지 포함 (로그는 /dev/null 로 버림)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_page_insert --pages 1000
+    python -m benchmarks.bench_page_insert --pages 1000 --echo
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db import Base
+import models  # noqa: F401  (테이블 메타데이터 등록)
+from models.pdf_pages import PdfPage
+from services.pdf_ingest_service import bulk_insert_pages
+
+BENCH_PDF_ID = 987654321
+
+
+def _rows(pages: int) -> list:
+    return [
+        {
+            "pdf_id": BENCH_PDF_ID,
+            "page_number": n,
+            "page_order": n,
+            "image_preview_url": f"/pdf/thumbnail/{BENCH_PDF_ID}/{n}",
+            "aspect_ratio": 0.70711,
+            "created_at": datetime.utcnow(),
+        }
+        for n in range(1, pages + 1)
+    ]
+
+
+def _orm_loop(Session, pages: int) -> float:
+    """기존 업로드 코드와 같은 방식: 페이지마다 db.add, 마지막에 commit"""
+    with Session() as db:
+        started = time.perf_counter()
+        for row in _rows(pages):
+            db.add(PdfPage(**row))
+        db.commit()
+        return time.perf_counter() - started
+
+
+def _bulk(Session, pages: int) -> float:
+    with Session() as db:
+        started = time.perf_counter()
+        bulk_insert_pages(db, _rows(pages))
+        db.commit()
+        return time.perf_counter() - started
+
+
+def _cleanup(Session):
+    with Session() as db:
+        db.query(PdfPage).filter(PdfPage.pdf_id == BENCH_PDF_ID).delete(synchronize_session=False)
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--url", default=None, help="측정할 DB URL (없으면 임시 SQLite)")
+    parser.add_argument("--echo", action="store_true")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="insert_bench_")
+    devnull = open(os.devnull, "w")
+    try:
+        url = args.url or f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+        # echo 핸들러는 엔진 생성 시점의 stdout에 붙으므로 생성할 때만 /dev/null로 돌림
+        with contextlib.redirect_stdout(devnull):
+            engine = create_engine(url, echo=args.echo)
+        if not args.url:
+            Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        results = {"orm loop (db.add x N)": [], "bulk_insert_pages": []}
+        for _ in range(args.repeat):
+            _cleanup(Session)
+            results["orm loop (db.add x N)"].append(_orm_loop(Session, args.pages))
+            _cleanup(Session)
+            results["bulk_insert_pages"].append(_bulk(Session, args.pages))
+        _cleanup(Session)
+
+        print()
+        print(f"pages={args.pages}, repeat={args.repeat}, echo={args.echo}, db={engine.dialect.name}")
+        for name, times in results.items():
+            best = min(times)
+            print(f"  {name:24s}: {best * 1000:8.1f}ms  {args.pages / best:10.0f} rows/sec")
+        orm_best, bulk_best = min(results["orm loop (db.add x N)"]), min(results["bulk_insert_pages"])
+        print(f"  speedup                 : {orm_best / bulk_best:8.1f}x")
+    finally:
+        devnull.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_splitter.py
+"""
+텍스트 분할 벤치마크: 예전 방식(문서 전체 문자열 + 고정 글자 수) vs 페이지 스트리밍 분할 (services/text_splitter.split_pages)
+
+- 합성 PDF(페이지마다 문장 여러 개)를 만들어 두 방식으로 청크 목록을 만든 시간과 최대 메모리(tracemalloc)
+- 스트리밍 방식은 청크를 만들기만 하고 버리는 경우(peak = 페이지 하나 분량)와 목록으로 모으는 경우를 따로 출력
+- 페이지 경계를 넘는 청크 수(예전 방식)와 청크당 토큰 수 분포도 출력
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_splitter --pages 1000
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+
+import fitz  # PyMuPDF
+
+from services.embedding_client import count_tokens
+from services.pdf_utils import extract_text_from_pdf, iter_page_texts
+from services.text_splitter import split_pages, split_text_into_chunks
+
+_PAGE_MARK = re.compile(r"Page (\d+) ")
+
+
+def make_pdf(path: str, pages: int, lines: int = 40):
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        for line in range(lines):
+            page.insert_text(
+                (40, 40 + line * 18),
+                f"Page {p + 1} sentence {line + 1}: eigenvalues of a symmetric matrix are real.",
+                fontsize=9,
+            )
+    doc.save(path)
+    doc.close()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf", prefix="splitter_bench_")
+    os.close(fd)
+    try:
+        make_pdf(pdf_path, args.pages, args.lines)
+
+        legacy, legacy_s, legacy_mb = _measure(lambda: split_text_into_chunks(extract_text_from_pdf(pdf_path)))
+
+        def _drain():
+            n = 0
+            for _ in split_pages(iter_page_texts(pdf_path), pdf_id=1):
+                n += 1
+            return n
+
+        drained, drain_s, drain_mb = _measure(_drain)
+        chunks, stream_s, stream_mb = _measure(lambda: list(split_pages(iter_page_texts(pdf_path), pdf_id=1)))
+
+        crossing = sum(1 for c in legacy if len(set(_PAGE_MARK.findall(c))) > 1)
+        tokens = sorted(count_tokens(c.text) for c in chunks)
+
+        print()
+        print(f"pages={args.pages}, lines/page={args.lines}, PDF {os.path.getsize(pdf_path) / 1024 / 1024:.1f}MB")
+        print(f"  legacy (full text, 300자) : {len(legacy):6d} chunks, {legacy_s:6.2f}s, peak {legacy_mb:7.1f}MB, 페이지를 넘는 청크 {crossing}개")
+        print(f"  stream (drain)            : {drained:6d} chunks, {drain_s:6.2f}s, peak {drain_mb:7.1f}MB")
+        print(f"  stream (collect)          : {len(chunks):6d} chunks, {stream_s:6.2f}s, peak {stream_mb:7.1f}MB")
+        if tokens:
+            print(f"  tokens/chunk: min {tokens[0]}, p50 {tokens[len(tokens) // 2]}, max {tokens[-1]}")
+    finally:
+        os.remove(pdf_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# backend/benchmarks/bench_stroke_codec.py
+"""
+필기 저장 포맷 벤치마크: JSON (annotation_type "pen") vs 바이너리 (utils/stroke_codec.py, "pen_packed")
+
+- 합성 손필기 페이지: 스트로크 --strokes 개 × 점 --points 개 (프런트와 같은 {"x", "y"} 점, --pressure 면 필압 포함)
+- 크기: JSON / JSON+gzip(전송 압축 가정) / 바이너리 / base64(API 응답)
+- 시간: JSON dumps·loads vs encode·decode(점 dict 까지) · iter_strokes(NumPy 배열만)
+- 왕복 확인: 좌표 오차가 1/(2*COORD_SCALE) 이하인지, 디코딩 결과를 다시 인코딩하면 바이트가 같은지 (어긋나면 종료 코드 1)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_stroke_codec --strokes 600 --points 150
+"""
+import argparse
+import base64
+import gzip
+import json
+import sys
+import time
+
+import numpy as np
+
+from utils.stroke_codec import COORD_SCALE, decode_strokes, encode_strokes, iter_strokes
+
+
+def make_page(strokes: int, points: int, pressure: bool, seed: int = 0) -> list:
+    """필기 흉내: 페이지 위 임의 위치에서 시작해 조금씩 휘어지며 이어지는 선 (Flutter 논리 픽셀 좌표)"""
+    rng = np.random.default_rng(seed)
+    lines = []
+    for _ in range(strokes):
+        n = max(2, int(rng.normal(points, points * 0.3)))
+        angle = rng.uniform(0, 2 * np.pi) + np.cumsum(rng.normal(0, 0.25, n))
+        step = rng.uniform(0.5, 3.0, n)
+        xs = rng.uniform(0, 800) + np.cumsum(step * np.cos(angle))
+        ys = rng.uniform(0, 1100) + np.cumsum(step * np.sin(angle))
+        ps = np.clip(0.5 + np.cumsum(rng.normal(0, 0.03, n)), 0, 1)
+        if pressure:
+            pts = [{"x": float(x), "y": float(y), "pressure": float(p)} for x, y, p in zip(xs, ys, ps)]
+        else:
+            pts = [{"x": float(x), "y": float(y)} for x, y in zip(xs, ys)]
+        lines.append({
+            "points": pts,
+            "color": rng.choice(["ff000000", "ff2196f3", "fff44336"]).item(),
+            "strokeWidth": float(rng.choice([2.0, 3.0, 4.5])),
+            "penType": rng.choice(["pen", "brush", "highlighter"]).item(),
+        })
+    return lines
+
+
+def _time(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def check_round_trip(lines: list, packed: bytes) -> bool:
+    decoded = decode_strokes(packed)
+    tolerance = 0.5 / COORD_SCALE + 1e-9
+    worst = 0.0
+    for src, dst in zip(lines, decoded):
+        if len(src["points"]) != len(dst["points"]) or src["color"] != dst["color"] or src["penType"] != dst["penType"]:
+            return False
+        for a, b in zip(src["points"], dst["points"]):
+            worst = max(worst, abs(a["x"] - b["x"]), abs(a["y"] - b["y"]))
+            if "pressure" in a and abs(a["pressure"] - b["pressure"]) > 0.5 / 255 + 1e-4:
+                return False
+    stable = encode_strokes(decoded) == packed
+    print(f"  왕복: 스트로크 {len(decoded)}개, 최대 좌표 오차 {worst:.4f}px (허용 {tolerance:.4f}), 재인코딩 동일={stable}")
+    return len(decoded) == len(lines) and worst <= tolerance and stable
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strokes", type=int, default=600)
+    parser.add_argument("--points", type=int, default=150)
+    parser.add_argument("--pressure", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = make_page(args.strokes, args.points, args.pressure)
+    total_points = sum(len(line["points"]) for line in lines)
+    print(f"strokes={len(lines)}, points={total_points}, pressure={args.pressure}")
+
+    blob, dumps_ms = _time(lambda: json.dumps({"lines": lines}), args.repeat)
+    _, loads_ms = _time(lambda: json.loads(blob), args.repeat)
+    packed, encode_ms = _time(lambda: encode_strokes(lines), args.repeat)
+    _, decode_ms = _time(lambda: decode_strokes(packed), args.repeat)
+    _, arrays_ms = _time(lambda: list(iter_strokes(packed)), args.repeat)
+    raw = encode_strokes(lines, compress=False)
+
+    json_bytes = len(blob.encode("utf-8"))
+    gzip_bytes = len(gzip.compress(blob.encode("utf-8")))
+    b64_bytes = len(base64.b64encode(packed))
+
+    print(f"  크기  JSON           : {json_bytes / 1024:9.1f}KB")
+    print(f"        JSON + gzip    : {gzip_bytes / 1024:9.1f}KB")
+    print(f"        바이너리(무압축): {len(raw) / 1024:9.1f}KB")
+    print(f"        바이너리       : {len(packed) / 1024:9.1f}KB  (JSON 대비 {json_bytes / len(packed):.1f}배 작음)")
+    print(f"        base64 (API)   : {b64_bytes / 1024:9.1f}KB")
+    print(f"  시간  json.dumps     : {dumps_ms:8.2f}ms   encode_strokes : {encode_ms:8.2f}ms")
+    print(f"        json.loads     : {loads_ms:8.2f}ms   decode_strokes : {decode_ms:8.2f}ms (점 dict 까지)")
+    print(f"                                      iter_strokes   : {arrays_ms:8.2f}ms (NumPy 배열, "
+          f"json.loads 대비 {loads_ms / arrays_ms:.1f}배 빠름)")
+
+    if not check_round_trip(lines, packed):
+        print("❌ 왕복 결과가 원본과 다릅니다")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# backend/benchmarks/bench_text_pipeline.py
+"""
+텍스트 추출/파이프라인 벤치마크 (1,000페이지 합성 PDF)
+
+1) 추출: 예전 방식(text += page.get_text()) vs iter_page_texts (순차 / 프로세스 풀)
+   - 순차·병렬 결과가 페이지 순서까지 같은지 확인
+2) 추출 → 분할 → 임베딩: 단계별로 차례로 실행 vs services/text_pipeline.iter_chunk_batches (배치 단위로 겹침)
+   - 임베딩 API 는 호출하지 않고 배치마다 --embed-ms 만큼 대기 (네트워크 대기 흉내)
+   - 처음 배치가 임베딩 단계에 도착하기까지의 시간도 출력
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_text_pipeline --pages 1000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import fitz  # PyMuPDF
+
+from services import pdf_utils
+from services.pdf_utils import iter_page_texts
+from services.text_pipeline import PIPELINE_BATCH_CHUNKS, iter_chunk_batches
+from services.text_splitter import split_pages
+
+
+def make_pdf(path: str, pages: int, lines: int = 40):
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        for line in range(lines):
+            page.insert_text(
+                (40, 40 + line * 18),
+                f"Page {p + 1} sentence {line + 1}: the eigenvalues of a symmetric matrix are always real.",
+                fontsize=9,
+            )
+    doc.save(path)
+    doc.close()
+
+
+def legacy_extract(pdf_path: str) -> str:
+    """예전 extract_text_from_pdf (페이지마다 문자열 이어 붙이기)"""
+    doc = fitz.open(pdf_path)
+    text = ""
+    for page in doc:
+        text += page.get_text()
+    doc.close()
+    return text.strip()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--embed-ms", type=float, default=150, help="배치 하나 임베딩에 걸린다고 가정할 시간")
+    parser.add_argument("--batch", type=int, default=PIPELINE_BATCH_CHUNKS)
+    args = parser.parse_args()
+
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf", prefix="text_pipeline_bench_")
+    os.close(fd)
+    try:
+        make_pdf(pdf_path, args.pages)
+        print(f"pages={args.pages}, PDF {os.path.getsize(pdf_path) / 1024 / 1024:.1f}MB, "
+              f"workers={args.workers}, batch={args.batch} chunks, embed={args.embed_ms:.0f}ms/batch")
+
+        # 풀 기동(spawn) 비용은 서버에서 한 번만 들므로 측정에서 제외
+        list(iter_page_texts(pdf_path, workers=args.workers))
+
+        legacy, legacy_s, legacy_mb = _measure(lambda: legacy_extract(pdf_path))
+        seq, seq_s, seq_mb = _measure(lambda: list(iter_page_texts(pdf_path, workers=1)))
+        par, par_s, par_mb = _measure(lambda: list(iter_page_texts(pdf_path, workers=args.workers)))
+        assert seq == par, "순차/병렬 추출 결과가 다릅니다."
+        assert "".join(t for _, t in seq).strip() == legacy, "예전 방식과 추출 결과가 다릅니다."
+
+        print()
+        print("extract")
+        print(f"  legacy (text +=)       : {legacy_s:6.2f}s, peak {legacy_mb:7.1f}MB")
+        print(f"  iter_page_texts (1)    : {seq_s:6.2f}s, peak {seq_mb:7.1f}MB  (결과를 리스트로 모은 경우)")
+        print(f"  iter_page_texts ({args.workers})    : {par_s:6.2f}s, peak {par_mb:7.1f}MB"
+              f"{'' if args.pages >= pdf_utils.MIN_PAGES_FOR_POOL else '  (MIN_PAGES_FOR_POOL 미만 → 순차)'}")
+
+        def _embed(batch):
+            time.sleep(args.embed_ms / 1000)
+            return len(batch)
+
+        def _staged():
+            chunks = list(split_pages(iter_page_texts(pdf_path, workers=1), 1))
+            first = time.perf_counter()
+            total = 0
+            for i in range(0, len(chunks), args.batch):
+                total += _embed(chunks[i:i + args.batch])
+            return total, first
+
+        def _pipelined(workers):
+            total, first = 0, None
+            for _, batch in iter_chunk_batches(pdf_path, 1, batch_size=args.batch, workers=workers):
+                first = first or time.perf_counter()
+                total += _embed(batch)
+            return total, first
+
+        print()
+        print("extract → split → embed")
+        for name, fn in (
+            ("staged", _staged),
+            ("pipeline (1)", lambda: _pipelined(1)),
+            (f"pipeline ({args.workers})", lambda: _pipelined(args.workers)),
+        ):
+            started = time.perf_counter()
+            (total, first), elapsed, peak_mb = _measure(fn)
+            print(f"  {name:<14}: {total} chunks, {elapsed:6.2f}s, first batch {first - started:5.2f}s, peak {peak_mb:7.1f}MB")
+    finally:
+        os.remove(pdf_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# backend/benchmarks/bench_thumbnails.py
+"""
+썸네일 생성 벤치마크: 기존 페이지별 루프(generate_thumbnail) vs 배치 API(generate_thumbnails)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_thumbnails --pages 500 --workers 4
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from utils.thumbnail import generate_thumbnail, generate_thumbnails
+
+
+def make_fixture(path: str, pages: int):
+    """텍스트 + 도형이 들어간 A4 페이지 N장짜리 PDF 생성"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=595, height=842)
+        for line in range(40):
+            page.insert_text((50, 60 + line * 18), f"Page {i + 1} line {line + 1} - benchmark fixture text", fontsize=11)
+        page.draw_rect(fitz.Rect(50, 780, 545, 820), color=(0.2, 0.3, 0.8), fill=(0.9, 0.9, 1.0))
+    doc.save(path)
+    doc.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="thumb_bench_")
+    try:
+        pdf_path = os.path.join(work_dir, "fixture.pdf")
+        make_fixture(pdf_path, args.pages)
+        pages = list(range(1, args.pages + 1))
+
+        # 1) 기존 방식: 페이지마다 fitz.open
+        started = time.perf_counter()
+        for n in pages:
+            generate_thumbnail(pdf_path, n, os.path.join(work_dir, "loop", f"thumb_{n}.png"))
+        loop_elapsed = time.perf_counter() - started
+
+        # 2) 배치 API
+        pattern = os.path.join(work_dir, "batch", "thumb_{page}.png")
+        single = generate_thumbnails(pdf_path, pages, pattern, workers=1)
+        pooled = generate_thumbnails(pdf_path, pages, pattern, workers=args.workers)
+
+        print()
+        print(f"pages={args.pages}, cpu={os.cpu_count()}")
+        print(f"  loop (open per page)     : {loop_elapsed:7.2f}s  {args.pages / loop_elapsed:8.1f} pages/sec")
+        print(f"  batch (1 process)        : {single['elapsed']:7.2f}s  {single['pages_per_sec']:8.1f} pages/sec")
+        print(f"  batch ({pooled['workers']} processes)      : {pooled['elapsed']:7.2f}s  {pooled['pages_per_sec']:8.1f} pages/sec")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_vector_search.py
+"""
+채팅 검색 벤치마크: 요청마다 faiss.read_index vs 상주 레지스트리 (services/vector_index_registry.py)
+
+- 임시 디렉터리에 사용자 인덱스(--vectors 개, --dim 차원)를 만들고 같은 질의를 반복
+- --threads 로 스레드 풀에서 동시에 검색 (FastAPI 동기 엔드포인트와 같은 조건)
+- 중간에 노트를 하나 추가해서 세대가 바뀌면 한 번만 다시 읽는지 확인
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_vector_search --vectors 50000 --queries 200
+    VECTOR_INDEX_MMAP=1 python -m benchmarks.bench_vector_search --vectors 50000 --threads 8
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--docs", type=int, default=50, help="벡터를 나눠 담을 노트 수")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    import faiss
+    from services import vector_index_manager as vm
+    from services import vector_index_registry as registry
+
+    tmp_dir = tempfile.mkdtemp(prefix="vec_bench_")
+    vm.USER_INDEX_DIR = tmp_dir
+    user_id = 1
+    rng = np.random.default_rng(0)
+
+    try:
+        per_doc = max(1, args.vectors // args.docs)
+        for pdf_id in range(1, args.docs + 1):
+            embs = rng.standard_normal((per_doc, args.dim)).astype("float32")
+            vm.add_document(user_id, pdf_id, embs, [f"doc {pdf_id} chunk {i}" for i in range(per_doc)])
+        path = vm.index_path(user_id)
+        queries = rng.standard_normal((args.queries, args.dim)).astype("float32")
+
+        # 1) 기존 방식: 질의마다 디스크에서 인덱스를 읽음
+        cold = []
+        for q in queries[: max(1, args.queries // 10)]:
+            started = time.perf_counter()
+            faiss.read_index(path).search(q[None, :], 3)
+            cold.append(time.perf_counter() - started)
+
+        # 2) 상주 레지스트리 (첫 질의에서 한 번 로드)
+        def _search(q):
+            started = time.perf_counter()
+            vm.search(user_id, q, top_k=3)
+            return time.perf_counter() - started
+
+        registry.clear()
+        warm = [_search(q) for q in queries]
+
+        # 3) 스레드 풀 동시 검색 + 도중에 노트 추가(세대 변경)
+        reloads_before = registry.stats()["reloads"]
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            futures = [pool.submit(_search, q) for q in queries]
+            vm.add_document(user_id, args.docs + 1, rng.standard_normal((per_doc, args.dim)).astype("float32"),
+                            [f"new chunk {i}" for i in range(per_doc)])
+            concurrent = [f.result() for f in futures]
+        concurrent += [_search(q) for q in queries[:10]]
+
+        stats = registry.stats()
+        print()
+        print(f"vectors={args.vectors}, dim={args.dim}, docs={args.docs}, mmap={stats['mmap']}, threads={args.threads}")
+        print(f"  read_index per query : mean {statistics.mean(cold) * 1000:8.2f}ms  p95 {_percentile(cold, 95):8.2f}ms")
+        print(f"  resident (1 thread)  : mean {statistics.mean(warm) * 1000:8.2f}ms  p95 {_percentile(warm, 95):8.2f}ms")
+        print(f"  resident ({args.threads} threads) : mean {statistics.mean(concurrent) * 1000:8.2f}ms  p95 {_percentile(concurrent, 95):8.2f}ms")
+        print(f"  loads={stats['loads']}, reloads={stats['reloads'] - reloads_before} (노트 추가 후), hits={stats['hits']}, "
+              f"load_seconds={stats['load_seconds']}")
+        print(f"  heap_bytes={stats['heap_bytes'] / 1024 / 1024:.1f}MB, mapped_bytes={stats['mapped_bytes'] / 1024 / 1024:.1f}MB")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
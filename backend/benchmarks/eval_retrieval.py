@@ -0,0 +1,150 @@
+# backend/benchmarks/eval_retrieval.py
+"""
+검색 평가: 벡터만(vector) vs 키워드만(lexical) vs 하이브리드(hybrid, RRF) 의 hit-rate@k / MRR / 지연
+
+실제 노트로 평가 (사용자 인덱스가 만들어져 있어야 함, 질문 임베딩은 설정된 임베딩 API 사용):
+    python -m benchmarks.eval_retrieval --user-id 3 --queries queries.jsonl --k 3
+    queries.jsonl 한 줄 = {"question": "...", "pdf_id": 12, "page": 34}        # 그 노트 그 페이지 청크가 나오면 적중
+                         {"question": "...", "answer": "정답 청크에 들어 있는 문구"}  # 그 문구가 든 청크가 나오면 적중
+                         ("pdf_ids": [...] 를 주면 그 노트들 안에서만 검색)
+
+합성 코퍼스로 동작 확인 (API 없음):
+    python -m benchmarks.eval_retrieval --synthetic --chapters 12 --k 3
+    - "n.m절" 단위 강의 자료 청크 + 주제어만 반영하는 임베딩 (장/절 번호를 못 구분하는 경우 흉내)
+    - 질문은 "3.2절 고유값 ..." 형태, 해당 절(페이지) 청크가 나오면 적중
+    - 수치는 장치 확인용이고, 설정(RRF_K, RETRIEVAL_CANDIDATES) 비교는 실제 노트로 할 것
+"""
+import argparse
+import json
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+MODES = ("vector", "lexical", "hybrid")
+
+_TOPICS = [
+    "고유값", "고유벡터", "대각화", "행렬식", "역행렬", "선형변환", "기저", "차원", "내적", "직교",
+    "그람슈미트", "최소제곱", "특이값분해", "계수", "영공간", "열공간", "대칭행렬", "이차형식", "마르코프", "미분방정식",
+]
+_TEMPLATES = [
+    "{n}절에서는 {t}의 정의와 성질을 다룬다. {t}은 {u}과 밀접한 관련이 있다.",
+    "예제 {n}: {t}을 이용해 {u} 문제를 풀어 보자. 계산 과정에서 {t}의 성질을 사용한다.",
+    "정리 {n}. {t}이 존재하면 {u}도 결정된다. 증명은 {t}의 정의로부터 바로 나온다.",
+]
+
+
+def _topic_embedder(dim: int):
+    """주제어는 잘 잡지만 장/절 번호는 구분 못하는 임베딩 흉내 (주제어 벡터 합 + 문장별 약한 잡음)"""
+    from scripts.stub_embedding_server import stub_vector
+
+    def embed(text: str):
+        v = 0.3 * np.asarray(stub_vector(text, dim))
+        for topic in _TOPICS:
+            if topic in text:
+                v = v + np.asarray(stub_vector(topic, dim))
+        return (v / np.linalg.norm(v)).tolist()
+    return embed
+
+
+def build_synthetic(user_id: int, chapters: int, sections: int, dim: int, queries: int, seed: int = 0):
+    """합성 노트 1개를 사용자 인덱스에 추가하고 질문 목록 반환"""
+    from services.vector_index_manager import add_document
+    from utils.chunk_store import ChunkMeta
+
+    rng = np.random.default_rng(seed)
+    embed = _topic_embedder(dim)
+    chunks, metas, sections_topic = [], [], {}
+    for c in range(1, chapters + 1):
+        for s in range(1, sections + 1):
+            page = (c - 1) * sections + s
+            t, u = rng.choice(_TOPICS, 2, replace=False)
+            sections_topic[page] = (f"{c}.{s}", t)
+            for template in _TEMPLATES:
+                chunks.append(template.format(n=f"{c}.{s}", t=t, u=u))
+                metas.append(ChunkMeta(1, page, 0, len(chunks[-1])))
+    add_document(user_id, 1, [embed(c) for c in chunks], chunks, metas)
+
+    pages = rng.choice(list(sections_topic), min(queries, len(sections_topic)), replace=False)
+    qs = []
+    for page in pages:
+        number, topic = sections_topic[int(page)]
+        qs.append({"question": f"{number}절 {topic} 내용 설명해줘", "pdf_id": 1, "page": int(page)})
+    return qs, embed
+
+
+def _is_hit(result: dict, q: dict) -> bool:
+    if "answer" in q:
+        return q["answer"] in result["text"]
+    return result["pdf_id"] == q["pdf_id"] and result["page"] == q["page"]
+
+
+def evaluate(user_id: int, queries: list, k: int, modes=MODES) -> dict:
+    from services.rag_service import search_chunks
+
+    for q in queries:  # 질문 임베딩을 캐시에 올려 두고 검색 시간만 비교
+        search_chunks(q["question"], user_id, pdf_ids=q.get("pdf_ids"), top_k=k, mode="vector")
+
+    report = {}
+    for mode in modes:
+        hits, rr, latencies = 0, 0.0, []
+        for q in queries:
+            started = time.perf_counter()
+            results = search_chunks(q["question"], user_id, pdf_ids=q.get("pdf_ids"), top_k=k, mode=mode)
+            latencies.append((time.perf_counter() - started) * 1000)
+            rank = next((i for i, r in enumerate(results, start=1) if _is_hit(r, q)), None)
+            if rank:
+                hits += 1
+                rr += 1 / rank
+        report[mode] = {
+            "hit_rate": hits / len(queries),
+            "mrr": rr / len(queries),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--queries", help="질문 jsonl")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--chapters", type=int, default=12)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--num-queries", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.synthetic:
+        from services import rag_service, vector_index_manager
+        tmp_dir = tempfile.mkdtemp(prefix="eval_retrieval_")
+        vector_index_manager.USER_INDEX_DIR = tmp_dir
+        user_id = 1
+        queries, embed = build_synthetic(user_id, args.chapters, args.sections, args.dim, args.num_queries)
+        rag_service.get_embedding = embed
+    else:
+        if args.user_id is None or not args.queries:
+            parser.error("--user-id 와 --queries 가 필요합니다 (또는 --synthetic)")
+        user_id = args.user_id
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+
+    try:
+        report = evaluate(user_id, queries, args.k)
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print()
+    print(f"queries={len(queries)}, k={args.k}")
+    print(f"{'mode':<8} {'hit@' + str(args.k):>7} {'MRR':>7} {'p50(ms)':>9} {'p95(ms)':>9}")
+    for mode, r in report.items():
+        print(f"{mode:<8} {r['hit_rate']:7.3f} {r['mrr']:7.3f} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,12 @@ if not DATABASE_URL:
 
 print(f"✅ Loaded DB URL: {DATABASE_URL}")
 
+# SQL 로그 출력 (개발 시에만 DB_ECHO=1, 대량 INSERT 시 로그 자체가 병목이 됨)
+DB_ECHO = os.getenv("DB_ECHO", "0").lower() in ("1", "true", "yes")
+
 engine = create_engine(
     DATABASE_URL,
-    echo=True,
+    echo=DB_ECHO,
     pool_pre_ping=True
 )
 
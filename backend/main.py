@@ -56,6 +56,25 @@ app.include_router(user_study_router.router, tags=["StudyDaily"]) # 학습자의
 # 알림 관련 아현 추가
 app.include_router(notifications_router.router)
 
+# PDF 업로드 후처리(ingest) 워커 시작 + 미완료 작업 재개
+@app.on_event("startup")
+def _start_ingest_workers():
+    from services.pdf_ingest_service import start_ingest_workers
+    start_ingest_workers()
+
+# OCR 워커 프로세스 미리 띄우기 (OCR_WARMUP=1 일 때만, 모델 로딩은 백그라운드에서)
+@app.on_event("startup")
+def _warm_up_ocr():
+    from services import ocr_pool
+    if ocr_pool.OCR_WARMUP:
+        import threading
+        threading.Thread(target=ocr_pool.get_pool().warm_up, name="ocr-warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+def _stop_ocr_pool():
+    from services import ocr_pool
+    ocr_pool.shutdown_pool()
+
 @app.on_event("startup")
 def show_registered_routes():
     print("\n [등록된 라우터 경로 목록]")
@@ -119,6 +138,8 @@ def read_root():
 # --- 자동 알림 스케줄러 추가 시작 ---
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from services.resumable_upload_service import cleanup_expired_upload_sessions
+from services.pdf_ingest_service import requeue_stale_jobs
 from datetime import date
 from zoneinfo import ZoneInfo
 from sqlalchemy import text
@@ -195,6 +216,8 @@ def _notify_last_call():
 def _start_scheduler():
     scheduler.add_job(_notify_morning,  CronTrigger(hour=9,  minute=0))
     scheduler.add_job(_notify_last_call, CronTrigger(hour=21, minute=0))
+    scheduler.add_job(cleanup_expired_upload_sessions, CronTrigger(minute=30))  # 만료된 이어 올리기 세션 정리 (매시 30분)
+    scheduler.add_job(requeue_stale_jobs, CronTrigger(minute="*/5"))  # heartbeat 가 끊긴 ingest 작업 다시 큐에 (5분마다)
     scheduler.start()
     print("[APScheduler] jobs → 09:00 / 21:00 (KST)")
 
@@ -212,4 +235,29 @@ def _debug_run_morning():
 @app.get("/debug/run-lastcall")
 def _debug_run_lastcall():
     _notify_last_call()
-    return {"ok": True}
\ No newline at end of file
+    return {"ok": True}
+
+# 상주 벡터 인덱스 상태 (로드 시간/크기/적중 횟수)
+@app.get("/debug/vector-index")
+def _debug_vector_index():
+    from services import vector_index_registry
+    return vector_index_registry.stats()
+
+# 답변 스트리밍 TTFT/전체 시간 (최근 요청 기준)
+@app.get("/debug/chat-stream")
+def _debug_chat_stream():
+    from services import chat_stream_service
+    return chat_stream_service.stats()
+
+
+# OCR 워커 풀 상태 (페이지별 렌더링/대기/인식 시간) + OCR 결과 캐시 적중률
+@app.get("/debug/ocr")
+def _debug_ocr():
+    from services import ocr_cache, ocr_pool
+    return {**ocr_pool.get_pool().stats(), "cache": ocr_cache.stats()}
+
+# 임베딩 캐시 적중률/크기 (청크 임베딩 + 질문 임베딩)
+@app.get("/debug/embedding-cache")
+def _debug_embedding_cache():
+    from services import embedding_cache
+    return embedding_cache.stats()
@@ -10,6 +10,9 @@ from .pdf_folder import Folder
 from .pdf_notes import PdfNote
 from .pdf_pages import PdfPage
 from .pdf_annotations import PdfAnnotation
+from .pdf_ingest_job import PdfIngestJob
+from .pdf_blob import PdfBlob
+from .pdf_upload_session import PdfUploadSession
 from .handwriting import Handwriting
 from .user_profile import UserProfile
 from .personal_schedule import PersonalSchedule 
@@ -33,6 +36,9 @@ __all__ = [
     "PdfNote",
     "PdfPage",
     "PdfAnnotation",
+    "PdfIngestJob",
+    "PdfBlob",
+    "PdfUploadSession",
     "Handwriting",
     "UserProfile",
 ]
\ No newline at end of file
@@ -1,10 +1,14 @@
 # models/pdf_annotations.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import base64
 from db import Base
 
+# 스트로크를 바이너리(utils/stroke_codec.py 포맷)로 저장하는 필기 종류
+PACKED_ANNOTATION_TYPE = "pen_packed"
+
 class PdfAnnotation(Base):
     __tablename__ = "pdf_annotation"
 
@@ -13,9 +17,25 @@ class PdfAnnotation(Base):
     page_number = Column(Integer)
     annotation_type = Column(String(50))
     data = Column(JSON)  # jsonb에 해당하는 SQLAlchemy 타입
+    stroke_data = Column(LargeBinary(length=2**24), nullable=True)  # pen_packed 필기 (data 대신)
     created_at = Column(DateTime, default=datetime.utcnow)  # 생성시간 추가
 
+    # 증분 동기화 (services/annotation_sync_service.py)
+    stroke_uid = Column(String(64), nullable=True)  # 클라이언트가 정한 id (페이지 안에서 유일)
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # 추가된 페이지 버전
+    deleted_version = Column(Integer, nullable=True)  # 지워진 페이지 버전 (tombstone, 내용은 비움)
+
     # 관계 설정
     page = relationship("PdfPage", back_populates="annotations")
 
+    __table_args__ = (
+        Index("ix_pdf_annotation_page_stroke", "page_id", "stroke_uid", unique=True),
+        Index("ix_pdf_annotation_page_version", "page_id", "version"),
+    )
+
+    @property
+    def packed(self):
+        """응답용: stroke_data 를 base64 문자열로"""
+        return base64.b64encode(self.stroke_data).decode("ascii") if self.stroke_data else None
+
 
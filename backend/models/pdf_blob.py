@@ -0,0 +1,19 @@
+# models/pdf_blob.py
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, BigInteger
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from db import Base
+
+class PdfBlob(Base):
+    """내용(sha256) 기준으로 한 번만 저장되는 PDF 원본 파일. 여러 노트가 공유하고 ref_count로 관리"""
+    __tablename__ = "pdf_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(Text, nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # 관계
+    notes = relationship("PdfNote", back_populates="blob")
@@ -0,0 +1,36 @@
+# models/pdf_ingest_job.py
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from db import Base
+
+class PdfIngestJob(Base):
+    __tablename__ = "pdf_ingest_jobs"
+
+    job_id = Column(Integer, primary_key=True, index=True)
+    pdf_id = Column(Integer, ForeignKey("pdf_notes.pdf_id", ondelete="CASCADE"), index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id", ondelete="CASCADE"))
+
+    # queued → running → done / failed
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    stage = Column(String(20), nullable=True)  # 현재 진행 중인 단계 (pages / text / embeddings)
+
+    # 단계별 진행 카운터 (재시작 시 이어서 처리하는 기준)
+    pages_total = Column(Integer, default=0)
+    pages_done = Column(Integer, default=0)
+    text_pages_total = Column(Integer, default=0)
+    text_pages_done = Column(Integer, default=0)
+    chunks_total = Column(Integer, default=0)
+    chunks_done = Column(Integer, default=0)
+
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String(128), nullable=True)  # 잡은 프로세스 "호스트:pid:토큰" (죽은 프로세스의 작업을 다시 잡는 기준)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # 워커 heartbeat 역할
+    finished_at = Column(DateTime, nullable=True)
+
+    # 관계
+    note = relationship("PdfNote", back_populates="ingest_jobs")
@@ -1,5 +1,5 @@
 # models/pdf_notes.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Float, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db import Base
@@ -12,6 +12,8 @@ class PdfNote(Base):
     file_path = Column(Text)         # 타입 수정
     total_pages = Column(Integer)
     aspect_ratio = Column(Float, nullable=True)  # 추가: 첫 페이지의 가로/세로 비율
+    blob_sha256 = Column(String(64), ForeignKey("pdf_blobs.sha256"), nullable=True, index=True)  # 공유 원본 파일 (구버전 노트는 NULL)
+    page_meta = Column(LargeBinary(length=2**24), nullable=True)  # 전 페이지 크기/회전/텍스트/이미지 수 (utils/page_meta.py 포맷)
 
     created_at = Column(DateTime, default=datetime.utcnow)  # 생성일자
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # 수정일자
@@ -23,5 +25,7 @@ class PdfNote(Base):
     folder = relationship("Folder", back_populates="pdf_notes")
     user = relationship("User", back_populates="pdf_notes")
     pages = relationship("PdfPage", back_populates="note", cascade="all, delete-orphan")
+    blob = relationship("PdfBlob", back_populates="notes")
+    ingest_jobs = relationship("PdfIngestJob", back_populates="note", cascade="all, delete-orphan")
 
 
@@ -16,6 +16,7 @@ class PdfPage(Base):
     image_preview_url = Column(Text)  # 타입: text (ERD 기준)
     aspect_ratio = Column(Float, nullable=True)  # 새로 추가된 비율 필드
     created_at = Column(DateTime, default=datetime.utcnow)  # 생성일자 추가
+    annotation_version = Column(Integer, nullable=False, default=0, server_default="0")  # 필기 변경마다 +1 (증분 동기화)
 
     # 관계
     note = relationship("PdfNote", back_populates="pages")
@@ -0,0 +1,25 @@
+# models/pdf_upload_session.py
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, BigInteger
+from datetime import datetime
+from db import Base
+
+class PdfUploadSession(Base):
+    """이어 올리기(resumable upload) 세션. 받은 바이트는 part_path 파일 하나에 순서대로 이어 씀"""
+    __tablename__ = "pdf_upload_sessions"
+
+    upload_id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.user_id", ondelete="CASCADE"), index=True)
+    title = Column(String(255))
+    folder_id = Column(Integer, ForeignKey("folders.folder_id", ondelete="CASCADE"), nullable=True)
+
+    total_size = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, nullable=False, default=0)  # 지금까지 확정된 바이트 수
+    part_path = Column(Text, nullable=False)
+
+    status = Column(String(20), nullable=False, default="open")  # open / finalizing / finalized / failed
+    pdf_id = Column(Integer, nullable=True)  # 완료 후 생성된 노트
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
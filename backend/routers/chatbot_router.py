@@ -1,48 +1,50 @@
 # backend/routers/chatbot_router.py
 
-from fastapi import APIRouter, Request
+import time
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from db import get_db
 from schemas.chatbot_schema import ChatRequest
-from services.rag_service import retrieve_relevant_chunks
+from services.chat_stream_service import start_retrieval, stream_answer
+from services.rag_service import build_chat_prompt, resolve_search_scope, retrieve_relevant_chunks
 from services.gpt_service import ask_gpt
+from utils.auth import get_current_user_id
 
 router = APIRouter()
 
 @router.post("/chat")
-def chat_with_gpt(request: ChatRequest):
+def chat_with_gpt(request: ChatRequest, http_request: Request, db: Session = Depends(get_db)):
+    # ✅ 내 노트 안에서만 검색 (folder_id / pdf_ids 로 범위 좁히기)
+    user_id = get_current_user_id(http_request)
+    pdf_ids = resolve_search_scope(db, user_id, request.folder_id, request.pdf_ids)
+
     try:
-        chunks = retrieve_relevant_chunks(request.question)
+        chunks = retrieve_relevant_chunks(request.question, user_id, pdf_ids=pdf_ids)
 
         # ✅ 문맥 여부에 따라 프롬프트 다르게 구성
-        if not chunks:
-            # 🔁 GPT only, but 정직하게 (너가 원하는 fallback)
-            prompt = f"""
-당신은 친절한 학습 도우미입니다. 
-사용자가 올린 문서에서 관련 내용을 찾지 못했습니다. 
-그렇기 때문에 당신이 알고 있는 범위에서만 답변해주세요.
-모르면 모른다고 답하세요.
-
-[질문]
-{request.question}
-
-[답변]
-"""
-        else:
-            # ✅ RAG + GPT 결합 응답
-            context = "\n".join(chunks)
-            prompt = f"""
-당신은 친절한 학습 도우미입니다. 아래 문맥을 참고하여 사용자 질문에 답변해주세요.
-
-[문맥]
-{context}
-
-[질문]
-{request.question}
-
-[답변]
-"""
+        prompt = build_chat_prompt(request.question, chunks)
 
         answer = ask_gpt(prompt)
         return {"answer": answer}
 
     except Exception as e:
         return {"error": str(e)}
+
+
+# ✅ 스트리밍 버전 (SSE): 토큰이 생성되는 대로 전달, 기존 /chat(JSON)은 예전 클라이언트용으로 유지
+@router.post("/chat/stream")
+def chat_with_gpt_stream(request: ChatRequest, http_request: Request, db: Session = Depends(get_db)):
+    started = time.perf_counter()
+    # 인증/범위 오류는 스트림을 열기 전에 일반 응답(401/404)으로
+    user_id = get_current_user_id(http_request)
+    pdf_ids = resolve_search_scope(db, user_id, request.folder_id, request.pdf_ids)
+
+    # 검색은 지금 시작 → 응답 헤더/start 이벤트 전송과 겹침
+    retrieval = start_retrieval(request.question, user_id, pdf_ids)
+    return StreamingResponse(
+        stream_answer(request.question, retrieval, started),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # 프록시(nginx) 버퍼링 끄기
+    )
@@ -1,7 +1,8 @@
 # 🔧 FastAPI & Starlette
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
-from fastapi.responses import JSONResponse, Response
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form, Query
+from fastapi.responses import JSONResponse, Response, FileResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 from uuid import uuid4
 
 # 🛠 DB / ORM
@@ -22,14 +23,35 @@ from schemas.pdf_schema import (
     PdfFolderCreate, PdfFolderOut,
     PdfNoteCreate, PdfNoteOut,
     PdfPageCreate, PdfPageOut,
-    PdfAnnotationCreate, PdfAnnotationOut
+    PdfAnnotationCreate, PdfAnnotationOut,
+    AnnotationSyncIn, AnnotationSyncOut, AnnotationChangesOut,
+    PdfUploadOut, PdfIngestJobOut, PdfIngestStageProgress,
+    PdfUploadSessionCreate, PdfUploadSessionOut
 )
 
 from pydantic import BaseModel
 
 # 🖼️ 썸네일 및 PDF 렌더링 유틸
-from utils.thumbnail import generate_thumbnail
-from utils.pdf_render import render_pdf_page
+from utils.thumbnail import THUMBNAIL_FORMAT
+from utils.pdf_render import render_pdf_page, render_pdf_tile, get_tile_grid, TILE_SIZE
+from utils import render_cache
+from utils.image_format import negotiate_format, MEDIA_TYPES, EXTENSIONS, IMAGE_QUALITY
+from utils.stroke_codec import decode_strokes
+
+# ⚙️ 업로드 후처리(썸네일/텍스트/임베딩) 백그라운드 파이프라인
+from services.pdf_ingest_service import create_note_from_upload, create_pages, get_ingest_job
+from services.page_thumbnail_service import ensure_thumbnail, prefetch_thumbnails
+from services.page_meta_service import get_page_meta, get_page
+from services.blob_store import stream_to_temp, release_blob, remove_blob_files, NotAPdf, UploadTooLarge
+from services.vector_index_manager import remove_document, remove_documents
+from services.annotation_sync_service import (
+    build_payload, delete_page_annotations, get_changes, live_annotations, new_stroke_uid, next_version, sync_page,
+    get_page as get_annotation_page,
+)
+from services.resumable_upload_service import (
+    create_upload_session, get_upload_session, append_chunk, finalize_upload, abort_upload,
+    RECOMMENDED_CHUNK_SIZE,
+)
 
 # 📂 기타 유틸
 import os
@@ -93,64 +115,91 @@ def create_pdf_page(page: PdfPageCreate, db: Session = Depends(get_db)):
     if not pdf:
         raise HTTPException(status_code=404, detail="PDF 노트를 찾을 수 없습니다.")
 
-    pdf_path = pdf.file_path
-    image_filename = f"thumb_{page.pdf_id}_{page.page_number}.png"
-    image_path = f"static/thumbnails/{image_filename}"
-    image_url = f"/static/thumbnails/{image_filename}"
-
-    # ✅ 1. 비율 계산을 위한 PyMuPDF 열기
-    try:
-        doc = fitz.open(pdf_path)
-        page_obj = doc[page.page_number - 1]
-        width = page_obj.rect.width
-        height = page_obj.rect.height
-        aspect_ratio = round(width / height, 5)
-        doc.close()
-    except Exception as e:
-        print(f"PDF 비율 계산 실패: {e}")
-        aspect_ratio = None
-
-    # ✅ 2. 썸네일 생성
-    try:
-        generate_thumbnail(pdf_path, page.page_number, image_path)
-    except Exception as e:
-        print(f"썸네일 생성 실패: {e}")
-        image_url = None
-
-    # ✅ 3. DB에 페이지 저장
-    new_page = PdfPage(
-        pdf_id=page.pdf_id,
-        page_number=page.page_number,
-        page_order=page.page_order or page.page_number,
-        image_preview_url=image_url,
-        aspect_ratio=aspect_ratio,  # ✅ 이제 정의됨
+    # ✅ 비율 계산 + 썸네일(ingest와 같은 규칙) + DB 저장
+    page_ids = create_pages(
+        db, pdf, [page.page_number],
+        page_orders={page.page_number: page.page_order or page.page_number},
     )
-    db.add(new_page)
-    db.commit()
-    db.refresh(new_page)
-    return {"page_id": new_page.page_id}
-
+    return {"page_id": page_ids[page.page_number]}
 
 
 # ✅ 4. 필기 저장
+#    - pen_packed: packed(base64 바이너리)를 그대로 저장하거나, data({"lines": [...]})를 서버에서 바이너리로 변환
+#    - 그 외 종류는 예전처럼 data(JSON) 저장
+#    - 페이지 필기 버전 +1 (증분 동기화 클라이언트도 알 수 있게)
 @router.post("/annotations", response_model=PdfAnnotationOut)
 def create_pdf_annotation(annotation: PdfAnnotationCreate, db: Session = Depends(get_db)):
+    data, stroke_data = build_payload(annotation.annotation_type, annotation.data, annotation.packed)
+    page = get_annotation_page(db, annotation.page_id, for_update=True)
     new_anno = PdfAnnotation(
         page_id=annotation.page_id,
         page_number=annotation.page_number,
         annotation_type=annotation.annotation_type,
-        data=annotation.data
+        data=data,
+        stroke_data=stroke_data,
+        stroke_uid=new_stroke_uid(),
+        version=next_version(page),
     )
     db.add(new_anno)
     db.commit()
     db.refresh(new_anno)
     return new_anno
 
-# ✅ 5. 특정 페이지 필기 불러오기
+
+def _annotations_out(annotations: List[PdfAnnotation], decode: bool) -> list:
+    """decode=True 면 pen_packed 필기를 data({"lines": [...]})로 풀어서 (예전 클라이언트 호환)"""
+    if not decode:
+        return annotations
+    out = []
+    for anno in annotations:
+        item = PdfAnnotationOut.model_validate(anno)
+        if anno.stroke_data:
+            item.data = {"lines": decode_strokes(anno.stroke_data)}
+            item.packed = None
+        out.append(item)
+    return out
+
+# ✅ 5. 특정 페이지 필기 불러오기 (decode=true 면 바이너리 필기도 JSON 으로)
 @router.get("/annotations/{page_id}", response_model=list[PdfAnnotationOut])
-def get_annotations_by_page(page_id: int, db: Session = Depends(get_db)):
-    annotations = db.query(PdfAnnotation).filter(PdfAnnotation.page_id == page_id).all()
-    return annotations
+def get_annotations_by_page(page_id: int, decode: bool = Query(False), db: Session = Depends(get_db)):
+    annotations = live_annotations(db).filter(PdfAnnotation.page_id == page_id).all()
+    return _annotations_out(annotations, decode)
+
+# ✅ 5-2. 필기 증분 동기화: base_version 기준 추가/삭제 (다른 기기와 같은 필기를 건드리면 409)
+@router.post("/annotations/{page_id}/sync", response_model=AnnotationSyncOut)
+def sync_annotations(
+    page_id: int,
+    body: AnnotationSyncIn,
+    request: Request,
+    decode: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    user_id = get_current_user_id(request)
+    result = sync_page(db, page_id, user_id, body.base_version, body.add, body.remove)
+    result["added"] = _annotations_out(result["added"], decode)
+    return result
+
+# ✅ 5-3. since 버전 이후 바뀐 필기 (since=0 이면 전체)
+@router.get("/annotations/{page_id}/changes", response_model=AnnotationChangesOut)
+def get_annotation_changes(
+    page_id: int,
+    request: Request,
+    since: int = Query(0, ge=0),
+    decode: bool = Query(False),
+    db: Session = Depends(get_db)
+):
+    user_id = get_current_user_id(request)
+    result = get_changes(db, page_id, since, user_id)
+    result["added"] = _annotations_out(result["added"], decode)
+    return result
+
+# ✅ 5-1. 바이너리 필기 원본 (application/octet-stream, utils/stroke_codec.py 포맷)
+@router.get("/annotations/packed/{annotations_id}")
+def get_packed_annotation(annotations_id: int, db: Session = Depends(get_db)):
+    anno = db.query(PdfAnnotation).filter(PdfAnnotation.annotations_id == annotations_id).first()
+    if not anno or not anno.stroke_data:
+        raise HTTPException(status_code=404, detail="Packed annotation not found")
+    return Response(content=anno.stroke_data, media_type="application/octet-stream")
 
 # ✅ 6. 특정 폴더의 PDF 목록 조회
 @router.get("/notes/{folder_id}", response_model=list[PdfNoteOut])
@@ -202,6 +251,10 @@ def delete_folder(
     if not folder:
         raise HTTPException(status_code=404, detail="폴더를 찾을 수 없습니다.")
     
+    # 폴더 안 노트들이 쓰던 원본 blob (노트 삭제 후 참조 해제) + 사용자 벡터 인덱스에서 뺄 노트
+    folder_notes = db.query(PdfNote.pdf_id, PdfNote.blob_sha256).filter(PdfNote.folder_id == folder_id).all()
+    blob_shas = [sha for (_, sha) in folder_notes]
+
     # PDF 노트, 페이지, 필기 등 자식 레코드도 제거 (옵션)
     db.query(PdfAnnotation).filter(PdfAnnotation.page_id.in_(
         db.query(PdfPage.page_id).filter(PdfPage.pdf_id.in_(
@@ -215,19 +268,23 @@ def delete_folder(
 
     db.query(PdfNote).filter(PdfNote.folder_id == folder_id).delete(synchronize_session=False)
     db.delete(folder)
+    purge_blobs = [sha for sha in blob_shas if release_blob(db, sha)]
     db.commit()
+    for sha in purge_blobs:
+        remove_blob_files(db, sha)
+    remove_documents(user_id, [pdf_id for (pdf_id, _) in folder_notes])
     return {"message": "폴더가 삭제되었습니다."}
 
 # ✅ 11. 전체 pdf 노트에 대한 필기 일괄 조회
 @router.get("/annotations/by_pdf/{pdf_id}", response_model=list[PdfAnnotationOut])
-def get_annotations_by_pdf(pdf_id: int, db: Session = Depends(get_db)):
+def get_annotations_by_pdf(pdf_id: int, decode: bool = Query(False), db: Session = Depends(get_db)):
     annotations = (
-        db.query(PdfAnnotation)
+        live_annotations(db)
         .join(PdfPage, PdfAnnotation.page_id == PdfPage.page_id)
         .filter(PdfPage.pdf_id == pdf_id)
         .all()
     )
-    return annotations
+    return _annotations_out(annotations, decode)
 
 
 # ✅ 12. pdf 썸네일 업로드
@@ -272,15 +329,10 @@ def delete_annotations_by_page(
     db: Session = Depends(get_db)
 ):
     user_id = get_current_user_id(request)
-    page = db.query(PdfPage).filter(PdfPage.page_id == page_id).first()
-    if not page:
-        raise HTTPException(status_code=404, detail="Page not found")
-    
-    note = db.query(PdfNote).filter(PdfNote.pdf_id == page.pdf_id).first()
-    if note.user_id != user_id:
-        raise HTTPException(status_code=403, detail="Permission denied")
+    page = get_annotation_page(db, page_id, user_id, for_update=True)
 
-    deleted = db.query(PdfAnnotation).filter(PdfAnnotation.page_id == page_id).delete()
+    # 증분 동기화 클라이언트가 삭제를 알 수 있게 tombstone 으로 남기고 버전 +1
+    deleted = delete_page_annotations(db, page)
     db.commit()
     return {"deleted": deleted}
 
@@ -364,7 +416,7 @@ def upload_pdf_file(
     db.commit()
     return new_note'''
 
-@router.post("/upload", response_model=PdfNoteOut)
+@router.post("/upload", response_model=PdfUploadOut)
 def upload_pdf_file(
     title: str = Form(...),
     folder_id: int = Form(None),
@@ -374,129 +426,323 @@ def upload_pdf_file(
 ):
     user_id = get_current_user_id(request)
 
-    # 1️⃣ 파일 저장
+    # 1️⃣ 파일 저장 (청크 단위 스트리밍 + sha256 동시 계산)
     ext = os.path.splitext(file.filename)[1].lower()
     if ext != ".pdf":
         raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
 
-    pdf_filename = f"pdf_{uuid4().hex[:8]}.pdf"
-    pdf_save_path = f"static/pdf/{pdf_filename}"
-    os.makedirs(os.path.dirname(pdf_save_path), exist_ok=True)
-    with open(pdf_save_path, "wb") as f_out:
-        f_out.write(file.file.read())
-
-    # 2️⃣ 페이지 수 확인 + 첫 페이지 비율 계산
-    doc = fitz.open(pdf_save_path)
-    total_pages = doc.page_count
-
-    aspect_ratio = None
-    if total_pages > 0:
-        first_page = doc[0]
-        width = first_page.rect.width
-        height = first_page.rect.height
-        if height != 0:
-            aspect_ratio = round(width / height, 5)
+    try:
+        sha256, tmp_path, size = stream_to_temp(file.file)
+    except NotAPdf:
+        raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="파일이 너무 큽니다.")
 
-    # 3️⃣ PdfNote DB 등록
-    new_note = PdfNote(
-        title=title,
-        file_path=pdf_save_path,
-        total_pages=total_pages,
+    # 2️⃣ blob 등록(중복이면 공유) + PdfNote 생성 + 페이지/썸네일/RAG 백그라운드 작업 등록
+    new_note, job = create_note_from_upload(
+        db,
         user_id=user_id,
+        title=title,
         folder_id=folder_id,
-        aspect_ratio=aspect_ratio
+        tmp_path=tmp_path,
+        sha256=sha256,
+        size=size,
     )
-    db.add(new_note)
-    db.commit()
-    db.refresh(new_note)
 
-    # 4️⃣ 각 페이지 PdfPage + 썸네일 저장
-    for i in range(total_pages):
-        image_filename = f"thumb_{new_note.pdf_id}_{i + 1}.png"
-        image_path = f"static/thumbnails/{image_filename}"
-        image_url = f"/static/thumbnails/{image_filename}"
+    result = PdfUploadOut.model_validate(new_note)
+    result.ingest_job_id = job.job_id
+    return result
+
+
+# ✅ 14-2. 대용량 PDF 이어 올리기 (resumable upload)
+# 1) POST /uploads                 → upload_id 발급
+# 2) PUT  /uploads/{id}            → Upload-Offset(또는 Content-Range) 위치부터 바이트 전송
+# 3) HEAD /uploads/{id}            → 끊긴 뒤 서버가 받은 offset 확인 (Upload-Offset 헤더)
+# 4) POST /uploads/{id}/finalize   → 노트 생성 + ingest 작업 등록 (/upload 와 같은 응답)
+def _upload_session_out(session) -> PdfUploadSessionOut:
+    result = PdfUploadSessionOut.model_validate(session)
+    result.chunk_size = RECOMMENDED_CHUNK_SIZE
+    return result
+
+
+def _upload_offset_headers(session) -> dict:
+    return {
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.total_size),
+        "Cache-Control": "no-store",
+    }
+
+
+def _parse_upload_offset(request: Request) -> int:
+    """Upload-Offset: 123  또는  Content-Range: bytes 123-456/789"""
+    value = request.headers.get("upload-offset")
+    if value is None:
+        content_range = request.headers.get("content-range", "")
+        if content_range.startswith("bytes "):
+            value = content_range[len("bytes "):].split("-", 1)[0]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Upload-Offset 또는 Content-Range 헤더가 필요합니다.")
 
-        try:
-            page_obj = doc[i]
-            width = page_obj.rect.width
-            height = page_obj.rect.height
-            page_aspect_ratio = round(width / height, 5) if height != 0 else None
-            generate_thumbnail(pdf_save_path, i + 1, image_path)
-        except Exception as e:
-            print(f"⚠️ 페이지 {i+1} 썸네일 생성 실패: {e}")
-            image_url = None
-            page_aspect_ratio = None
 
-        new_page = PdfPage(
-            pdf_id=new_note.pdf_id,
-            page_number=i + 1,
-            page_order=i + 1,
-            image_preview_url=image_url,
-            aspect_ratio=page_aspect_ratio,
-        )
-        db.add(new_page)
+@router.post("/uploads", response_model=PdfUploadSessionOut, status_code=201)
+def create_resumable_upload(body: PdfUploadSessionCreate, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    session = create_upload_session(db, user_id, body.title, body.folder_id, body.total_size)
+    return _upload_session_out(session)
 
-    db.commit()
 
-    # ✅ 5️⃣ RAG: 텍스트 추출 → 쪼개기 → 임베딩 → 벡터 DB 저장
-    # ✅ 5️⃣ RAG: 텍스트 추출 → 쪼개기 → 임베딩 → 벡터 DB 저장 (디버깅 로그 포함)
-    try:
-        print("📌 RAG 시작: import 시도 중...")
-        from services.pdf_utils import extract_text_from_pdf
-        from services.embedding_service import embed_chunks
-        from services.text_splitter import split_text_into_chunks
-        from utils.vector_db_utils import save_vector_db
-        print("✅ RAG import 성공")
+@router.head("/uploads/{upload_id}")
+def head_resumable_upload(upload_id: str, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    session = get_upload_session(db, upload_id, user_id)
+    return Response(status_code=200, headers=_upload_offset_headers(session))
 
-        print("📌 PDF 텍스트 추출 중...")
-        text = extract_text_from_pdf(pdf_save_path)
-        print(f"🔍 추출된 텍스트 길이: {len(text)}")
 
-        print("📌 텍스트 쪼개는 중...")
-        chunks = split_text_into_chunks(text)
-        print(f"🔍 쪼갠 청크 수: {len(chunks)}")
+@router.get("/uploads/{upload_id}", response_model=PdfUploadSessionOut)
+def get_resumable_upload(upload_id: str, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    session = get_upload_session(db, upload_id, user_id)
+    return _upload_session_out(session)
 
-        print("📌 임베딩 처리 중...")
-        embeddings = embed_chunks(chunks)# 임베딩 + 저장만 수행
-        print(f"🔍 임베딩 완료: {len(chunks)}개")  # chunks 개수를 출력
 
-        print("📌 벡터 DB 저장 중...")
-        save_vector_db(embeddings, chunks)
-        print("✅ RAG 벡터 저장 완료")
+@router.put("/uploads/{upload_id}", response_model=PdfUploadSessionOut)
+@router.patch("/uploads/{upload_id}", response_model=PdfUploadSessionOut)
+async def put_resumable_upload_chunk(upload_id: str, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    session = await run_in_threadpool(get_upload_session, db, upload_id, user_id)  # DB 조회는 이벤트 루프 밖에서
+    offset = _parse_upload_offset(request)
+
+    # 요청 본문을 메모리에 모으지 않고 받는 대로 part 파일에 기록 (쓰기는 append_chunk 가 스레드풀에서)
+    await append_chunk(db, session, offset, request.stream())
+    return JSONResponse(
+        content=_upload_session_out(session).model_dump(mode="json"),
+        headers=_upload_offset_headers(session),
+    )
 
 
-    except Exception as e:
-        print(f"❌ RAG 처리 실패: {e}")
+@router.post("/uploads/{upload_id}/finalize", response_model=PdfUploadOut)
+def finalize_resumable_upload(upload_id: str, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    session = get_upload_session(db, upload_id, user_id)
+    new_note, job = finalize_upload(db, session)
 
-    return new_note
+    result = PdfUploadOut.model_validate(new_note)
+    result.ingest_job_id = job.job_id
+    return result
+
+
+@router.delete("/uploads/{upload_id}", status_code=200)
+def abort_resumable_upload(upload_id: str, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    session = get_upload_session(db, upload_id, user_id)
+    abort_upload(db, session)
+    return {"message": "업로드가 취소되었습니다."}
+
+
+# ✅ 14-1. 업로드 후처리(ingest) 작업 상태 조회
+@router.get("/ingest/{job_id}", response_model=PdfIngestJobOut)
+def get_ingest_job_status(job_id: int, request: Request, db: Session = Depends(get_db)):
+    user_id = get_current_user_id(request)
+    job = get_ingest_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="ingest 작업을 찾을 수 없습니다.")
+    if job.user_id != user_id:
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+
+    return PdfIngestJobOut(
+        job_id=job.job_id,
+        pdf_id=job.pdf_id,
+        status=job.status,
+        stage=job.stage,
+        progress={
+            "pages": PdfIngestStageProgress(done=job.pages_done or 0, total=job.pages_total or 0),
+            "text": PdfIngestStageProgress(done=job.text_pages_done or 0, total=job.text_pages_total or 0),
+            "embeddings": PdfIngestStageProgress(done=job.chunks_done or 0, total=job.chunks_total or 0),
+        },
+        attempts=job.attempts or 0,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at,
+    )
 
 
 # ✅ 15. pdf 페이지 이미지 렌더링 (비율 포함)
+# - 렌더 결과는 디스크 캐시(파일 해시 + 페이지 + 배율 + 포맷 키)에 저장
+# - 같은 키 = 같은 이미지이므로 키를 강한 ETag로 사용 → If-None-Match 일치 시 304
+PAGE_IMAGE_SCALE = 2.0
+
 @router.get("/page-image/{pdf_id}/{page_number}")
-def get_pdf_page_image(pdf_id: int, page_number: int, db: Session = Depends(get_db)):
+def get_pdf_page_image(
+    pdf_id: int,
+    page_number: int,
+    request: Request,
+    format: Optional[str] = Query(None, description="png / jpeg / webp / avif (없으면 Accept 헤더로 결정)"),
+    quality: Optional[int] = Query(None, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    note = _get_pdf_note(db, pdf_id)
+    abs_path = _note_abs_path(note)
+    # 비율은 저장된 페이지 메타데이터에서 (캐시 적중 시 fitz를 전혀 열지 않음)
+    meta = get_page(db, note, page_number)
+
+    fmt, quality = _negotiate_image_format(request, format, quality)
+    key = render_cache.make_key(render_cache.file_digest(abs_path), page_number, PAGE_IMAGE_SCALE, fmt, quality)
+
+    response = _serve_cached_render(
+        request, key, fmt,
+        lambda: render_pdf_page(abs_path, page_number, scale_factor=PAGE_IMAGE_SCALE, fmt=fmt, quality=quality)["image_bytes"],
+    )
+    if response.status_code == 200:
+        response.headers["X-Aspect-Ratio"] = str(round(meta.height / meta.width, 4) if meta.width else 1.0)
+    return response
+
+
+def _negotiate_image_format(request: Request, requested: Optional[str], quality: Optional[int]):
+    """?format= > Accept 헤더 > PNG 순으로 포맷 결정. PNG는 무손실이라 quality를 키에서 제외"""
+    fmt = negotiate_format(request.headers.get("accept"), requested)
+    if fmt == "png":
+        return fmt, 0
+    return fmt, quality or IMAGE_QUALITY
+
+
+def _serve_cached_render(request: Request, key: str, fmt: str, render) -> Response:
+    """
+    렌더 캐시 공통 처리
+    1️⃣ If-None-Match 일치 → 렌더링/파일 읽기 없이 304
+    2️⃣ 디스크 캐시 적중 → 래스터라이즈 생략
+    3️⃣ 미스 → render() 결과를 저장 후 응답
+    """
+    etag = render_cache.make_etag(key)
+    # Accept 헤더에 따라 포맷이 달라지므로 Vary 필수
+    headers = {"ETag": etag, "Cache-Control": render_cache.CACHE_CONTROL, "Vary": "Accept"}
+
+    if render_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    ext = EXTENSIONS[fmt]
+    image_bytes = render_cache.get(key, ext)
+    if image_bytes is None:
+        image_bytes = render()
+        render_cache.put(key, ext, image_bytes)
+
+    return Response(content=image_bytes, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+# ✅ 15-1. 확대 보기용 타일 격자 정보 (레벨별 크기/행/열)
+@router.get("/page-tiles/{pdf_id}/{page_number}")
+def get_pdf_page_tile_grid(pdf_id: int, page_number: int, db: Session = Depends(get_db)):
+    meta = get_page(db, _get_pdf_note(db, pdf_id), page_number)
+    return {
+        "pdf_id": pdf_id,
+        "page_number": page_number,
+        "page_width": meta.width,
+        "page_height": meta.height,
+        "tile_size": TILE_SIZE,
+        "levels": get_tile_grid(meta.width, meta.height),
+    }
+
+
+# ✅ 15-2. 페이지 타일 이미지 (보이는 영역만 요청한 zoom으로 렌더링, 레벨별 캐시)
+@router.get("/page-tile/{pdf_id}/{page_number}/{zoom}/{col}/{row}")
+def get_pdf_page_tile(
+    pdf_id: int,
+    page_number: int,
+    zoom: int,
+    col: int,
+    row: int,
+    request: Request,
+    format: Optional[str] = Query(None, description="png / jpeg / webp / avif (없으면 Accept 헤더로 결정)"),
+    quality: Optional[int] = Query(None, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    abs_path = _get_pdf_abs_path(db, pdf_id)
+
+    fmt, quality = _negotiate_image_format(request, format, quality)
+    key = render_cache.make_key(
+        render_cache.file_digest(abs_path), "tile", page_number, zoom, col, row, TILE_SIZE, fmt, quality
+    )
+    return _serve_cached_render(
+        request, key, fmt,
+        lambda: render_pdf_tile(abs_path, page_number, zoom, col, row, fmt=fmt, quality=quality)["image_bytes"],
+    )
+
+
+def _get_pdf_note(db: Session, pdf_id: int) -> PdfNote:
     pdf = db.query(PdfNote).filter(PdfNote.pdf_id == pdf_id).first()
     if not pdf:
         raise HTTPException(status_code=404, detail="PDF 노트를 찾을 수 없습니다.")
-    
-    print(f"📂 Trying to open: {pdf.file_path}")  # 로그 추가
+    return pdf
+
+
+def _get_pdf_abs_path(db: Session, pdf_id: int) -> str:
+    return _note_abs_path(_get_pdf_note(db, pdf_id))
 
-    # 절대경로 테스트
-    import os
+
+def _note_abs_path(pdf: PdfNote) -> str:
     abs_path = os.path.abspath(pdf.file_path)
-    print(f"📂 Absolute path: {abs_path}")
     if not os.path.exists(abs_path):
         raise HTTPException(status_code=500, detail="PDF 파일이 존재하지 않습니다.")
+    return abs_path
 
-    result = render_pdf_page(abs_path, page_number)
-    image_bytes = result["image_bytes"]
-    aspect_ratio = result["aspect_ratio"]
-
-    return Response(
-        content=image_bytes,
-        media_type="image/png",
-        headers={"X-Aspect-Ratio": str(aspect_ratio)}
-    )
 
+# ✅ 15-3. 페이지 썸네일 (지연 생성)
+# - ingest가 lazy 모드면 PdfPage.image_preview_url 이 이 주소를 가리킴
+# - 처음 요청될 때 렌더링해서 static/thumbnails 에 저장, 이후에는 파일 그대로 응답
+# - prefetch: 요청한 페이지 앞뒤 N장을 백그라운드에서 미리 생성 (스크롤 시 대기 없음)
+@router.get("/thumbnail/{pdf_id}/{page_number}")
+def get_pdf_page_thumbnail(
+    pdf_id: int,
+    page_number: int,
+    request: Request,
+    prefetch: int = Query(2, ge=0, le=20),
+    db: Session = Depends(get_db),
+):
+    note = db.query(PdfNote).filter(PdfNote.pdf_id == pdf_id).first()
+    if not note or not note.file_path:
+        raise HTTPException(status_code=404, detail="PDF를 찾을 수 없습니다.")
+    if not 1 <= page_number <= (note.total_pages or 0):
+        raise HTTPException(status_code=404, detail="페이지를 찾을 수 없습니다.")
+
+    path = ensure_thumbnail(note, page_number)
+    prefetch_thumbnails(note, page_number, prefetch)
+    if not path:
+        raise HTTPException(status_code=500, detail="썸네일 생성 실패")
+
+    st = os.stat(path)
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": render_cache.CACHE_CONTROL}
+    if render_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=MEDIA_TYPES.get(THUMBNAIL_FORMAT, "image/png"), headers=headers)
+
+
+# ✅ 15-4. 전체 페이지 메타데이터 (크기/회전/텍스트 유무/이미지 수)
+# - 업로드 때 한 번 계산해서 저장한 값만 읽음 (PDF를 열지 않음)
+@router.get("/page-meta/{pdf_id}")
+def get_pdf_page_meta(pdf_id: int, db: Session = Depends(get_db)):
+    note = _get_pdf_note(db, pdf_id)
+    metas = get_page_meta(db, note)
+    if metas is None:
+        raise HTTPException(status_code=500, detail="PDF 페이지 정보를 읽을 수 없습니다.")
+    return {
+        "pdf_id": pdf_id,
+        "total_pages": len(metas),
+        "pages": [
+            {
+                "page_number": m.page_number,
+                "width": m.width,
+                "height": m.height,
+                "rotation": m.rotation,
+                "has_text": m.has_text,
+                "image_count": m.image_count,
+                "aspect_ratio": m.aspect_ratio,
+            }
+            for m in metas
+        ],
+    }
 
 
 # ✅ 16. PDF 노트 삭제 (노트 내 페이지, 필기 포함)
@@ -523,9 +769,15 @@ def delete_pdf_note(
     # 페이지 삭제
     db.query(PdfPage).filter(PdfPage.pdf_id == pdf_id).delete(synchronize_session=False)
 
-    # 노트 삭제
+    # 노트 삭제 + 원본 blob 참조 해제 (다른 노트가 안 쓰면 파일/썸네일/임베딩까지 삭제)
+    blob_sha256 = pdf_note.blob_sha256
     db.delete(pdf_note)
+    db.flush()
+    purge_blob = release_blob(db, blob_sha256)
     db.commit()
+    if purge_blob:
+        remove_blob_files(db, blob_sha256)
+    remove_document(user_id, pdf_id)
 
     return {"message": "PDF 노트가 삭제되었습니다."}
 
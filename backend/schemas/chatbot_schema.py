@@ -1,6 +1,10 @@
 # backend/schemas/chatbot_schema.py
 
+from typing import List, Optional
 from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     question: str
+    # 검색 범위 (둘 다 없으면 내 모든 노트)
+    folder_id: Optional[int] = None
+    pdf_ids: Optional[List[int]] = None
@@ -1,7 +1,7 @@
 # backend/schemas/pdf_schema.py
 
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 # [PDF 노트 생성용 요청 스키마]
@@ -23,6 +23,48 @@ class PdfNoteOut(BaseModel):
     class Config:
         from_attributes = True
 
+# [PDF 업로드 응답 스키마] - 노트 정보 + 백그라운드 ingest 작업 id
+class PdfUploadOut(PdfNoteOut):
+    ingest_job_id: Optional[int] = None
+
+# [ingest 작업 상태 응답 스키마]
+class PdfIngestStageProgress(BaseModel):
+    done: int
+    total: int
+
+class PdfIngestJobOut(BaseModel):
+    job_id: int
+    pdf_id: int
+    status: str
+    stage: Optional[str] = None
+    progress: dict[str, PdfIngestStageProgress]
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+# [이어 올리기 세션 생성 요청 스키마]
+class PdfUploadSessionCreate(BaseModel):
+    title: str
+    folder_id: Optional[int] = None
+    total_size: int
+
+# [이어 올리기 세션 상태 응답 스키마]
+class PdfUploadSessionOut(BaseModel):
+    upload_id: str
+    title: str
+    folder_id: Optional[int] = None
+    total_size: int
+    offset: int
+    status: str
+    pdf_id: Optional[int] = None
+    expires_at: datetime
+    chunk_size: Optional[int] = None  # 권장 PUT 크기
+
+    class Config:
+        from_attributes = True
+
 # [페이지 생성 요청용 스키마]
 class PdfPageCreate(BaseModel):
     pdf_id: int
@@ -44,24 +86,53 @@ class PdfPageOut(BaseModel):
         from_attributes = True
 
 # [필기 저장 요청용 스키마]
+# annotation_type == "pen_packed" 이면 packed(base64, utils/stroke_codec.py 포맷) 또는 data({"lines": [...]}) 중 하나
 class PdfAnnotationCreate(BaseModel):
     page_id: int
     page_number: int
     annotation_type: str
-    data: dict
+    data: Optional[dict] = None
+    packed: Optional[str] = None
 
-# [필기 응답용 스키마]
+# [필기 응답용 스키마] - pen_packed 필기는 packed(base64)로, decode=true 면 data 로 풀어서
 class PdfAnnotationOut(BaseModel):
     annotations_id: int
     page_id: int
     page_number: int
     annotation_type: str
-    data: dict
+    data: Optional[dict] = None
+    packed: Optional[str] = None
+    stroke_id: Optional[str] = Field(None, validation_alias="stroke_uid")
+    version: Optional[int] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+# [증분 동기화] 추가할 필기 하나 (stroke_id 는 클라이언트가 만든 id, 페이지 안에서 유일)
+class AnnotationStrokeIn(BaseModel):
+    stroke_id: str = Field(..., min_length=1, max_length=64)
+    annotation_type: str = "pen_packed"
+    data: Optional[dict] = None
+    packed: Optional[str] = None
+
+# [증분 동기화 요청] base_version: 클라이언트가 마지막으로 받은 페이지 버전
+class AnnotationSyncIn(BaseModel):
+    base_version: int = Field(..., ge=0)
+    add: List[AnnotationStrokeIn] = []
+    remove: List[str] = []
+
+# [증분 동기화 응답] since 이후 바뀐 것 (sync 응답이면 다른 기기가 바꾼 것만)
+class AnnotationChangesOut(BaseModel):
+    page_id: int
+    version: int
+    added: List[PdfAnnotationOut]
+    removed: List[str]
+
+class AnnotationSyncOut(AnnotationChangesOut):
+    added_count: int
+    removed_count: int
+
 # [폴더 생성 요청용 스키마]
 class PdfFolderCreate(BaseModel):
     name: str  
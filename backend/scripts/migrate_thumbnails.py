@@ -0,0 +1,108 @@
+# backend/scripts/migrate_thumbnails.py
+"""
+저장된 썸네일(static/thumbnails/*.png)을 WebP/JPEG/AVIF로 다시 인코딩하는 마이그레이션 도구
+
+실행 (backend 디렉터리에서):
+    python -m scripts.migrate_thumbnails --dry-run                # 절감량만 계산
+    python -m scripts.migrate_thumbnails --format webp --update-db  # 변환 + PdfPage.image_preview_url 갱신
+    python -m scripts.migrate_thumbnails --update-db --delete-originals
+
+- --update-db 없이 변환하면 새 파일만 옆에 생성 (기존 URL은 그대로 동작)
+- --delete-originals 는 --update-db 와 함께일 때만, PdfPage 행이 새 URL로 바뀐 원본 PNG만 지움
+  (/pdf/thumbnails 로 올린 thumb_{page_id}_* 처럼 DB에 없고 클라이언트만 아는 URL은 남겨 둠)
+"""
+import argparse
+import glob
+import os
+
+from utils.image_format import reencode_image_bytes, normalize_format, EXTENSIONS, IMAGE_QUALITY
+
+THUMBNAIL_DIR = "static/thumbnails"
+
+
+def migrate(fmt: str, quality: int, dry_run: bool, update_db: bool, delete_originals: bool) -> dict:
+    paths = sorted(glob.glob(os.path.join(THUMBNAIL_DIR, "*.png")))
+    ext = EXTENSIONS[fmt]
+    before_total = after_total = failed = 0
+    renamed = {}  # 기존 URL → 새 URL
+
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            encoded = reencode_image_bytes(data, fmt, quality)
+        except Exception as e:
+            print(f"⚠️ 변환 실패: {path} | {e}")
+            failed += 1
+            continue
+
+        before_total += len(data)
+        after_total += len(encoded)
+        if dry_run:
+            continue
+
+        new_path = os.path.splitext(path)[0] + f".{ext}"
+        with open(new_path, "wb") as f:
+            f.write(encoded)
+        renamed["/" + path.replace(os.sep, "/")] = "/" + new_path.replace(os.sep, "/")
+
+    updated_rows = deleted = 0
+    if update_db and renamed:
+        from db import SessionLocal
+        from models.pdf_pages import PdfPage
+
+        referenced = []  # DB 행이 새 URL로 옮겨 간 원본만
+        with SessionLocal() as db:
+            for old_url, new_url in renamed.items():
+                count = (
+                    db.query(PdfPage)
+                    .filter(PdfPage.image_preview_url == old_url)
+                    .update({PdfPage.image_preview_url: new_url}, synchronize_session=False)
+                )
+                if count:
+                    referenced.append(old_url)
+                updated_rows += count
+            db.commit()
+
+        if delete_originals:
+            for old_url in referenced:
+                os.remove(old_url.lstrip("/"))
+            deleted = len(referenced)
+
+    return {
+        "files": len(paths) - failed,
+        "failed": failed,
+        "bytes_before": before_total,
+        "bytes_after": after_total,
+        "updated_rows": updated_rows,
+        "deleted": deleted,
+        "kept": len(renamed) - deleted if delete_originals else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--format", default="webp", help="webp / jpeg / avif")
+    parser.add_argument("--quality", type=int, default=IMAGE_QUALITY)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--update-db", action="store_true")
+    parser.add_argument("--delete-originals", action="store_true")
+    args = parser.parse_args()
+
+    fmt = normalize_format(args.format)
+    if not fmt or fmt == "png":
+        raise SystemExit(f"❌ 변환할 수 없는 포맷: {args.format}")
+
+    result = migrate(fmt, args.quality, args.dry_run, args.update_db, args.delete_originals)
+    before, after = result["bytes_before"], result["bytes_after"]
+    saved = (1 - after / before) * 100 if before else 0.0
+    print(f"📦 썸네일 {result['files']}개 (실패 {result['failed']}), {fmt} q={args.quality}")
+    print(f"   {before / 1024 / 1024:.2f}MB → {after / 1024 / 1024:.2f}MB ({saved:.1f}% 절감)")
+    if args.update_db:
+        print(f"   PdfPage.image_preview_url {result['updated_rows']}건 갱신")
+    if args.delete_originals and args.update_db:
+        print(f"   원본 PNG {result['deleted']}개 삭제, DB에서 참조하지 않는 {result['kept']}개는 유지")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# backend/scripts/rebuild_user_indexes.py
+"""
+기존 노트를 사용자별 벡터 인덱스(vector_db/users/{user_id}/)에 채워 넣는 백필 도구
+
+예전 전역 인덱스(vector_db/faiss.index)는 마지막 업로드만 들어 있어서 옮길 수 없으므로
+노트마다 텍스트를 다시 추출해서 임베딩한다. 같은 교재(blob)는 blob 임베딩/임베딩 캐시가 있으면 API 호출 없이 끝난다.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.rebuild_user_indexes                 # 인덱스에 아직 없는 노트만
+    python -m scripts.rebuild_user_indexes --user 3 --force  # 해당 사용자 노트 전부 다시
+    VECTOR_INDEX_KIND=hnsw python -m scripts.rebuild_user_indexes --reindex-only  # 저장된 벡터로 인덱스 종류만 바꿈
+"""
+import argparse
+import os
+
+from db import SessionLocal
+from models.pdf_notes import PdfNote
+from services.embedding_service import embed_chunk_stream
+from services.text_pipeline import iter_chunk_batches
+from services.vector_index_manager import USER_INDEX_DIR, count_chunks, rebuild_index
+
+
+def rebuild(user_id: int = None, force: bool = False) -> dict:
+    db = SessionLocal()
+    try:
+        query = db.query(PdfNote).filter(PdfNote.file_path.isnot(None))
+        if user_id is not None:
+            query = query.filter(PdfNote.user_id == user_id)
+        notes = query.order_by(PdfNote.user_id, PdfNote.pdf_id).all()
+    finally:
+        db.close()
+
+    done = skipped = failed = 0
+    for note in notes:
+        if not force and count_chunks(note.user_id, note.pdf_id):
+            skipped += 1
+            continue
+        if not os.path.exists(note.file_path):
+            print(f"⚠️ 파일 없음: pdf_id={note.pdf_id} | {note.file_path}")
+            failed += 1
+            continue
+        try:
+            batches = iter_chunk_batches(note.file_path, note.pdf_id)
+            embed_chunk_stream(
+                (([c.text for c in batch], [c.meta for c in batch]) for _, batch in batches),
+                blob_sha256=note.blob_sha256, user_id=note.user_id, pdf_id=note.pdf_id,
+            )
+            done += 1
+        except Exception as e:
+            print(f"❌ 인덱싱 실패: pdf_id={note.pdf_id} | {e}")
+            failed += 1
+
+    return {"notes": len(notes), "indexed": done, "skipped": skipped, "failed": failed}
+
+
+def reindex(user_id: int = None) -> int:
+    """임베딩은 그대로 두고 현재 설정(VECTOR_INDEX_KIND/AUTO)으로 인덱스만 다시 만듦"""
+    if user_id is not None:
+        user_ids = [user_id]
+    elif os.path.isdir(USER_INDEX_DIR):
+        user_ids = sorted(int(name) for name in os.listdir(USER_INDEX_DIR) if name.isdigit())
+    else:
+        user_ids = []
+    for uid in user_ids:
+        rebuild_index(uid)
+    return len(user_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user", type=int, default=None, help="이 사용자 노트만")
+    parser.add_argument("--force", action="store_true", help="이미 인덱스에 있는 노트도 다시")
+    parser.add_argument("--reindex-only", action="store_true", help="다시 임베딩하지 않고 인덱스 종류만 재구성")
+    args = parser.parse_args()
+
+    if args.reindex_only:
+        print(f"✅ 완료: 사용자 {reindex(args.user)}명 인덱스 재구성")
+        return
+
+    result = rebuild(args.user, args.force)
+    print(f"✅ 완료: 노트 {result['notes']}개 중 {result['indexed']}개 인덱싱, "
+          f"{result['skipped']}개 건너뜀, {result['failed']}개 실패")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# backend/scripts/stub_embedding_server.py
+"""
+로컬 테스트용 OpenAI 호환 임베딩 서버 (POST /v1/embeddings)
+
+- 같은 텍스트 → 항상 같은 벡터 (sha256 시드), 네트워크/과금 없이 배치 클라이언트 동작 확인용
+- --latency : 요청마다 고정 지연(ms) + 입력당 지연(ms) → 순차 호출 vs 배치/동시 전송 비교
+- --fail-rate : 이 확률로 429/500 응답 → 재시도/백오프 확인
+- 입력 중 "__bad__" 가 들어 있으면 400 → 배치 분할 처리 확인
+
+실행 (backend 디렉터리에서):
+    python -m scripts.stub_embedding_server --port 8089 --latency 80 --fail-rate 0.1
+    EMBEDDING_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub uvicorn main:app
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+def stub_vector(text: str, dim: int) -> list:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    v = np.random.default_rng(seed).standard_normal(dim).astype("float32")
+    return (v / np.linalg.norm(v)).tolist()
+
+
+def make_handler(dim: int, latency_ms: float, per_input_ms: float, fail_rate: float, stats: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):  # 요청마다 로그 출력 안 함
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/embeddings"):
+                return self._send(404, {"error": {"message": "not found"}})
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            inputs = payload.get("input")
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+
+            stats["requests"] += 1
+            stats["inputs"] += len(inputs)
+            time.sleep((latency_ms + per_input_ms * len(inputs)) / 1000)
+
+            if random.random() < fail_rate:
+                stats["failures"] += 1
+                if random.random() < 0.5:
+                    return self._send(429, {"error": {"message": "rate limited (stub)"}}, {"retry-after": "0.05"})
+                return self._send(500, {"error": {"message": "server error (stub)"}})
+            if any("__bad__" in text for text in inputs):
+                return self._send(400, {"error": {"message": "invalid input (stub)", "type": "invalid_request_error"}})
+
+            return self._send(200, {
+                "object": "list",
+                "model": payload.get("model", "stub"),
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": stub_vector(text, dim)}
+                    for i, text in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": sum(len(t) for t in inputs), "total_tokens": sum(len(t) for t in inputs)},
+            })
+
+    return Handler
+
+
+def start_stub_server(port: int = 0, dim: int = 1536, latency_ms: float = 0, per_input_ms: float = 0, fail_rate: float = 0.0):
+    """백그라운드 스레드로 서버 시작 → (server, base_url, stats). 벤치마크에서 사용"""
+    stats = {"requests": 0, "inputs": 0, "failures": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(dim, latency_ms, per_input_ms, fail_rate, stats))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1", stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--latency", type=float, default=0, help="요청당 지연(ms)")
+    parser.add_argument("--per-input", type=float, default=0, help="입력 1개당 추가 지연(ms)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, base_url, _ = start_stub_server(args.port, args.dim, args.latency, args.per_input, args.fail_rate)
+    print(f"🧪 stub 임베딩 서버: {base_url}/embeddings (dim={args.dim}, latency={args.latency}ms, fail_rate={args.fail_rate})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
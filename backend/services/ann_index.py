@@ -0,0 +1,161 @@
+# backend/services/ann_index.py
+"""
+벡터 인덱스 종류 선택/생성 (사용자 인덱스용)
+
+- flat     : 정확한 전수 비교 (IndexFlatL2). 작은 코퍼스는 이게 제일 빠르고 학습도 필요 없음
+- ivf_flat : 코퍼스를 nlist개 군집으로 나눠 nprobe개 군집만 비교. 원본 벡터 보관 → 재현율 높음
+- hnsw     : 그래프 탐색 (efSearch). 빠르지만 메모리를 더 쓰고 remove_ids 미지원 → 삭제 시 재구성
+- ivf_pq   : IVF + 곱 양자화(PQ) 압축. 1536차원 기준 벡터당 6KB → 192B, 큰 코퍼스용 (근사 거리)
+
+자동 선택(VECTOR_INDEX_KIND=auto)은 VECTOR_INDEX_AUTO 규칙을 따름:
+    "flat:20000,ivf_flat:300000,ivf_pq"  → 2만 미만 flat, 30만 미만 ivf_flat, 그 이상 ivf_pq
+hnsw 는 노트 삭제마다 재구성이 필요해서 기본 규칙에서는 빠져 있음 (규칙이나 VECTOR_INDEX_KIND 로 지정 가능)
+
+(pdf_id << 20 | 청크 번호) id를 그대로 씀:
+- flat / hnsw 는 IndexIDMap2 로 감쌈
+- IVF 계열은 감싸지 않고 IVF 자체의 add_with_ids / remove_ids 사용
+  (IDMap2 로 감싼 IVF 에서 remove_ids 를 하면 내부 순서가 바뀌어 id 매핑이 깨짐 → 예전에 그렇게 만든 인덱스는 재구성)
+"""
+import math
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+KINDS = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+INDEX_KIND = os.getenv("VECTOR_INDEX_KIND", "auto")
+AUTO_POLICY = os.getenv("VECTOR_INDEX_AUTO", "flat:20000,ivf_flat:300000,ivf_pq")
+NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "16"))
+EF_SEARCH = int(os.getenv("VECTOR_INDEX_EF_SEARCH", "64"))
+HNSW_M = int(os.getenv("VECTOR_INDEX_HNSW_M", "32"))
+TRAIN_SAMPLE = int(os.getenv("VECTOR_INDEX_TRAIN_SAMPLE", "100000"))  # 학습에 쓰는 최대 벡터 수
+
+_CLASS_KINDS = {
+    "IndexFlat": "flat", "IndexFlatL2": "flat",
+    "IndexIVFFlat": "ivf_flat",
+    "IndexHNSWFlat": "hnsw",
+    "IndexIVFPQ": "ivf_pq",
+}
+
+
+def parse_policy(policy: str) -> List[Tuple[str, Optional[int]]]:
+    """"flat:20000,ivf_flat:300000,ivf_pq" → [("flat", 20000), ("ivf_flat", 300000), ("ivf_pq", None)]"""
+    rules = []
+    for part in policy.split(","):
+        kind, _, limit = part.strip().partition(":")
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 인덱스 종류: {kind}")
+        rules.append((kind, int(limit) if limit else None))
+    return rules
+
+
+def choose_kind(n: int, kind: Optional[str] = None, policy: Optional[str] = None) -> str:
+    kind = kind or INDEX_KIND
+    if kind != "auto":
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 인덱스 종류: {kind}")
+        return kind
+    for rule_kind, limit in parse_policy(policy or AUTO_POLICY):
+        if limit is None or n < limit:
+            return rule_kind
+    return "flat"
+
+
+def nlist_for(n: int) -> int:
+    """IVF 군집 수: 4·√n (군집당 최소 39개 학습 벡터가 되도록 상한)"""
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def pq_m_for(d: int) -> int:
+    """PQ 부분공간 수: 부분공간당 8차원 안팎이 되도록 d의 약수 중에서 (1536 → 192, 벡터당 192B)"""
+    for sub_dim in (8, 12, 16, 6, 4, 24, 32, 2, 1):
+        if d % sub_dim == 0:
+            return d // sub_dim
+    return 1
+
+
+def factory_string(kind: str, n: int, d: int) -> str:
+    if kind == "flat":
+        return "IDMap2,Flat"
+    if kind == "ivf_flat":
+        return f"IVF{nlist_for(n)},Flat"
+    if kind == "hnsw":
+        return f"IDMap2,HNSW{HNSW_M}"
+    if kind == "ivf_pq":
+        return f"IVF{nlist_for(n)},PQ{pq_m_for(d)}x8"
+    raise ValueError(f"알 수 없는 인덱스 종류: {kind}")
+
+
+def build_index(vectors: np.ndarray, ids: np.ndarray, kind: str = None, seed: int = 0):
+    """
+    벡터 전체로 인덱스를 새로 만듦 (IVF 계열은 표본으로 학습)
+
+    kind 를 안 주면 벡터 개수로 자동 선택
+    """
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    n, d = vectors.shape
+    kind = kind or choose_kind(n)
+    if kind in ("ivf_flat", "ivf_pq") and n < 256:
+        kind = "flat"  # 학습할 벡터가 너무 적으면 군집/코드북이 의미 없음
+
+    index = faiss.index_factory(d, factory_string(kind, n, d))
+    if kind == "ivf_pq":
+        ivf = faiss.downcast_index(faiss.extract_index_ivf(index))
+        ivf.do_polysemous_training = False  # 해밍 거리 필터는 안 쓰므로 비싼 추가 학습 생략
+        ivf.pq.cp.max_points_per_centroid = 64  # 코드북 학습 표본 상한 (256 × 64)
+    if not index.is_trained:
+        sample = vectors
+        if n > TRAIN_SAMPLE:
+            sample = vectors[np.random.default_rng(seed).choice(n, TRAIN_SAMPLE, replace=False)]
+        index.train(sample)
+    if kind == "hnsw":
+        faiss.downcast_index(index.index).hnsw.efSearch = EF_SEARCH
+    index.add_with_ids(vectors, np.asarray(ids, dtype="int64"))
+    return index
+
+
+def index_kind(index) -> str:
+    import faiss
+    base = faiss.downcast_index(index.index) if hasattr(index, "id_map") else faiss.downcast_index(index)
+    return _CLASS_KINDS.get(type(base).__name__, "flat")
+
+
+def _wrapped_ivf(index) -> bool:
+    """예전 방식(IDMap2 로 감싼 IVF): remove_ids 를 쓰면 id 매핑이 깨짐"""
+    return hasattr(index, "id_map") and index_kind(index) in ("ivf_flat", "ivf_pq")
+
+
+def supports_remove(index) -> bool:
+    return index_kind(index) != "hnsw" and not _wrapped_ivf(index)
+
+
+def needs_rebuild(index, n: int) -> bool:
+    """코퍼스 크기가 바뀌어서 다른 종류가 맞거나, IVF 군집 수가 너무 작아졌으면 재구성"""
+    import faiss
+
+    if _wrapped_ivf(index):
+        return True
+    kind = index_kind(index)
+    target = choose_kind(n)
+    if target in ("ivf_flat", "ivf_pq") and n < 256:
+        target = "flat"
+    if kind != target:
+        return True
+    if kind in ("ivf_flat", "ivf_pq"):
+        return nlist_for(n) > 2 * faiss.extract_index_ivf(index).nlist
+    return False
+
+
+def search_params(index, selector=None, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """인덱스 종류에 맞는 검색 파라미터 (재현율/속도 조절 + id 필터)"""
+    import faiss
+
+    kind = index_kind(index)
+    if kind in ("ivf_flat", "ivf_pq"):
+        return faiss.SearchParametersIVF(nprobe=nprobe or NPROBE, sel=selector)
+    if kind == "hnsw":
+        return faiss.SearchParametersHNSW(efSearch=ef_search or EF_SEARCH, sel=selector)
+    return faiss.SearchParameters(sel=selector) if selector is not None else None
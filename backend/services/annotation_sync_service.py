@@ -0,0 +1,201 @@
+# backend/services/annotation_sync_service.py
+"""
+필기 저장/증분 동기화
+
+예전에는 필기를 조금만 고쳐도 DELETE /pdf/annotations/{page_id} 로 페이지를 비우고 전부 다시 올렸다.
+
+- 페이지마다 버전(PdfPage.annotation_version): 필기가 바뀔 때마다 +1
+- 필기 행마다 추가된 버전(version), 지워진 버전(deleted_version, tombstone), 클라이언트 id(stroke_uid)
+- POST /pdf/annotations/{page_id}/sync : base_version 기준으로 추가(add)/삭제(remove) 적용
+    · base_version 이후 다른 기기가 바꾼 필기와 같은 id 를 건드리면 409 (conflicts 에 id 목록)
+      → 클라이언트는 GET .../changes?since=base_version 으로 받아서 합친 뒤 새 버전으로 다시 요청
+    · 겹치지 않으면 그대로 적용하고, 그 사이 다른 기기가 바꾼 것을 같이 돌려줌
+- GET /pdf/annotations/{page_id}/changes?since=N : N 이후 추가된 필기 + 지워진 id
+- 지워진 필기는 내용을 비운 tombstone 으로 남겨서 오래된 클라이언트도 삭제를 알 수 있게 함
+"""
+import base64
+import binascii
+from typing import Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.pdf_annotations import PdfAnnotation, PACKED_ANNOTATION_TYPE
+from models.pdf_notes import PdfNote
+from models.pdf_pages import PdfPage
+from utils.stroke_codec import StrokeCodecError, decode_strokes, encode_strokes
+
+
+# ✅ 저장할 내용 변환 (pen_packed 는 바이너리로)
+def build_payload(annotation_type: str, data: Optional[dict], packed: Optional[str]) -> Tuple[Optional[dict], Optional[bytes]]:
+    """
+    → (data, stroke_data)
+    - pen_packed: packed(base64)를 검증해서 그대로, 또는 data({"lines": [...]})를 서버에서 인코딩
+    - 그 외 종류: data(JSON) 그대로
+    """
+    if annotation_type != PACKED_ANNOTATION_TYPE:
+        if data is None:
+            raise HTTPException(status_code=400, detail="data 가 필요합니다.")
+        return data, None
+    try:
+        if packed is not None:
+            stroke_data = base64.b64decode(packed, validate=True)
+            decode_strokes(stroke_data)  # 깨진 데이터는 저장 전에 거절
+        elif data is not None:
+            stroke_data = encode_strokes(data.get("lines") or [])
+        else:
+            raise HTTPException(status_code=400, detail="packed 또는 data 가 필요합니다.")
+    except (binascii.Error, StrokeCodecError) as e:
+        raise HTTPException(status_code=400, detail=f"필기 데이터 형식 오류: {e}")
+    return None, stroke_data
+
+
+def get_page(db: Session, page_id: int, user_id: Optional[int] = None, for_update: bool = False) -> PdfPage:
+    """페이지 조회 (for_update 면 행 잠금, user_id 를 주면 소유자 확인)"""
+    query = db.query(PdfPage).filter(PdfPage.page_id == page_id)
+    page = (query.with_for_update() if for_update else query).first()
+    if not page:
+        raise HTTPException(status_code=404, detail="Page not found")
+    if user_id is not None:
+        note = db.query(PdfNote).filter(PdfNote.pdf_id == page.pdf_id).first()
+        if not note or note.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Permission denied")
+    return page
+
+
+def next_version(page: PdfPage) -> int:
+    page.annotation_version = (page.annotation_version or 0) + 1
+    return page.annotation_version
+
+
+def live_annotations(db: Session):
+    """지워지지 않은 필기 쿼리 (목록 조회용)"""
+    return db.query(PdfAnnotation).filter(PdfAnnotation.deleted_version.is_(None))
+
+
+def _tombstone(rows: Iterable[PdfAnnotation], version: int) -> int:
+    count = 0
+    for row in rows:
+        row.deleted_version = version
+        row.data = None
+        row.stroke_data = None
+        count += 1
+    return count
+
+
+def delete_page_annotations(db: Session, page: PdfPage) -> int:
+    """페이지 필기 전부 삭제 (tombstone, 새 버전 한 번). 커밋은 호출자"""
+    rows = live_annotations(db).filter(PdfAnnotation.page_id == page.page_id).all()
+    if not rows:
+        return 0
+    return _tombstone(rows, next_version(page))
+
+
+# ✅ 변경분 조회
+def _changes(db: Session, page_id: int, since: int) -> Tuple[List[PdfAnnotation], List[str]]:
+    added = (
+        live_annotations(db)
+        .filter(PdfAnnotation.page_id == page_id, PdfAnnotation.version > since)
+        .order_by(PdfAnnotation.version, PdfAnnotation.annotations_id)
+        .all()
+    )
+    # since 이후에 추가됐다가 지워진 것은 클라이언트가 모르므로 제외
+    removed = [
+        uid for (uid,) in db.query(PdfAnnotation.stroke_uid).filter(
+            PdfAnnotation.page_id == page_id,
+            PdfAnnotation.deleted_version > since,
+            PdfAnnotation.version <= since,
+        )
+    ]
+    return added, removed
+
+
+def get_changes(db: Session, page_id: int, since: int, user_id: Optional[int] = None) -> dict:
+    page = get_page(db, page_id, user_id)
+    version = page.annotation_version or 0
+    if since > version:
+        raise HTTPException(status_code=409, detail={
+            "message": "클라이언트 버전이 서버보다 앞섭니다. since=0 으로 전체를 다시 받으세요.",
+            "version": version,
+        })
+    added, removed = _changes(db, page_id, since)
+    return {"page_id": page_id, "version": version, "added": added, "removed": removed}
+
+
+# ✅ 증분 동기화
+def sync_page(db: Session, page_id: int, user_id: int, base_version: int, add: list, remove: List[str]) -> dict:
+    """
+    base_version 기준 추가/삭제 적용 → 새 버전 + 그 사이 다른 기기가 바꾼 것
+    (add 항목: stroke_id, annotation_type, data, packed)
+    """
+    page = get_page(db, page_id, user_id, for_update=True)
+    current = page.annotation_version or 0
+    if base_version > current:
+        raise HTTPException(status_code=409, detail={
+            "message": "클라이언트 버전이 서버보다 앞섭니다. since=0 으로 전체를 다시 받으세요.",
+            "version": current,
+            "conflicts": [],
+        })
+
+    add_ids = [item.stroke_id for item in add]
+    if len(set(add_ids)) != len(add_ids):
+        raise HTTPException(status_code=400, detail="add 안에 같은 stroke_id 가 있습니다.")
+
+    # base_version 이후 다른 기기가 건드린 id 와 겹치면 충돌
+    missed_added, missed_removed = _changes(db, page_id, base_version)
+    touched = set(add_ids) | set(remove)
+    conflicts = touched & ({row.stroke_uid for row in missed_added} | set(missed_removed))
+    # 이미 있는 id 로 추가 (같은 요청 재전송 등)
+    if add_ids:
+        conflicts |= {
+            uid for (uid,) in db.query(PdfAnnotation.stroke_uid).filter(
+                PdfAnnotation.page_id == page_id, PdfAnnotation.stroke_uid.in_(add_ids)
+            )
+        }
+    if conflicts:
+        db.rollback()
+        raise HTTPException(status_code=409, detail={
+            "message": "다른 기기에서 같은 필기를 수정했습니다. 변경분을 받아서 합친 뒤 다시 요청하세요.",
+            "version": current,
+            "conflicts": sorted(conflicts),
+        })
+
+    payloads = [build_payload(item.annotation_type, item.data, item.packed) for item in add]
+    removed_count = 0
+    if add or remove:
+        version = next_version(page)
+        if remove:
+            rows = live_annotations(db).filter(
+                PdfAnnotation.page_id == page_id, PdfAnnotation.stroke_uid.in_(remove)
+            ).all()
+            removed_count = _tombstone(rows, version)  # 없는 id 는 무시 (이미 지워진 것)
+        for item, (data, stroke_data) in zip(add, payloads):
+            db.add(PdfAnnotation(
+                page_id=page_id,
+                page_number=page.page_number,
+                annotation_type=item.annotation_type,
+                data=data,
+                stroke_data=stroke_data,
+                stroke_uid=item.stroke_id,
+                version=version,
+            ))
+        db.commit()
+    else:
+        db.rollback()  # 바꿀 것 없음: 잠금만 풀고 변경분만 돌려줌
+
+    print(f"✏️ 필기 동기화: page_id={page_id}, v{base_version}→v{page.annotation_version} "
+          f"(추가 {len(add)}, 삭제 {removed_count}, 받을 변경 {len(missed_added) + len(missed_removed)})")
+    return {
+        "page_id": page_id,
+        "version": page.annotation_version or 0,
+        "added": missed_added,
+        "removed": missed_removed,
+        "added_count": len(add),
+        "removed_count": removed_count,
+    }
+
+
+def new_stroke_uid() -> str:
+    """예전 API(POST /pdf/annotations)로 만든 필기에 붙일 id"""
+    return uuid4().hex
@@ -0,0 +1,181 @@
+# backend/services/blob_store.py
+"""
+PDF 원본 파일 content-addressed 저장소
+
+- 업로드를 고정 크기 청크로 디스크에 흘려 쓰면서 sha256을 같이 계산 (메모리 사용량 = 버퍼 1개)
+- 같은 내용의 PDF는 static/pdf/blobs/{sha256}.pdf 하나만 저장하고, 썸네일/임베딩 세트도 blob 단위로 공유
+- 노트가 생길 때 ref_count +1, 노트가 지워질 때 -1 → 0이 되면 파일/썸네일/임베딩까지 삭제
+"""
+import glob
+import hashlib
+import os
+from typing import BinaryIO, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.pdf_blob import PdfBlob
+
+BLOB_DIR = "static/pdf/blobs"
+TMP_DIR = "static/pdf/tmp"
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 1MB
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "1024")) * 1024 * 1024
+
+PDF_MAGIC = b"%PDF-"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class NotAPdf(Exception):
+    pass
+
+
+def blob_path(sha256: str) -> str:
+    return f"{BLOB_DIR}/{sha256}.pdf"
+
+
+def thumbnail_prefix(sha256: str) -> str:
+    """blob 공유 썸네일 파일명 접두어 (thumb_b{sha 앞 16자리}_{page}.webp)"""
+    return f"thumb_b{sha256[:16]}"
+
+
+def new_temp_path() -> str:
+    os.makedirs(TMP_DIR, exist_ok=True)
+    return f"{TMP_DIR}/upload_{uuid4().hex}.part"
+
+
+# ✅ 스트리밍 저장 + 해시
+def stream_to_temp(src: BinaryIO, max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[str, str, int]:
+    """
+    업로드 스트림을 CHUNK_SIZE 단위로 임시 파일에 쓰면서 sha256 계산
+
+    Returns:
+        (sha256, 임시 파일 경로, 바이트 수)
+    """
+    tmp_path = new_temp_path()
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                block = src.read(CHUNK_SIZE)
+                if not block:
+                    break
+                if size == 0 and not block.startswith(PDF_MAGIC):
+                    raise NotAPdf()
+                size += len(block)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                h.update(block)
+                out.write(block)
+        if size == 0:
+            raise NotAPdf()
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return h.hexdigest(), tmp_path, size
+
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ✅ blob 등록 / 참조 증가
+def commit_blob(db: Session, sha256: str, tmp_path: str, size: int) -> PdfBlob:
+    """
+    임시 파일을 blob으로 등록하고 참조 수 +1 (커밋은 호출자가 노트 생성과 함께 수행)
+    - 이미 같은 내용이 있으면 임시 파일은 버리고 기존 blob 재사용
+    """
+    blob = db.query(PdfBlob).filter(PdfBlob.sha256 == sha256).with_for_update().first()
+    if blob and os.path.exists(blob.file_path):
+        os.remove(tmp_path)
+        blob.ref_count += 1
+        print(f"♻️ 중복 PDF 재사용: {sha256[:12]} (ref_count={blob.ref_count})")
+        return blob
+
+    path = blob_path(sha256)
+    os.makedirs(BLOB_DIR, exist_ok=True)
+
+    if blob:  # 행은 있는데 파일이 사라진 경우 → 파일만 복구
+        os.replace(tmp_path, path)
+        blob.file_path = path
+        blob.ref_count += 1
+        return blob
+
+    # 행을 먼저 넣고(커밋 전까지 잠김) 파일을 옮김 → remove_blob_files 가 행 잠금으로 확인하고 지울 수 있음
+    blob = PdfBlob(sha256=sha256, file_path=path, size_bytes=size, ref_count=1)
+    db.add(blob)
+    try:
+        db.flush()
+    except IntegrityError:
+        # 같은 파일이 동시에 올라온 경우: 다른 요청이 먼저 행을 만들었으므로 참조만 증가
+        db.rollback()
+        blob = db.query(PdfBlob).filter(PdfBlob.sha256 == sha256).with_for_update().one()
+        blob.ref_count += 1
+    os.replace(tmp_path, path)  # 같은 내용이라 다른 요청의 파일을 덮어써도 무방
+    return blob
+
+
+# ✅ 참조 감소 / 정리
+def release_blob(db: Session, sha256: Optional[str]) -> bool:
+    """
+    노트 삭제 시 호출: ref_count -1, 0이 되면 blob 행 삭제
+    (커밋은 호출자가 노트 삭제와 함께 수행)
+
+    Returns:
+        True면 더 이상 아무도 안 쓰는 blob → 커밋 후 remove_blob_files() 호출
+    """
+    if not sha256:
+        return False
+    blob = db.query(PdfBlob).filter(PdfBlob.sha256 == sha256).with_for_update().first()
+    if not blob:
+        return False
+
+    blob.ref_count = max(0, (blob.ref_count or 0) - 1)
+    if blob.ref_count > 0:
+        return False
+
+    db.delete(blob)
+    return True
+
+
+def remove_blob_files(db: Session, sha256: str) -> bool:
+    """
+    원본 PDF + 공유 썸네일 + 공유 임베딩 세트 삭제 (release_blob 을 커밋한 뒤에 호출)
+
+    커밋과 이 호출 사이에 같은 내용이 다시 올라왔을 수 있으므로, 행 잠금을 잡고
+    blob 행이나 이 blob 을 쓰는 노트가 정말 없을 때만 지운다.
+    (잠금은 파일을 다 지운 뒤 커밋으로 풂 → 그동안 같은 sha256 의 commit_blob 은 기다림)
+
+    Returns:
+        지웠으면 True
+    """
+    from models.pdf_notes import PdfNote
+    from services.embedding_service import delete_blob_embeddings
+
+    blob = db.query(PdfBlob).filter(PdfBlob.sha256 == sha256).with_for_update().first()
+    in_use = blob is not None or db.query(PdfNote.pdf_id).filter(PdfNote.blob_sha256 == sha256).first() is not None
+    if in_use:
+        db.rollback()
+        print(f"♻️ blob 삭제 취소 (그 사이 다시 업로드됨): {sha256[:12]}")
+        return False
+
+    try:
+        for path in [blob_path(sha256), *glob.glob(f"static/thumbnails/{thumbnail_prefix(sha256)}_*")]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        delete_blob_embeddings(sha256)
+    finally:
+        db.commit()
+    print(f"🗑️ 사용하지 않는 blob 삭제: {sha256[:12]}")
+    return True
@@ -0,0 +1,116 @@
+# backend/services/chat_stream_service.py
+"""
+/api/chat/stream: 답변을 SSE(text/event-stream)로 생성되는 대로 전달
+
+- 검색은 요청을 받자마자 스레드에서 시작하고, 응답 헤더와 start 이벤트를 먼저 보냄
+  → 클라이언트 연결/첫 바이트 수신과 검색이 겹침
+- 이벤트 (data 는 JSON):
+    start   {}
+    context {"chunks": 검색된 청크 수, "retrieval_ms": 검색 시간}
+    token   {"text": 텍스트 조각}                  ← 여러 번
+    done    {"ttft_ms": 요청~첫 토큰, "total_ms": 전체, "tokens": 조각 수}
+    error   {"detail": 메시지}                      ← 실패 시 done 대신
+- 클라이언트가 끊으면 OpenAI 스트림도 닫아서 생성 중단
+- 최근 요청들의 TTFT/전체 시간 분포는 stats() (/debug/chat-stream)
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from services.gpt_service import stream_gpt
+from services.rag_service import build_chat_prompt, retrieve_relevant_chunks
+
+RETRIEVAL_WORKERS = int(os.getenv("CHAT_RETRIEVAL_WORKERS", "4"))
+# SSE 주석(: keep-alive)을 보내는 간격(초): 검색이 오래 걸려도 프록시가 연결을 끊지 않도록
+KEEPALIVE_SECONDS = float(os.getenv("CHAT_STREAM_KEEPALIVE", "10"))
+
+_executor = ThreadPoolExecutor(max_workers=RETRIEVAL_WORKERS, thread_name_prefix="chat-retrieval")
+_recent = deque(maxlen=500)  # (ttft_ms, total_ms, retrieval_ms, ok)
+_recent_lock = threading.Lock()
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def start_retrieval(question: str, user_id: int, pdf_ids: Optional[List[int]] = None) -> Future:
+    return _executor.submit(retrieve_relevant_chunks, question, user_id, pdf_ids=pdf_ids)
+
+
+def _record(ttft_ms: Optional[float], total_ms: float, retrieval_ms: float, ok: bool):
+    with _recent_lock:
+        _recent.append((ttft_ms, total_ms, retrieval_ms, ok))
+
+
+def stream_answer(question: str, retrieval: Future, started: float) -> Iterator[str]:
+    """
+    SSE 이벤트 문자열 스트림 (StreamingResponse 에 그대로 넘김)
+
+    Args:
+        retrieval: start_retrieval() 결과 (청크 목록 Future)
+        started: 요청을 받은 시각 (time.perf_counter), TTFT 기준
+    """
+    yield sse("start", {})
+
+    chunks: List[str] = []
+    retrieval_ms = 0.0
+    try:
+        while True:
+            try:
+                chunks = retrieval.result(timeout=KEEPALIVE_SECONDS)
+                break
+            except FutureTimeoutError:  # Python 3.11 전에는 내장 TimeoutError 와 다른 클래스
+                yield ": keep-alive\n\n"
+    except Exception as e:
+        print(f"❌ 검색 실패: {e}")  # 검색이 안 돼도 문맥 없이 답변
+    retrieval_ms = (time.perf_counter() - started) * 1000
+    yield sse("context", {"chunks": len(chunks), "retrieval_ms": round(retrieval_ms, 1)})
+
+    ttft_ms = None
+    tokens = 0
+    try:
+        for text in stream_gpt(build_chat_prompt(question, chunks)):
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            tokens += 1
+            yield sse("token", {"text": text})
+    except Exception as e:
+        total_ms = (time.perf_counter() - started) * 1000
+        _record(ttft_ms, total_ms, retrieval_ms, False)
+        print(f"❌ 답변 스트리밍 실패: {e}")
+        yield sse("error", {"detail": str(e)})
+        return
+
+    total_ms = (time.perf_counter() - started) * 1000
+    _record(ttft_ms, total_ms, retrieval_ms, True)
+    print(f"💬 답변 스트리밍: TTFT {ttft_ms or 0:.0f}ms, 전체 {total_ms:.0f}ms (검색 {retrieval_ms:.0f}ms, 조각 {tokens}개)")
+    yield sse("done", {
+        "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+        "total_ms": round(total_ms, 1),
+        "tokens": tokens,
+    })
+
+
+def stats() -> dict:
+    with _recent_lock:
+        recent = list(_recent)
+
+    def _pct(values, q):
+        return round(float(np.percentile(values, q)), 1) if values else None
+
+    ttft = [r[0] for r in recent if r[0] is not None]
+    total = [r[1] for r in recent if r[3]]
+    retrieval = [r[2] for r in recent]
+    return {
+        "requests": len(recent),
+        "errors": sum(1 for r in recent if not r[3]),
+        "ttft_ms": {"p50": _pct(ttft, 50), "p95": _pct(ttft, 95)},
+        "total_ms": {"p50": _pct(total, 50), "p95": _pct(total, 95)},
+        "retrieval_ms": {"p50": _pct(retrieval, 50), "p95": _pct(retrieval, 95)},
+    }
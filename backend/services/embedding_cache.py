@@ -0,0 +1,193 @@
+# backend/services/embedding_cache.py
+"""
+임베딩 영구 캐시 (SQLite, vector_db/embedding_cache.sqlite3)
+
+- 키: sha256(모델명 + 정규화한 텍스트) → 같은 교재 청크/같은 질문은 다시 임베딩하지 않음
+- 값: float32(기본) 또는 float16 바이트 (1536차원 기준 6KB / 3KB)
+  float16 은 질문 임베딩까지 손실이 생기므로 용량이 급할 때만 EMBEDDING_CACHE_DTYPE=float16
+- 조회 시 last_used 갱신, 전체 크기가 상한을 넘으면 오래 안 쓴 것부터 삭제 (상한의 90%까지)
+- 적중/미스/저장/삭제 횟수는 stats() 로 확인 (/debug/embedding-cache)
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.abspath(os.path.join(BASE_DIR, "..", "vector_db", "embedding_cache.sqlite3")),
+)
+ENABLED = os.getenv("EMBEDDING_CACHE", "1").lower() not in ("0", "false", "no")
+MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "512")) * 1024 * 1024
+DTYPE = np.float16 if os.getenv("EMBEDDING_CACHE_DTYPE", "float32") == "float16" else np.float32
+
+_DTYPE_CODES = {np.dtype(np.float16): 16, np.dtype(np.float32): 32}
+_CODE_DTYPES = {16: np.float16, 32: np.float32}
+_SQLITE_MAX_VARS = 500  # IN (...) 한 번에 넣을 키 개수
+
+_local = threading.local()
+_lock = threading.Lock()
+_total_bytes: Optional[int] = None
+_stats = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 정규화(NFC) + 공백 정리 → 줄바꿈/띄어쓰기만 다른 청크도 같은 키"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(model: str, text: str) -> bytes:
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).digest()
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key BLOB PRIMARY KEY, dtype INTEGER NOT NULL, vec BLOB NOT NULL,"
+            " size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings(last_used)")
+        _local.conn = conn
+    return conn
+
+
+def _chunked(items: list, size: int = _SQLITE_MAX_VARS):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ✅ 조회
+def get_many(model: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+    """입력 순서대로 캐시된 벡터(float32) 또는 None"""
+    if not ENABLED or not texts:
+        return [None] * len(texts)
+
+    keys = [make_key(model, t) for t in texts]
+    found = {}
+    conn = _conn()
+    for part in _chunked(list(set(keys))):
+        marks = ",".join("?" * len(part))
+        for key, dtype, vec in conn.execute(f"SELECT key, dtype, vec FROM embeddings WHERE key IN ({marks})", part):
+            found[key] = np.frombuffer(vec, dtype=_CODE_DTYPES[dtype]).astype(np.float32)
+        hit_keys = [k for k in part if k in found]
+        if hit_keys:
+            conn.execute(
+                f"UPDATE embeddings SET last_used = ? WHERE key IN ({','.join('?' * len(hit_keys))})",
+                [int(time.time()), *hit_keys],
+            )
+
+    result = [found.get(k) for k in keys]
+    hits = sum(1 for v in result if v is not None)
+    with _lock:
+        _stats["hits"] += hits
+        _stats["misses"] += len(result) - hits
+    return result
+
+
+def get(model: str, text: str) -> Optional[np.ndarray]:
+    return get_many(model, [text])[0]
+
+
+# ✅ 저장
+def put_many(model: str, texts: List[str], vectors: list):
+    """vectors 중 None은 건너뜀"""
+    global _total_bytes
+    if not ENABLED:
+        return
+    now = int(time.time())
+    code = _DTYPE_CODES[np.dtype(DTYPE)]
+    rows = []
+    for text, vector in zip(texts, vectors):
+        if vector is None:
+            continue
+        data = np.asarray(vector, dtype=DTYPE).tobytes()
+        rows.append((make_key(model, text), code, data, len(data), now))
+    if not rows:
+        return
+
+    conn = _conn()
+    conn.execute("BEGIN")
+    try:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO embeddings (key, dtype, vec, size, last_used) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        inserted = conn.total_changes - before
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    with _lock:
+        _stats["puts"] += inserted
+        if _total_bytes is None:
+            _total_bytes = _scan_total_bytes(conn)
+        else:
+            # INSERT OR IGNORE로 실제 들어간 개수만큼 (벡터 크기는 같은 모델이면 동일)
+            _total_bytes += inserted * rows[0][3]
+        if _total_bytes > MAX_BYTES:
+            _evict_locked(conn)
+
+
+def put(model: str, text: str, vector):
+    put_many(model, [text], [vector])
+
+
+def _scan_total_bytes(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+
+def _evict_locked(conn: sqlite3.Connection):
+    """last_used가 오래된 것부터 지워서 상한의 90%까지 줄임"""
+    global _total_bytes
+    target = int(MAX_BYTES * 0.9)
+    removed = 0
+    total = _scan_total_bytes(conn)
+    while total > target:
+        rows = conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY last_used LIMIT ?", (_SQLITE_MAX_VARS,)
+        ).fetchall()
+        if not rows:
+            break
+        drop, freed = [], 0
+        for key, size in rows:
+            if total - freed <= target:
+                break
+            drop.append(key)
+            freed += size
+        conn.execute(f"DELETE FROM embeddings WHERE key IN ({','.join('?' * len(drop))})", drop)
+        total -= freed
+        removed += len(drop)
+    _total_bytes = total
+    _stats["evictions"] += removed
+    print(f"🧹 임베딩 캐시 정리: {removed}개 삭제, 현재 {total / 1024 / 1024:.1f}MB")
+
+
+def stats() -> dict:
+    with _lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    if ENABLED:
+        conn = _conn()
+        snapshot["entries"] = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        snapshot["bytes"] = _scan_total_bytes(conn)
+    snapshot.update({
+        "enabled": ENABLED,
+        "hit_rate": round(snapshot["hits"] / lookups, 4) if lookups else 0.0,
+        "max_bytes": MAX_BYTES,
+        "dtype": np.dtype(DTYPE).name,
+        "path": CACHE_PATH,
+    })
+    return snapshot
@@ -0,0 +1,214 @@
+# backend/services/embedding_client.py
+"""
+배치 임베딩 클라이언트
+
+- 청크 여러 개를 요청 하나에 묶어서 보냄 (토큰 예산 / 입력 개수 상한 안에서)
+- 배치 여러 개를 동시에 보냄 (EMBEDDING_CONCURRENCY)
+- 배치 단위 재시도 + 지수 백오프(지터 포함), 입력 자체가 잘못된 요청(400)은 반으로 나눠서 문제 청크만 실패 처리
+- 결과는 입력 순서 그대로 (실패한 자리는 None) → 인덱스가 조용히 밀리지 않음
+- 임베딩 캐시(services/embedding_cache.py)에 있는 텍스트는 요청하지 않음
+
+EMBEDDING_BASE_URL 을 주면 OpenAI 호환 서버(로컬 stub 포함)로 보냄:
+    python -m scripts.stub_embedding_server --port 8089
+    EMBEDDING_BASE_URL=http://127.0.0.1:8089/v1 python -m benchmarks.bench_embeddings
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional
+
+import openai
+from openai import OpenAI
+from dotenv import load_dotenv
+
+from services import embedding_cache
+
+load_dotenv()
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_BASE_URL = os.getenv("EMBEDDING_BASE_URL") or None
+# 요청 하나에 담을 최대 토큰 수 / 입력 개수 (OpenAI 한도: 요청당 300k 토큰, 2048개)
+BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "100000"))
+BATCH_MAX_INPUTS = int(os.getenv("EMBEDDING_BATCH_INPUTS", "256"))
+# 동시에 보내는 배치 수
+CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+BACKOFF_BASE = float(os.getenv("EMBEDDING_BACKOFF_BASE", "0.5"))  # 초
+BACKOFF_MAX = 20.0
+
+# 재시도는 여기서 직접 하므로 SDK 자체 재시도는 끔
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=EMBEDDING_BASE_URL, max_retries=0)
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken이 없으면 보수적으로 추정
+    _encoding = None
+
+# 일시적인 오류 → 같은 배치 재시도
+_RETRYABLE = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # 한글은 대략 글자당 1토큰, 영문은 4글자당 1토큰 → 글자 수를 상한으로 사용
+    return max(1, len(text))
+
+
+def make_batches(
+    texts: List[str],
+    max_tokens: int = BATCH_MAX_TOKENS,
+    max_inputs: int = BATCH_MAX_INPUTS,
+    indices: Optional[Iterable[int]] = None,
+) -> List[List[int]]:
+    """빈 문자열을 제외한 입력 인덱스(indices를 주면 그중에서만)를 토큰 예산/개수 상한에 맞게 묶음"""
+    batches, current, current_tokens = [], [], 0
+    for i in (range(len(texts)) if indices is None else indices):
+        text = texts[i]
+        if not text or not text.strip():
+            continue
+        tokens = count_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_inputs):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _backoff(attempt: int, error: Exception) -> float:
+    retry_after = None
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            retry_after = None
+    delay = retry_after if retry_after is not None else BACKOFF_BASE * (2 ** attempt)
+    return min(BACKOFF_MAX, delay) * (0.5 + random.random() / 2)
+
+
+def _request(inputs: List[str]) -> List[List[float]]:
+    r = client.embeddings.create(model=EMBEDDING_MODEL, input=inputs)
+    vectors = [None] * len(inputs)
+    for item in r.data:
+        vectors[item.index] = item.embedding
+    if any(v is None for v in vectors):
+        raise ValueError("임베딩 응답 개수가 입력과 다릅니다.")
+    return vectors
+
+
+def _embed_batch(texts: List[str], indices: List[int], stats: dict, lock: threading.Lock) -> dict:
+    """배치 하나 처리 → {입력 인덱스: 벡터 또는 None}"""
+    inputs = [texts[i] for i in indices]
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            with lock:
+                stats["requests"] += 1
+            return dict(zip(indices, _request(inputs)))
+        except _RETRYABLE as e:
+            if attempt == MAX_RETRIES:
+                print(f"❌ 임베딩 배치 최종 실패 ({len(indices)}개): {e}")
+                break
+            with lock:
+                stats["retries"] += 1
+            time.sleep(_backoff(attempt, e))
+        except openai.BadRequestError as e:
+            # 잘못된 입력(너무 긴 청크 등)이 섞인 경우: 반으로 나눠서 나머지는 살림
+            if len(indices) > 1:
+                mid = len(indices) // 2
+                result = _embed_batch(texts, indices[:mid], stats, lock)
+                result.update(_embed_batch(texts, indices[mid:], stats, lock))
+                return result
+            print(f"❌ 임베딩 실패 (입력 {indices[0]}): {e}")
+            break
+        except Exception as e:
+            # 인증/권한/응답 이상 등 → 나눠 보내도 똑같이 실패하므로 배치 전체 실패 처리
+            print(f"❌ 임베딩 배치 실패 ({len(indices)}개): {e}")
+            break
+    return {i: None for i in indices}
+
+
+def embed_texts(
+    texts: List[str],
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    concurrency: int = CONCURRENCY,
+    max_tokens: int = BATCH_MAX_TOKENS,
+    max_inputs: int = BATCH_MAX_INPUTS,
+    use_cache: bool = True,
+) -> dict:
+    """
+    여러 텍스트를 배치로 임베딩 (캐시 적중분은 요청 없이 채움)
+
+    Returns:
+        dict: {
+            "embeddings": 입력과 같은 길이의 리스트 (실패/빈 입력은 None),
+            "succeeded": 성공 개수,
+            "failed": 요청했지만 실패한 입력 인덱스 목록,
+            "skipped": 빈 문자열이라 보내지 않은 입력 인덱스 목록,
+            "cache_hits": 캐시에서 가져온 개수,
+            "batches": 배치 수,
+            "requests": 실제 HTTP 요청 수 (재시도/분할 포함),
+            "retries": 재시도 횟수,
+            "elapsed": 걸린 시간(초)
+        }
+    """
+    started = time.perf_counter()
+    embeddings: List[Optional[List[float]]] = [None] * len(texts)
+    non_empty = [i for i, t in enumerate(texts) if t and t.strip()]
+
+    cache_hits = 0
+    if use_cache and non_empty:
+        for i, vector in zip(non_empty, embedding_cache.get_many(EMBEDDING_MODEL, [texts[i] for i in non_empty])):
+            if vector is not None:
+                embeddings[i] = vector
+                cache_hits += 1
+    misses = [i for i in non_empty if embeddings[i] is None]
+    batches = make_batches(texts, max_tokens, max_inputs, indices=misses)
+    stats = {"requests": 0, "retries": 0}
+    lock = threading.Lock()
+    done = 0
+
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as pool:
+            futures = {pool.submit(_embed_batch, texts, batch, stats, lock): batch for batch in batches}
+            for future in as_completed(futures):
+                for i, vector in future.result().items():
+                    embeddings[i] = vector
+                done += len(futures[future])
+                if on_progress:
+                    on_progress(cache_hits + done, len(texts))
+
+    if use_cache and misses:
+        embedding_cache.put_many(EMBEDDING_MODEL, [texts[i] for i in misses], [embeddings[i] for i in misses])
+
+    failed = [i for i in misses if embeddings[i] is None]
+    non_empty_set = set(non_empty)
+    skipped = [i for i in range(len(texts)) if i not in non_empty_set]
+    succeeded = len(non_empty) - len(failed)
+    elapsed = time.perf_counter() - started
+    print(
+        f"🧮 임베딩 {succeeded}/{len(texts)}개 성공 (캐시 {cache_hits}개), 실패 {len(failed)}개, 빈 입력 {len(skipped)}개 "
+        f"({len(batches)}배치, 요청 {stats['requests']}회, 재시도 {stats['retries']}회, {elapsed:.2f}s)"
+    )
+    return {
+        "embeddings": embeddings,
+        "succeeded": succeeded,
+        "failed": failed,
+        "skipped": skipped,
+        "cache_hits": cache_hits,
+        "batches": len(batches),
+        "requests": stats["requests"],
+        "retries": stats["retries"],
+        "elapsed": round(elapsed, 3),
+    }
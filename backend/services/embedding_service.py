@@ -1,10 +1,13 @@
 # backend/services/embedding_service.py
 import os, pickle
 import numpy as np
-from typing import List, Optional
-from openai import OpenAI
+from typing import Callable, Iterable, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from services import embedding_cache, vector_index_registry
+from services.embedding_client import client, embed_texts, EMBEDDING_MODEL
+from utils.chunk_store import ChunkMeta, write_chunk_store
+
 load_dotenv()
 
 BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
@@ -16,39 +19,126 @@ SAVE_PATH = os.path.join(VECTOR_DIR, "faiss_db.pkl")
 # FAISS 인덱스 바이너리 (faiss가 직접 읽고 쓰는 포맷)
 INDEX_BIN = os.path.join(VECTOR_DIR, "faiss.index")
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 def get_embedding(text: str) -> Optional[List[float]]:
-    """OpenAI 임베딩 생성"""
+    """OpenAI 임베딩 생성 (같은 텍스트는 캐시에서)"""
     if not text or not text.strip():
         return None
+    cached = embedding_cache.get(EMBEDDING_MODEL, text)
+    if cached is not None:
+        return cached.tolist()
     try:
-        r = client.embeddings.create(model="text-embedding-3-small", input=text)
-        return r.data[0].embedding if r.data else None
+        r = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        embedding = r.data[0].embedding if r.data else None
     except Exception as e:
         print(f"❌ 임베딩 생성 실패: {e}")
         return None
-
-def embed_chunks(chunks: List[str], save_path: str = SAVE_PATH, index_bin: str = INDEX_BIN):
+    if embedding is not None:
+        embedding_cache.put(EMBEDDING_MODEL, text, embedding)
+    return embedding
+
+def embed_chunks(
+    chunks: List[str],
+    save_path: str = SAVE_PATH,
+    index_bin: str = INDEX_BIN,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    blob_sha256: Optional[str] = None,
+    user_id: Optional[int] = None,
+    pdf_id: Optional[int] = None,
+    metas: Optional[list] = None,
+):
     """
     원문 청크 → 임베딩 → FAISS 인덱스는 .index(바이너리), 메타는 .pkl에 저장
     - faiss는 여기서만(필요할 때만) 임포트해 OpenMP 충돌을 줄임
+    - 임베딩은 배치 요청 + 동시 전송 (services/embedding_client.py)
+    - on_progress(done, total): 배치가 끝날 때마다 진행률 콜백 (ingest 작업 카운터용)
+    - blob_sha256: 같은 PDF 파일(blob)의 임베딩 세트가 이미 있으면 API 호출 없이 재사용
+    - user_id/pdf_id: 주면 사용자별 인덱스에 해당 노트만 추가 (services/vector_index_manager.py)
+      안 주면 예전처럼 전역 인덱스(save_path/index_bin)를 새로 만듦
+    - metas: 청크별 ChunkMeta(pdf_id, 페이지, 글자 위치), 청크 저장소에 같이 기록
     """
-    # ✅ 지연 임포트 (필요할 때만 로드)
-    import faiss
+    return embed_chunk_stream(
+        [(chunks, metas)], save_path=save_path, index_bin=index_bin, on_progress=on_progress,
+        blob_sha256=blob_sha256, user_id=user_id, pdf_id=pdf_id,
+    )
+
+
+def embed_chunk_stream(
+    batches: Iterable[Tuple[List[str], Optional[list]]],
+    save_path: str = SAVE_PATH,
+    index_bin: str = INDEX_BIN,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    blob_sha256: Optional[str] = None,
+    user_id: Optional[int] = None,
+    pdf_id: Optional[int] = None,
+):
+    """
+    embed_chunks 의 스트리밍 버전: (청크 목록, 메타 목록 or None) 배치를 받는 대로 임베딩
+    (services/text_pipeline.py 와 함께 쓰면 다음 페이지 추출과 임베딩 요청이 겹침)
 
-    embs: List[List[float]] = []
-    for i, c in enumerate(chunks, 1):
-        e = get_embedding(c)
-        if e is not None:
-            embs.append(e)
+    - on_progress(done, seen): 임베딩이 끝난 청크 수, 지금까지 받은 청크 수
+    - blob 임베딩 세트가 있으면 같은 위치에 같은 청크인 것은 요청 없이 재사용
+      (분할 규칙이 바뀐 뒤라면 달라진 청크만 다시 임베딩, 같은 문장은 임베딩 캐시가 처리)
+    """
+    cached = load_blob_embeddings(blob_sha256) if blob_sha256 else None
+    cached_embs, cached_chunks = cached if cached is not None else ([], [])
+
+    embs, ok_chunks, ok_metas = [], [], []
+    has_metas = False
+    seen, reused, failed = 0, 0, 0
+    for chunks, metas in batches:
+        offset = seen
+        seen += len(chunks)
+        has_metas = has_metas or metas is not None
+        metas = metas if metas is not None else [ChunkMeta()] * len(chunks)
+
+        if cached_chunks[offset:seen] == list(chunks):
+            vectors = list(cached_embs[offset:seen])
+            reused += len(chunks)
+            if on_progress:
+                on_progress(seen, seen)
         else:
-            print(f"⚠️ {i}번째 청크 임베딩 실패, 스킵")
+            report = embed_texts(
+                chunks,
+                on_progress=(lambda done, _total, base=offset: on_progress(base + done, seen)) if on_progress else None,
+            )
+            vectors = report["embeddings"]
+            failed += len(report["failed"])
+
+        for c, e, m in zip(chunks, vectors, metas):
+            if e is not None:
+                embs.append(e)
+                ok_chunks.append(c)  # 인덱스 번호와 청크 목록이 어긋나지 않도록 성공한 것만
+                ok_metas.append(m)
+
+    if seen == 0:
+        return []
+    if reused:
+        print(f"♻️ blob 임베딩 재사용: {blob_sha256[:12]} ({reused}/{seen}개)")
+    if failed:
+        print(f"⚠️ 임베딩 실패 청크 {failed}개 스킵")
+
+    # 일부라도 실패한 세트는 blob 단위로 공유하지 않음 (다음 업로드 때 다시 시도)
+    if embs and blob_sha256 and not failed and ok_chunks != cached_chunks:
+        save_blob_embeddings(blob_sha256, embs, ok_chunks)
 
-    if not embs:
+    if len(embs) == 0:
         print("❌ 저장할 임베딩이 없습니다. 생성 중단")
         return []
 
+    ok_metas = ok_metas if has_metas else None
+    if user_id is not None and pdf_id is not None:
+        from services.vector_index_manager import add_document
+        add_document(user_id, pdf_id, embs, ok_chunks, ok_metas)
+    else:
+        save_vector_db(embs, ok_chunks, save_path=save_path, index_bin=index_bin, metas=ok_metas)
+    return embs
+
+
+def save_vector_db(embs, chunks: List[str], save_path: str = SAVE_PATH, index_bin: str = INDEX_BIN, metas=None):
+    """임베딩 배열 + 청크 목록 → FAISS 인덱스(.index) + 청크 저장소(.cstore) + 메타(.pkl, 경로만)"""
+    # ✅ 지연 임포트 (필요할 때만 로드)
+    import faiss
+
     arr = np.array(embs, dtype="float32")
     index = faiss.IndexFlatL2(arr.shape[1])
     index.add(arr)
@@ -56,14 +146,48 @@ def embed_chunks(chunks: List[str], save_path: str = SAVE_PATH, index_bin: str =
     # ✅ 인덱스는 faiss 전용 바이너리로 저장(가장 안전)
     faiss.write_index(index, index_bin)
 
-    # ✅ 메타파일엔 인덱스 경로와 청크만 저장
+    # ✅ 청크 원문은 mmap 저장소로 (검색 시 top_k개만 읽음), 메타파일엔 경로만 저장
+    chunk_store_path = os.path.splitext(save_path)[0] + ".cstore"
+    write_chunk_store(chunk_store_path, chunks, metas)
     with open(save_path, "wb") as f:
-        pickle.dump({"index_path": os.path.abspath(index_bin), "chunks": chunks}, f)
+        pickle.dump({"index_path": os.path.abspath(index_bin), "chunk_store": os.path.abspath(chunk_store_path)}, f)
+    vector_index_registry.bump_generation(save_path)  # 상주 중인 인덱스는 다음 검색 때 다시 읽음
 
     print(f"✅ FAISS 인덱스 저장: {os.path.abspath(index_bin)}")
     print(f"✅ 메타(pkl) 저장: {os.path.abspath(save_path)}")
-    return embs
 
 
+# ---------------------------------------------------------------------------
+# blob(같은 내용의 PDF 파일) 단위 임베딩 세트: 같은 교재를 여러 명이 올려도 한 번만 임베딩
+# ---------------------------------------------------------------------------
+BLOB_EMB_DIR = os.path.join(VECTOR_DIR, "blobs")
+
+
+def _blob_embedding_path(blob_sha256: str) -> str:
+    return os.path.join(BLOB_EMB_DIR, f"{blob_sha256}.npz")
+
+
+def save_blob_embeddings(blob_sha256: str, embs, chunks: List[str]):
+    os.makedirs(BLOB_EMB_DIR, exist_ok=True)
+    path = _blob_embedding_path(blob_sha256)
+    tmp_path = path + ".tmp.npz"
+    np.savez(tmp_path, embeddings=np.asarray(embs, dtype="float32"), chunks=np.asarray(chunks, dtype=object))
+    os.replace(tmp_path, path)
+
+
+def load_blob_embeddings(blob_sha256: str):
+    path = _blob_embedding_path(blob_sha256)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=True) as data:
+            return data["embeddings"], [str(c) for c in data["chunks"]]
+    except Exception as e:
+        print(f"⚠️ blob 임베딩 로드 실패: {e}")
+        return None
 
 
+def delete_blob_embeddings(blob_sha256: str):
+    path = _blob_embedding_path(blob_sha256)
+    if os.path.exists(path):
+        os.remove(path)
@@ -1,21 +1,39 @@
 # ~/yuminsu/backend/services/gpt_service.py
 
 import os
+from typing import Iterator
+
 from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def ask_gpt(prompt: str) -> str:
-    response = client.chat.completions.create(
-        model="gpt-4o",  # 또는 "gpt-3.5-turbo"
+CHAT_MODEL = "gpt-4o"  # 또는 "gpt-3.5-turbo"
+SYSTEM_PROMPT = "당신은 친절하고 정직한 학습 도우미입니다."
+
+
+def _chat_kwargs(prompt: str) -> dict:
+    return dict(
+        model=CHAT_MODEL,
         messages=[
-            {"role": "system", "content": "당신은 친절하고 정직한 학습 도우미입니다."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         temperature=0.7,
         max_tokens=800
     )
+
+def ask_gpt(prompt: str) -> str:
+    response = client.chat.completions.create(**_chat_kwargs(prompt))
     return response.choices[0].message.content.strip()
 
+def stream_gpt(prompt: str) -> Iterator[str]:
+    """ask_gpt 의 스트리밍 버전: 생성되는 대로 텍스트 조각을 반환 (중간에 멈추면 요청도 닫음)"""
+    stream = client.chat.completions.create(**_chat_kwargs(prompt), stream=True)
+    try:
+        for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+    finally:
+        stream.close()
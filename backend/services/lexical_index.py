@@ -0,0 +1,124 @@
+# backend/services/lexical_index.py
+"""
+BM25 역색인 (벡터 검색과 함께 쓰는 키워드 검색, pdf 하나당 파일 하나)
+
+임베딩 검색은 "3.2절", "고유값", "A^T A" 처럼 글자 그대로 맞아야 하는 질문을 자주 놓쳐서
+청크 원문으로 역색인을 같이 만들어 둔다 (services/vector_index_manager.add_document 에서 저장).
+
+토큰화 (tokenize):
+    - 한글: 띄어쓰기/조사와 상관없이 맞도록 글자 2-gram ("고유값은" → 고유, 유값, 값은), 한 글자 단어는 그대로
+    - 영문: 소문자 단어, 숫자: "3.2" 처럼 점까지 한 토큰 (장/절 번호)
+    - 그리스 문자, 수식 기호(= + ^ √ ∑ …)는 한 글자씩
+저장 포맷 (npz, pickle 없음): 정렬된 용어 배열 + 용어별 포스팅 구간(청크 번호, tf) + 청크 길이
+점수: 검색 범위(노트 여러 개)의 청크 수/평균 길이/df 를 합쳐서 BM25 계산
+"""
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+NGRAM = int(os.getenv("LEXICAL_NGRAM", "2"))
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+_TOKEN = re.compile(r"[가-힣]+|[a-z]+|\d+(?:\.\d+)*|[α-ωΑ-Ω]|[=+\-*/^<>≤≥≠≈∑∏∫√∞∂∇±×÷∈⊂∪∩→]")
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _TOKEN.findall(unicodedata.normalize("NFKC", text).lower()):
+        if "가" <= word[0] <= "힣" and len(word) > NGRAM:
+            tokens.extend(word[i:i + NGRAM] for i in range(len(word) - NGRAM + 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class LexicalIndex:
+    """pdf 하나의 청크들에 대한 역색인 (읽기 전용)"""
+
+    def __init__(self, terms: np.ndarray, starts: np.ndarray, docs: np.ndarray, tfs: np.ndarray, doc_lens: np.ndarray):
+        self.terms = terms        # 정렬된 용어
+        self.starts = starts      # 용어 i 의 포스팅 = docs[starts[i]:starts[i+1]]
+        self.docs = docs          # 청크 번호
+        self.tfs = tfs            # 청크 안 등장 횟수
+        self.doc_lens = doc_lens  # 청크별 토큰 수
+
+    @classmethod
+    def build(cls, texts: List[str]) -> "LexicalIndex":
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lens = np.zeros(len(texts), dtype="int32")
+        for doc, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lens[doc] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc, tf))
+
+        terms = sorted(postings)
+        sizes = np.fromiter((len(postings[t]) for t in terms), dtype="int64", count=len(terms))
+        starts = np.concatenate(([0], np.cumsum(sizes))).astype("int64")
+        flat = [p for t in terms for p in postings[t]]
+        docs = np.fromiter((d for d, _ in flat), dtype="int32", count=len(flat))
+        tfs = np.fromiter((tf for _, tf in flat), dtype="float32", count=len(flat))
+        return cls(np.array(terms, dtype=str), starts, docs, tfs, doc_lens)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, terms=self.terms, starts=self.starts, docs=self.docs, tfs=self.tfs, doc_lens=self.doc_lens)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        with np.load(path) as data:
+            return cls(data["terms"], data["starts"], data["docs"], data["tfs"], data["doc_lens"])
+
+    def __len__(self) -> int:
+        return len(self.doc_lens)
+
+    def postings(self, term: str):
+        """(청크 번호 배열, tf 배열), 없으면 None"""
+        i = int(np.searchsorted(self.terms, term))
+        if i >= len(self.terms) or self.terms[i] != term:
+            return None
+        return self.docs[self.starts[i]:self.starts[i + 1]], self.tfs[self.starts[i]:self.starts[i + 1]]
+
+
+def bm25_search(indexes: Dict[int, LexicalIndex], query: str, top_k: int = 3) -> List[Tuple[int, int, float]]:
+    """
+    여러 pdf 역색인을 하나의 코퍼스로 보고 BM25 검색
+
+    Returns:
+        [(pdf_id, 청크 번호, 점수), ...] (점수 높은 순, 질의 용어가 하나도 없는 청크는 제외)
+    """
+    terms = Counter(tokenize(query))
+    n_docs = sum(len(ix) for ix in indexes.values())
+    if not terms or not n_docs:
+        return []
+    avg_len = max(1.0, sum(float(ix.doc_lens.sum()) for ix in indexes.values()) / n_docs)
+
+    hits = {term: {pdf_id: ix.postings(term) for pdf_id, ix in indexes.items()} for term in terms}
+    scores: Dict[int, np.ndarray] = {}
+    for term, qtf in terms.items():
+        found = {pdf_id: p for pdf_id, p in hits[term].items() if p is not None}
+        df = sum(len(docs) for docs, _ in found.values())
+        if not df:
+            continue
+        idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for pdf_id, (docs, tfs) in found.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * indexes[pdf_id].doc_lens[docs] / avg_len)
+            if pdf_id not in scores:
+                scores[pdf_id] = np.zeros(len(indexes[pdf_id]), dtype="float32")
+            scores[pdf_id][docs] += qtf * idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+
+    candidates = []
+    for pdf_id, s in scores.items():
+        top = np.flatnonzero(s)
+        if len(top) > top_k:
+            top = top[np.argpartition(-s[top], top_k - 1)[:top_k]]
+        candidates.extend((pdf_id, int(doc), float(s[doc])) for doc in top)
+    candidates.sort(key=lambda c: -c[2])
+    return candidates[:top_k]
@@ -0,0 +1,126 @@
+# backend/services/ocr_cache.py
+"""
+OCR 결과 영구 캐시 (SQLite, vector_db/ocr_cache.sqlite3)
+
+- 키: 페이지 내용 해시 (services/ocr_service.page_cache_key: 콘텐츠 스트림 + 이미지 digest + 렌더링 배율 + 언어)
+  → 같은 파일을 다시 올리거나, 다른 파일에 같은 페이지가 들어 있어도 인식을 다시 하지 않음
+- 값: 인식된 텍스트 (빈 문자열도 저장 → 글자 없는 스캔 페이지도 다시 인식 안 함)
+- 조회 시 last_used 갱신, 전체 크기가 상한을 넘으면 오래 안 쓴 것부터 삭제 (상한의 90%까지)
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.getenv(
+    "OCR_CACHE_PATH",
+    os.path.abspath(os.path.join(BASE_DIR, "..", "vector_db", "ocr_cache.sqlite3")),
+)
+ENABLED = os.getenv("OCR_CACHE", "1").lower() not in ("0", "false", "no")
+MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+_local = threading.local()
+_lock = threading.Lock()
+_total_bytes: Optional[int] = None
+_stats = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_pages ("
+            " key BLOB PRIMARY KEY, text TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_ocr_pages_last_used ON ocr_pages(last_used)")
+        _local.conn = conn
+    return conn
+
+
+# ✅ 조회
+def get(key: bytes) -> Optional[str]:
+    if not ENABLED:
+        return None
+    conn = _conn()
+    row = conn.execute("SELECT text FROM ocr_pages WHERE key = ?", (key,)).fetchone()
+    if row is not None:
+        conn.execute("UPDATE ocr_pages SET last_used = ? WHERE key = ?", (int(time.time()), key))
+    with _lock:
+        _stats["hits" if row is not None else "misses"] += 1
+    return row[0] if row is not None else None
+
+
+# ✅ 저장
+def put(key: bytes, text: str):
+    global _total_bytes
+    if not ENABLED:
+        return
+    size = len(text.encode("utf-8"))
+    conn = _conn()
+    before = conn.total_changes
+    conn.execute(
+        "INSERT OR REPLACE INTO ocr_pages (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+        (key, text, size, int(time.time())),
+    )
+    inserted = conn.total_changes - before
+
+    with _lock:
+        _stats["puts"] += inserted
+        if _total_bytes is None:
+            _total_bytes = _scan_total_bytes(conn)
+        else:
+            _total_bytes += size
+        if _total_bytes > MAX_BYTES:
+            _evict_locked(conn)
+
+
+def _scan_total_bytes(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_pages").fetchone()[0]
+
+
+def _evict_locked(conn: sqlite3.Connection):
+    """last_used가 오래된 것부터 지워서 상한의 90%까지 줄임"""
+    global _total_bytes
+    target = int(MAX_BYTES * 0.9)
+    removed = 0
+    total = _scan_total_bytes(conn)
+    while total > target:
+        rows = conn.execute("SELECT key, size FROM ocr_pages ORDER BY last_used LIMIT 500").fetchall()
+        if not rows:
+            break
+        drop, freed = [], 0
+        for key, size in rows:
+            if total - freed <= target:
+                break
+            drop.append(key)
+            freed += size
+        conn.execute(f"DELETE FROM ocr_pages WHERE key IN ({','.join('?' * len(drop))})", drop)
+        total -= freed
+        removed += len(drop)
+    _total_bytes = total
+    _stats["evictions"] += removed
+    print(f"🧹 OCR 캐시 정리: {removed}개 삭제, 현재 {total / 1024 / 1024:.1f}MB")
+
+
+def stats() -> dict:
+    with _lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["hits"] + snapshot["misses"]
+    if ENABLED:
+        conn = _conn()
+        snapshot["entries"] = conn.execute("SELECT COUNT(*) FROM ocr_pages").fetchone()[0]
+        snapshot["bytes"] = _scan_total_bytes(conn)
+    snapshot.update({
+        "enabled": ENABLED,
+        "hit_rate": round(snapshot["hits"] / lookups, 4) if lookups else 0.0,
+        "max_bytes": MAX_BYTES,
+        "path": CACHE_PATH,
+    })
+    return snapshot
@@ -0,0 +1,432 @@
+# backend/services/ocr_pool.py
+"""
+PaddleOCR 워커 프로세스 풀
+
+예전에는 OCR 할 때마다 PaddleOCR 모델을 새로 만들어서(수 초, 수백 MB) 페이지를 하나씩 인식했다.
+
+- 워커 프로세스가 시작할 때 모델을 한 번만 올려 두고 계속 재사용 (OCR_WORKERS 개)
+- 페이지 이미지는 부모가 렌더링해서 공유 메모리(SharedMemory)에 올리고 이름/모양만 넘김
+  → 수 MB 배열을 pickle 로 복사해서 보내지 않음. 결과를 받으면 부모가 해제(unlink)
+- 대기 중인 페이지는 OCR_MAX_PENDING 개까지만: 넘으면 submit 이 자리가 날 때까지 기다림(backpressure)
+  → 렌더링만 앞서가서 공유 메모리가 쌓이지 않음
+- 렌더링은 pixmap 샘플을 복사 없이 NumPy 뷰로 보고 공유 메모리에 한 번만 복사 (PIL 변환/중간 bytes 없음)
+- OCR_RASTER_WORKERS > 1 이면 렌더링도 별도 프로세스 풀에서 페이지 구간 단위로 (submit_range)
+  → 렌더 워커가 공유 메모리에 바로 쓰고, 이름만 OCR 워커로 넘어감
+- 페이지별 시간(렌더링/대기/인식) 기록, 최근 통계는 stats() (/debug/ocr)
+- OCR_WARMUP=1 이면 서버 시작 시 워커를 띄우고 모델을 미리 올림 (첫 요청이 모델 로딩을 기다리지 않도록)
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+OCR_MAX_PENDING = int(os.getenv("OCR_MAX_PENDING", str(max(2, OCR_WORKERS * 2))))
+OCR_LANG = os.getenv("OCR_LANG", "korean")
+OCR_ZOOM = float(os.getenv("OCR_ZOOM", "2.0"))  # 렌더링 배율 (해상도 살짝 업스케일)
+OCR_PAGE_TIMEOUT = float(os.getenv("OCR_PAGE_TIMEOUT", "120"))
+OCR_WARMUP = os.getenv("OCR_WARMUP", "0").lower() in ("1", "true", "yes")
+# 렌더링 프로세스 수 (0 또는 1이면 호출한 스레드에서 렌더링)와 렌더 작업 하나의 페이지 수
+OCR_RASTER_WORKERS = int(os.getenv("OCR_RASTER_WORKERS", "0"))
+OCR_RASTER_PAGES_PER_TASK = int(os.getenv("OCR_RASTER_PAGES_PER_TASK", "4"))
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스 쪽
+# ---------------------------------------------------------------------------
+_worker_ocr = None
+
+
+def _init_worker(lang: str):
+    """워커 시작 시 한 번: 모델 로드 (OpenMP 중복 로드 충돌 완화 위해 여기서 임포트)"""
+    global _worker_ocr
+    os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
+    from paddleocr import PaddleOCR
+
+    started = time.perf_counter()
+    _worker_ocr = PaddleOCR(lang=lang, use_angle_cls=True, show_log=False)
+    print(f"🔁 PaddleOCR 모델 로드: pid={os.getpid()}, {time.perf_counter() - started:.1f}s")
+
+
+def _parse_lines(res) -> List[str]:
+    """결과 파싱(모델/버전에 따라 구조 달라서 방어적으로 처리)"""
+    lines: List[str] = []
+    if isinstance(res, list):
+        for block in res:
+            if isinstance(block, list):
+                for line in block:
+                    try:
+                        # line: [ box, (text, score) ]
+                        lines.append(line[1][0])
+                    except Exception:
+                        pass
+    return lines
+
+
+def _ocr_shared(shm_name: str, shape: Tuple[int, ...], dtype: str) -> Tuple[List[str], float, float]:
+    """워커에서 실행: 공유 메모리의 페이지 이미지 인식 → (줄 목록, 시작 시각, 인식 시간 ms)"""
+    started_at = time.time()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        started = time.perf_counter()
+        # ✅ 최신 호환 API: cls 인자 미사용
+        res = _worker_ocr.ocr(arr)
+        ocr_ms = (time.perf_counter() - started) * 1000
+        del arr  # 버퍼를 참조하는 배열이 남아 있으면 close 가 실패함
+    finally:
+        shm.close()
+    return _parse_lines(res), started_at, ocr_ms
+
+
+def _ping(delay: float = 0.0) -> int:
+    time.sleep(delay)
+    return os.getpid()
+
+
+# ---------------------------------------------------------------------------
+# 렌더링 (렌더 워커 프로세스 또는 부모에서 실행)
+# ---------------------------------------------------------------------------
+def _pixmap_view(pm) -> np.ndarray:
+    """pixmap 샘플 버퍼를 복사 없이 H×W×n 배열로 (pm 이 살아 있는 동안만 유효)"""
+    rows = np.frombuffer(pm.samples_mv, dtype=np.uint8).reshape(pm.height, pm.stride)
+    return rows[:, : pm.width * pm.n].reshape(pm.height, pm.width, pm.n)
+
+
+def render_page(page, zoom: float = OCR_ZOOM) -> np.ndarray:
+    """fitz 페이지 → H×W×3 uint8 배열 (pixmap 버퍼를 한 번만 복사)"""
+    import fitz
+
+    pm = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return _pixmap_view(pm).copy()
+
+
+def _render_to_shared(page, zoom: float) -> Tuple[str, Tuple[int, ...], str, float]:
+    """페이지를 렌더링해서 새 공유 메모리에 바로 씀 → (이름, 모양, dtype, 렌더링 ms). 해제는 받는 쪽 책임"""
+    import fitz
+
+    started = time.perf_counter()
+    pm = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    src = _pixmap_view(pm)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, src.nbytes))
+    try:
+        np.ndarray(src.shape, dtype=np.uint8, buffer=shm.buf)[...] = src
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return shm.name, src.shape, src.dtype.str, (time.perf_counter() - started) * 1000
+
+
+# 렌더 워커마다 자기 fitz 핸들을 유지 (같은 문서의 다음 구간이 오면 재사용)
+_raster_doc = None
+_raster_doc_path = None
+
+
+def _rasterize_range(pdf_path: str, page_numbers: List[int], zoom: float) -> List[Optional[tuple]]:
+    """렌더 워커에서 실행: 구간의 페이지들을 공유 메모리로 렌더링 (실패한 페이지는 None)"""
+    global _raster_doc, _raster_doc_path
+    import fitz
+
+    if _raster_doc is None or _raster_doc_path != pdf_path:
+        if _raster_doc is not None:
+            _raster_doc.close()
+        _raster_doc = fitz.open(pdf_path)
+        _raster_doc_path = pdf_path
+
+    results: List[Optional[tuple]] = []
+    for page_number in page_numbers:
+        try:
+            results.append(_render_to_shared(_raster_doc[page_number - 1], zoom))
+        except Exception as e:
+            print(f"⚠️ 페이지 {page_number} 렌더링 실패: {e}")
+            results.append(None)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# 부모(서버) 쪽
+# ---------------------------------------------------------------------------
+
+
+class OcrPool:
+    def __init__(
+        self,
+        workers: int = OCR_WORKERS,
+        max_pending: int = OCR_MAX_PENDING,
+        lang: str = OCR_LANG,
+        raster_workers: int = OCR_RASTER_WORKERS,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.lang = lang
+        self.raster_workers = raster_workers if raster_workers > 1 else 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._raster: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._acquire_lock = threading.Lock()  # 여러 자리를 한 번에 잡을 때 다른 호출과 섞이지 않도록
+        self._recent = deque(maxlen=500)  # 페이지별 (render_ms, wait_ms, ocr_ms)
+        self._stats = {"pages": 0, "failed": 0, "backpressure_waits": 0, "restarts": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # fork 대신 spawn: 서버 스레드/커넥션 상태를 자식에 복제하지 않도록
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.lang,),
+                )
+            return self._executor
+
+    def _get_raster(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._raster is None:
+                self._raster = ProcessPoolExecutor(
+                    max_workers=self.raster_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._raster
+
+    def _reset_executor(self, broken: ProcessPoolExecutor):
+        """워커가 죽어서 풀이 깨졌으면 새로 만듦 (다음 submit 때 모델 다시 로드)"""
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self._stats["restarts"] += 1
+
+    def warm_up(self) -> float:
+        """워커를 모두 띄우고 모델 로드가 끝날 때까지 기다림 → 걸린 시간(초)"""
+        started = time.perf_counter()
+        executor = self._get_executor()
+        # 프로세스는 대기 작업 수만큼 생기고, 먼저 뜬 워커가 다른 ping 을 가져갈 수 있으므로
+        # 모든 워커(pid)가 한 번씩 응답할 때까지 반복
+        pids = set()
+        while len(pids) < self.workers and time.perf_counter() - started < OCR_PAGE_TIMEOUT:
+            pids |= {f.result() for f in [executor.submit(_ping, 0.05) for _ in range(self.workers)]}
+        if self.raster_workers:
+            raster = self._get_raster()
+            [f.result() for f in [raster.submit(_ping, 0.05) for _ in range(self.raster_workers)]]
+        elapsed = time.perf_counter() - started
+        print(f"🔥 OCR 워커 준비: {len(pids)}개 프로세스, {elapsed:.1f}s")
+        return elapsed
+
+    def _acquire(self, count: int = 1):
+        """대기 자리 count 개 확보 (모자라면 자리가 날 때까지 블록)"""
+        with self._acquire_lock:
+            for _ in range(count):
+                if not self._slots.acquire(blocking=False):
+                    self._stats["backpressure_waits"] += 1
+                    self._slots.acquire()
+
+    def submit(self, image: np.ndarray, render_ms: float = 0.0) -> Future:
+        """
+        페이지 이미지(H×W×3 uint8) 하나 인식 요청 → Future[List[str]]
+        대기 중인 페이지가 max_pending 개면 자리가 날 때까지 블록
+        """
+        self._acquire()
+        try:
+            image = np.ascontiguousarray(image)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+        except Exception:
+            self._slots.release()
+            raise
+        result: Future = Future()
+        self._submit_shared(shm, image.shape, image.dtype.str, render_ms, result)
+        return result
+
+    def submit_page(self, page, zoom: float = OCR_ZOOM) -> Future:
+        """fitz 페이지를 이 스레드에서 공유 메모리로 바로 렌더링해서 인식 요청 → Future[List[str]]"""
+        self._acquire()
+        try:
+            name, shape, dtype, render_ms = _render_to_shared(page, zoom)
+            shm = shared_memory.SharedMemory(name=name)
+        except Exception:
+            self._slots.release()
+            raise
+        result: Future = Future()
+        self._submit_shared(shm, shape, dtype, render_ms, result)
+        return result
+
+    def submit_range(self, pdf_path: str, page_numbers: List[int], zoom: float = OCR_ZOOM) -> List[Future]:
+        """
+        페이지 구간을 렌더 워커에 넘기고, 렌더링이 끝나면 그대로 OCR 워커로 → [Future[List[str]]]
+        구간 페이지 수만큼 대기 자리를 먼저 잡음 (구간은 max_pending 이하로)
+        """
+        page_numbers = list(page_numbers)
+        if not 0 < len(page_numbers) <= self.max_pending:
+            raise ValueError(f"구간 페이지 수는 1~{self.max_pending} 이어야 합니다: {len(page_numbers)}")
+        results = [Future() for _ in page_numbers]
+        self._acquire(len(page_numbers))
+        try:
+            raster = self._get_raster()
+            task = raster.submit(_rasterize_range, os.path.abspath(pdf_path), page_numbers, zoom)
+        except Exception:
+            for _ in page_numbers:
+                self._slots.release()
+            raise
+
+        def _rendered(f: Future):
+            # 여기서 예외가 새면 results 가 영영 안 끝나서 호출자가 OCR_PAGE_TIMEOUT 씩 기다림
+            try:
+                rendered = f.result()
+            except (CancelledError, Exception) as e:  # 취소된 구간도 실패로 끝냄
+                if isinstance(e, BrokenProcessPool):
+                    with self._lock:
+                        if self._raster is raster:
+                            self._raster = None
+                for result in results:
+                    self._stats["failed"] += 1
+                    self._slots.release()
+                    result.set_exception(e)
+                return
+            for page_number, item, result in zip(page_numbers, rendered, results):
+                if item is None:
+                    self._stats["failed"] += 1
+                    self._slots.release()
+                    result.set_exception(RuntimeError(f"페이지 {page_number} 렌더링 실패"))
+                    continue
+                name, shape, dtype, render_ms = item
+                try:
+                    shm = shared_memory.SharedMemory(name=name)
+                except Exception as e:
+                    self._stats["failed"] += 1
+                    self._slots.release()
+                    result.set_exception(e)
+                    continue
+                try:
+                    self._submit_shared(shm, shape, dtype, render_ms, result)
+                except Exception as e:  # 자리는 _submit_shared 가 이미 해제함
+                    self._stats["failed"] += 1
+                    result.set_exception(e)
+
+        task.add_done_callback(_rendered)
+        return results
+
+    def _submit_shared(self, shm: shared_memory.SharedMemory, shape, dtype: str, render_ms: float, result: Future):
+        """공유 메모리에 올라간 페이지를 OCR 워커로 (자리는 이미 잡혀 있어야 함, 끝나면 해제)"""
+        submitted_at = time.time()
+        executor = self._get_executor()
+        try:
+            inner = executor.submit(_ocr_shared, shm.name, tuple(shape), dtype)
+        except Exception:
+            self._release(shm)
+            self._reset_executor(executor)
+            raise
+
+        def _done(f: Future):
+            self._release(shm)
+            try:
+                lines, started_at, ocr_ms = f.result()
+            except Exception as e:
+                self._stats["failed"] += 1
+                if isinstance(e, BrokenProcessPool):
+                    self._reset_executor(executor)
+                result.set_exception(e)
+                return
+            self._stats["pages"] += 1
+            self._recent.append((render_ms, max(0.0, (started_at - submitted_at) * 1000), ocr_ms))
+            result.set_result(lines)
+
+        inner.add_done_callback(_done)
+
+    def _release(self, shm: shared_memory.SharedMemory):
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._slots.release()
+
+    def ocr_pdf(self, pdf_path: str, page_numbers: Optional[Iterable[int]] = None, zoom: float = OCR_ZOOM) -> List[Tuple[int, str]]:
+        """
+        PDF 페이지들 OCR → [(페이지 번호, 텍스트)] (페이지 순서대로, 실패한 페이지는 빈 문자열)
+        렌더링은 이 스레드에서 하면서 앞 페이지 인식과 겹침 (max_pending 개까지 앞서 감)
+        """
+        import fitz
+
+        started = time.perf_counter()
+        futures = []
+        with fitz.open(pdf_path) as doc:
+            pages = list(page_numbers) if page_numbers is not None else list(range(1, doc.page_count + 1))
+            if self.raster_workers:
+                size = self.range_size()
+                for i in range(0, len(pages), size):
+                    chunk = pages[i:i + size]
+                    futures.extend(zip(chunk, self.submit_range(pdf_path, chunk, zoom)))
+            else:
+                for page_number in pages:
+                    futures.append((page_number, self.submit_page(doc[page_number - 1], zoom)))
+
+        results = []
+        for page_number, future in futures:
+            try:
+                results.append((page_number, "\n".join(future.result(timeout=OCR_PAGE_TIMEOUT))))
+            except Exception as e:
+                print(f"⚠️ OCR 실패 (페이지 {page_number}): {e}")
+                results.append((page_number, ""))
+
+        elapsed = time.perf_counter() - started
+        print(f"🔁 OCR {len(results)}페이지: {elapsed:.2f}s ({len(results) / elapsed if elapsed else 0:.2f} pages/sec, "
+              f"workers={self.workers}, raster_workers={self.raster_workers})")
+        return results
+
+    def range_size(self) -> int:
+        """submit_range 한 번에 넘길 페이지 수"""
+        return max(1, min(OCR_RASTER_PAGES_PER_TASK, self.max_pending))
+
+    def stats(self) -> dict:
+        recent = list(self._recent)
+
+        def _pct(i, q):
+            return round(float(np.percentile([r[i] for r in recent], q)), 1) if recent else None
+
+        return {
+            **self._stats,
+            "workers": self.workers,
+            "raster_workers": self.raster_workers,
+            "max_pending": self.max_pending,
+            "started": self._executor is not None,
+            "render_ms": {"p50": _pct(0, 50), "p95": _pct(0, 95)},
+            "wait_ms": {"p50": _pct(1, 50), "p95": _pct(1, 95)},
+            "ocr_ms": {"p50": _pct(2, 50), "p95": _pct(2, 95)},
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._raster is not None:
+                self._raster.shutdown(wait=False, cancel_futures=True)
+                self._raster = None
+
+
+_pool: Optional[OcrPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> OcrPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OcrPool()
+        return _pool
+
+
+def shutdown_pool():
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
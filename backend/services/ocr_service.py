@@ -1,90 +1,182 @@
 # backend/services/ocr_service.py
+"""
+PDF 텍스트 추출 + 페이지 단위 OCR
+
+예전에는 문서 전체에서 PyMuPDF 텍스트가 하나도 안 나올 때만 문서 전체를 OCR 해서,
+타이핑된 슬라이드 + 스캔한 손필기 페이지가 섞인 PDF는 스캔 페이지를 잃거나 전부 OCR 했다.
+
+- 페이지마다 분류 (classify_page): 글자 수, 이미지가 덮는 면적 비율, 벡터 드로잉(필기) 수
+  · 글자가 거의 없는데 이미지/드로잉이 있으면 → OCR
+  · 이미지가 페이지 대부분을 덮고 글자가 적으면(스캔 + 머리글 정도) → OCR
+  · 나머지는 PyMuPDF 텍스트 그대로
+- OCR 이 필요한 페이지만 워커 풀(services/ocr_pool.py)로 병렬 인식
+- 결과는 페이지 내용 해시로 캐시 (services/ocr_cache.py) → 다시 올려도 인식하지 않음
+"""
+import hashlib
 import os
-from typing import List
+import time
+from collections import deque
+from typing import Iterator, NamedTuple, Optional, Tuple
 
-def _extract_text_pymupdf(pdf_path: str) -> str:
-    """PyMuPDF로 PDF 텍스트 추출 (가장 빠르고 안정적)"""
-    try:
-        import fitz  # PyMuPDF
-        texts: List[str] = []
-        with fitz.open(pdf_path) as doc:
-            for page in doc:
-                t = page.get_text("text") or ""
-                if t.strip():
-                    texts.append(t)
-        joined = "\n\n".join(texts).strip()
-        if joined:
-            print("📝 PyMuPDF 텍스트 추출 사용")
-        return joined
-    except Exception as e:
-        print(f"⚠️ PyMuPDF 실패: {e}")
-        return ""
+OCR_MIN_CHARS = int(os.getenv("OCR_MIN_CHARS", "20"))                    # 이보다 글자가 적으면 "텍스트 없음"
+OCR_SCAN_COVERAGE = float(os.getenv("OCR_SCAN_COVERAGE", "0.6"))          # 이미지가 이 비율 이상 덮으면 스캔 페이지 후보
+OCR_SCAN_MAX_CHARS = int(os.getenv("OCR_SCAN_MAX_CHARS", "200"))         # 스캔 페이지 후보 중 이 글자 수 미만이면 OCR
+OCR_MIN_DRAWINGS = int(os.getenv("OCR_MIN_DRAWINGS", "20"))              # 글자 없는 페이지의 필기(벡터 경로) 최소 개수
+
+
+class PageDecision(NamedTuple):
+    needs_ocr: bool
+    reason: str              # "text" | "blank" | "no_text" | "scanned"
+    chars: int
+    image_coverage: float    # 0~1
+    drawings: int
+
+
+def classify_page(page, text: Optional[str] = None) -> PageDecision:
+    """페이지 하나 OCR 필요 여부 (text 를 주면 get_text 다시 안 함)"""
+    text = page.get_text() if text is None else text
+    chars = len("".join(text.split()))
 
-def _extract_text_paddleocr(pdf_path: str) -> str:
+    area = abs(page.rect) or 1.0
+    covered = 0.0
+    for info in page.get_image_info():
+        bbox = page.rect & info["bbox"]  # 페이지 밖으로 나간 부분 제외
+        covered += abs(bbox) if not bbox.is_empty else 0.0
+    coverage = min(1.0, covered / area)
+
+    if chars >= OCR_MIN_CHARS:
+        if coverage >= OCR_SCAN_COVERAGE and chars < OCR_SCAN_MAX_CHARS:
+            return PageDecision(True, "scanned", chars, coverage, 0)
+        return PageDecision(False, "text", chars, coverage, 0)
+
+    # 글자가 거의 없을 때만 드로잉 수를 셈 (복잡한 벡터 페이지에선 비쌈)
+    drawings = len(page.get_drawings()) if coverage == 0 else 0
+    if coverage > 0 or drawings >= OCR_MIN_DRAWINGS:
+        return PageDecision(True, "no_text", chars, coverage, drawings)
+    return PageDecision(False, "blank", chars, coverage, drawings)
+
+
+def page_cache_key(page, zoom: float, lang: str, text: Optional[str] = None) -> bytes:
     """
-    PaddleOCR 폴백: 이미지/스캔 PDF일 때만 사용.
-    - OpenMP 중복 로드 충돌 완화 위해 지연 임포트
-    - 최신 PaddleOCR API 호환: ocr.ocr(np.array(img))  (cls 인자 사용하지 않음)
+    페이지 내용 해시: 콘텐츠 스트림 + Form XObject 스트림(중첩 포함) + 이미지 digest/위치 + 텍스트 + 크기/회전 + 렌더링 설정
+
+    show_pdf_page 등으로 만든 페이지는 콘텐츠 스트림이 전부 "q /fzFrm0 Do Q" 라서
+    XObject 안쪽까지 넣지 않으면 서로 다른 페이지가 같은 키가 됨 (캐시는 사용자 구분 없이 공유)
     """
-    try:
-        # 일부 환경에서 OpenMP 충돌 회피(선택): 필요한 경우에만 켬
-        # os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
-
-        from paddleocr import PaddleOCR
-        import fitz
-        import numpy as np
-        from PIL import Image
-
-        print("🔁 PaddleOCR 폴백 사용")
-        ocr = PaddleOCR(lang="korean", use_angle_cls=True, show_log=False)
-
-        results: List[str] = []
-        with fitz.open(pdf_path) as doc:
-            # 해상도 살짝 업스케일
-            zoom = 2.0
-            mat = fitz.Matrix(zoom, zoom)
-            for page in doc:
-                pm = page.get_pixmap(matrix=mat)
-                # 메모리 상 변환 (파일로 저장하지 않음)
-                mode = "RGB" if pm.alpha == 0 else "RGBA"
-                img = Image.frombytes(mode, [pm.width, pm.height], pm.samples)
-                arr = np.array(img.convert("RGB"))
-                # ✅ 최신 호환 API: cls 인자 미사용
-                res = ocr.ocr(arr)
-
-                # 결과 파싱(모델/버전에 따라 구조 달라서 방어적으로 처리)
-                if isinstance(res, list):
-                    for block in res:
-                        if isinstance(block, list):
-                            for line in block:
-                                try:
-                                    # line: [ box, (text, score) ]
-                                    results.append(line[1][0])
-                                except Exception:
-                                    pass
-
-        text = "\n".join(results).strip()
-        return text
-    except Exception as e:
-        print(f"❌ OCR 실패: {e}")
-        return ""
+    doc = page.parent
+    text = page.get_text() if text is None else text
+    h = hashlib.sha256()
+    h.update(f"{lang}\x00{zoom}\x00{tuple(page.rect)}\x00{page.rotation}\x00".encode())
+    h.update(page.read_contents() or b"")
+    for xref, name, _, bbox in page.get_xobjects():  # 중첩된 것까지 나옴
+        h.update(f"\x00{name}\x00{tuple(bbox)}\x00{doc.xref_get_key(xref, 'Matrix')}\x00".encode())
+        h.update(doc.xref_stream(xref) or b"")
+    h.update(text.encode("utf-8", "surrogatepass"))
+    for info in page.get_image_info(hashes=True):
+        h.update(info.get("digest") or b"")
+        h.update(repr(tuple(info["bbox"])).encode())
+    return h.digest()
 
-def extract_text_with_ocr_from_pdf(pdf_path: str, allow_ocr: bool = True) -> str:
+
+def iter_page_texts_with_ocr(pdf_path: str, allow_ocr: bool = True) -> Iterator[Tuple[int, str]]:
     """
-    1) PyMuPDF로 텍스트 먼저 시도
-    2) 텍스트가 부족하고 allow_ocr=True이면 PaddleOCR 폴백
+    (페이지 번호, 텍스트) 를 페이지 순서대로 반환, OCR 이 필요한 페이지만 인식해서 채움
+
+    - OCR 페이지는 워커 풀에 넘기고 다음 페이지로 진행 (풀의 대기 한도에서 자연스럽게 멈춤)
+    - 렌더 워커가 있으면(OCR_RASTER_WORKERS) OCR 페이지를 구간으로 모아서 넘김
+    - 앞 페이지 인식이 끝나는 대로 순서를 지켜서 내보냄
+    - 인식 결과가 비어 있거나 실패하면 PyMuPDF 텍스트를 그대로 씀
     """
-    print(f"📌 OCR 함수 진입: {pdf_path}")
+    import fitz
+
+    from services import ocr_cache
+    from services.ocr_pool import OCR_LANG, OCR_PAGE_TIMEOUT, OCR_ZOOM, get_pool
+
+    started = time.perf_counter()
+    counts = {"pages": 0, "ocr": 0, "cached": 0}
+    pending: deque = deque()  # (페이지 번호, 텍스트 또는 캐시 키, PyMuPDF 텍스트)
+    inflight = {}  # 캐시 키 → Future (같은 문서 안에서 똑같은 페이지는 한 번만 인식)
+    queued = []    # 렌더 워커에 아직 안 넘긴 (페이지 번호, 캐시 키)
+    pool = get_pool() if allow_ocr else None
+    range_size = pool.range_size() if pool is not None and pool.raster_workers else 0
+
+    def _flush():
+        if queued:
+            futures = pool.submit_range(pdf_path, [n for n, _ in queued], OCR_ZOOM)
+            inflight.update((key, f) for (_, key), f in zip(queued, futures))
+            queued.clear()
+
+    def _resolve(item, block: bool) -> Optional[Tuple[int, str]]:
+        page_number, value, fallback = item
+        if isinstance(value, str):
+            return page_number, value
+        if value not in inflight:
+            if not block:
+                return None
+            _flush()
+        future = inflight[value]
+        if not block and not future.done():
+            return None
+        try:
+            lines = future.result(timeout=OCR_PAGE_TIMEOUT)
+        except Exception as e:
+            print(f"⚠️ OCR 실패 (페이지 {page_number}): {e}")
+            return page_number, fallback
+        text = "\n".join(lines)
+        ocr_cache.put(value, text)
+        # 머리글 정도만 있던 스캔 페이지는 인식 결과가 더 길면 그걸로
+        return page_number, text if len(text.strip()) >= len(fallback.strip()) else fallback
+
+    with fitz.open(pdf_path) as doc:
+        for index in range(doc.page_count):
+            page = doc.load_page(index)
+            text = page.get_text()
+            counts["pages"] += 1
+            item = (index + 1, text, text)
+            if allow_ocr and classify_page(page, text).needs_ocr:
+                counts["ocr"] += 1
+                key = page_cache_key(page, OCR_ZOOM, OCR_LANG, text)
+                cached = ocr_cache.get(key)
+                if cached is not None:
+                    counts["cached"] += 1
+                    item = (index + 1, cached if len(cached.strip()) >= len(text.strip()) else text, text)
+                else:
+                    if key not in inflight and all(key != k for _, k in queued):
+                        if range_size:
+                            queued.append((index + 1, key))
+                        else:
+                            inflight[key] = pool.submit_page(page, OCR_ZOOM)
+                    item = (index + 1, key, text)
+            pending.append(item)
+
+            # 구간이 찼거나, 모아 두는 동안 뒤 페이지들이 너무 많이 밀려 있으면 넘김
+            if range_size and (len(queued) >= range_size or (queued and len(pending) > range_size * 4)):
+                _flush()
 
-    # 1) 텍스트 PDF 우선
-    text = _extract_text_pymupdf(pdf_path)
-    if text:
-        return text
+            while pending:
+                ready = _resolve(pending[0], block=False)
+                if ready is None:
+                    break
+                pending.popleft()
+                yield ready
 
-    # 2) 폴백: 스캔/이미지 기반 PDF일 때만 OCR
-    if allow_ocr:
-        return _extract_text_paddleocr(pdf_path)
+    while pending:
+        yield _resolve(pending.popleft(), block=True)
 
-    # 3) OCR 비허용이면 빈 문자열 반환
-    return ""
+    if counts["ocr"]:
+        elapsed = time.perf_counter() - started
+        print(f"🔁 페이지별 OCR: {counts['pages']}페이지 중 {counts['ocr']}페이지 "
+              f"(캐시 {counts['cached']}, 인식 {len(inflight)}), {elapsed:.2f}s")
 
+
+def extract_text_with_ocr_from_pdf(pdf_path: str, allow_ocr: bool = True) -> str:
+    """
+    페이지마다 PyMuPDF 텍스트를 쓰고, 필요한 페이지만 OCR (allow_ocr=False 면 OCR 없이)
+    """
+    print(f"📌 OCR 함수 진입: {pdf_path}")
+    try:
+        texts = [t.strip() for _, t in iter_page_texts_with_ocr(pdf_path, allow_ocr=allow_ocr)]
+    except Exception as e:
+        print(f"❌ 텍스트 추출 실패: {e}")
+        return ""
+    return "\n\n".join(t for t in texts if t).strip()
@@ -0,0 +1,74 @@
+# backend/services/page_meta_service.py
+"""
+노트별 페이지 메타데이터 조회 (프로세스 메모리 캐시 → PdfNote.page_meta → 없으면 한 번 계산해서 저장)
+
+- 새 업로드는 ingest 페이지 단계에서 저장되고, 이전에 올린 노트는 처음 조회될 때 채워진다.
+- 원본 PDF가 없는 노트(빈 노트 등)는 None
+"""
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import fitz  # PyMuPDF
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.pdf_notes import PdfNote
+from utils.page_meta import PageMeta, extract_page_meta, pack_page_meta, unpack_page_meta
+
+CACHE_MAX_NOTES = 512
+
+_cache: "OrderedDict[tuple, List[PageMeta]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(note: PdfNote) -> tuple:
+    # 같은 pdf_id라도 파일이 바뀌면 다른 키
+    return note.pdf_id, note.blob_sha256 or note.file_path
+
+
+def _cache_put(key: tuple, metas: List[PageMeta]):
+    with _cache_lock:
+        _cache[key] = metas
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_NOTES:
+            _cache.popitem(last=False)
+
+
+def store_page_meta(note: PdfNote, metas: List[PageMeta]):
+    """ingest 등 이미 문서를 열어 둔 곳에서 계산한 값을 저장 (커밋은 호출자)"""
+    note.page_meta = pack_page_meta(metas)
+    _cache_put(_cache_key(note), metas)
+
+
+def get_page_meta(db: Session, note: PdfNote) -> Optional[List[PageMeta]]:
+    key = _cache_key(note)
+    with _cache_lock:
+        metas = _cache.get(key)
+        if metas is not None:
+            _cache.move_to_end(key)
+            return metas
+
+    metas = unpack_page_meta(note.page_meta)
+    if metas is None:
+        try:
+            with fitz.open(note.file_path) as doc:
+                metas = extract_page_meta(doc)
+        except Exception as e:
+            print(f"⚠️ 페이지 메타데이터 계산 실패: pdf_id={note.pdf_id} | {e}")
+            return None
+        note.page_meta = pack_page_meta(metas)
+        db.commit()
+        print(f"📐 페이지 메타데이터 저장: pdf_id={note.pdf_id}, {len(metas)}페이지")
+
+    _cache_put(key, metas)
+    return metas
+
+
+def get_page(db: Session, note: PdfNote, page_number: int) -> PageMeta:
+    metas = get_page_meta(db, note)
+    if metas is None:
+        raise HTTPException(status_code=500, detail="PDF 페이지 정보를 읽을 수 없습니다.")
+    if page_number < 1 or page_number > len(metas):
+        raise HTTPException(status_code=400, detail="Invalid page number")
+    return metas[page_number - 1]
@@ -0,0 +1,104 @@
+# backend/services/page_thumbnail_service.py
+"""
+페이지 썸네일 지연 생성 (lazy)
+
+ingest 단계에서는 페이지 행(비율)만 만들고 썸네일은 앞쪽 몇 장만 렌더링한다.
+나머지는 /pdf/thumbnail/{pdf_id}/{page} 가 처음 요청될 때 만들고,
+그 주변 페이지(현재 보고 있는 위치 ± N)는 백그라운드에서 미리 만들어 둔다.
+
+- 같은 썸네일을 여러 요청이 동시에 만들지 않도록 경로별 in-flight 표시(Event)를 둔다.
+- 파일 이름 규칙은 ingest와 같으므로(thumbnail_output_pattern) blob 공유/삭제도 그대로 동작한다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from models.pdf_notes import PdfNote
+from services.pdf_ingest_service import thumbnail_output_pattern
+from utils.thumbnail import generate_thumbnail, generate_thumbnails
+
+# 요청한 페이지를 기다리는 최대 시간 (다른 요청이 같은 썸네일을 만드는 중일 때)
+WAIT_TIMEOUT = 30
+PREFETCH_WORKERS = int(os.getenv("THUMBNAIL_PREFETCH_WORKERS", "1"))
+
+_inflight: dict = {}  # 경로 → threading.Event
+_inflight_lock = threading.Lock()
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="thumb-prefetch")
+
+
+def _claim(paths: Iterable[str]) -> List[str]:
+    """아직 없고 아무도 만들고 있지 않은 경로만 골라서 in-flight로 표시"""
+    claimed = []
+    with _inflight_lock:
+        for path in paths:
+            if path in _inflight or os.path.exists(path):
+                continue
+            _inflight[path] = threading.Event()
+            claimed.append(path)
+    return claimed
+
+
+def _release(paths: Iterable[str]):
+    with _inflight_lock:
+        for path in paths:
+            event = _inflight.pop(path, None)
+            if event:
+                event.set()
+
+
+# ✅ 요청한 페이지 썸네일 확보
+def ensure_thumbnail(note: PdfNote, page_number: int) -> Optional[str]:
+    """썸네일 파일 경로 반환 (없으면 지금 렌더링, 실패 시 None)"""
+    path = thumbnail_output_pattern(note).format(page=page_number)
+    if os.path.exists(path):
+        return path
+
+    if not _claim([path]):
+        # 다른 요청(또는 prefetch)이 만드는 중 → 끝날 때까지 대기
+        with _inflight_lock:
+            event = _inflight.get(path)
+        if event:
+            event.wait(WAIT_TIMEOUT)
+        return path if os.path.exists(path) else None
+
+    try:
+        generate_thumbnail(note.file_path, page_number, path)
+        return path
+    except Exception as e:
+        print(f"⚠️ 썸네일 지연 생성 실패: pdf_id={note.pdf_id}, page={page_number} | {e}")
+        return None
+    finally:
+        _release([path])
+
+
+# ✅ 주변 페이지 미리 생성 (응답을 막지 않음)
+def prefetch_thumbnails(note: PdfNote, center: int, radius: int):
+    if radius <= 0:
+        return
+    total = note.total_pages or 0
+    pattern = thumbnail_output_pattern(note)
+    # 가까운 페이지부터: center+1, center-1, center+2, ...
+    pages = []
+    for d in range(1, radius + 1):
+        for n in (center + d, center - d):
+            if 1 <= n <= total:
+                pages.append(n)
+
+    paths = _claim(pattern.format(page=n) for n in pages)
+    if not paths:
+        return
+    claimed = set(paths)
+    pages = [n for n in pages if pattern.format(page=n) in claimed]
+    # 세션이 닫힌 뒤에도 쓸 수 있도록 ORM 객체 대신 값만 넘김
+    _prefetch_executor.submit(_prefetch_job, note.file_path, pages, pattern, paths)
+
+
+def _prefetch_job(pdf_path: str, pages: List[int], pattern: str, paths: List[str]):
+    try:
+        # 몇 장뿐이므로 프로세스 풀 없이 현재 프로세스에서 문서 한 번 열고 처리
+        generate_thumbnails(pdf_path, pages, pattern, workers=1)
+    except Exception as e:
+        print(f"⚠️ 썸네일 prefetch 실패: {pdf_path} | {e}")
+    finally:
+        _release(paths)
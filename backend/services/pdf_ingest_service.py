@@ -0,0 +1,480 @@
+# backend/services/pdf_ingest_service.py
+"""
+PDF 업로드 후처리(ingest) 파이프라인.
+
+/pdf/upload 는 파일 저장 + PdfNote 생성까지만 하고, 나머지
+(페이지/썸네일 → 텍스트 추출 → 임베딩/벡터 DB 저장)는 여기서 백그라운드로 처리한다.
+
+- 작업 큐의 원본은 DB(pdf_ingest_jobs)다. 메모리 큐는 job_id 전달용일 뿐이라
+  서버가 죽어도 재시작 시 resume_pending_jobs()가 DB에서 다시 채운다.
+- 단계별 카운터(pages_done 등)를 같은 트랜잭션에서 커밋하므로, 중간에 죽으면
+  마지막으로 커밋된 지점부터 이어서 처리한다.
+- running 작업에는 잡은 프로세스(worker_id)를 기록한다. 재시작 시 같은 호스트에서 이미 죽은
+  프로세스의 작업은 바로, 그 밖의 작업은 heartbeat 가 STALE_AFTER 동안 없으면
+  스케줄러(requeue_stale_jobs)가 다시 큐에 넣는다.
+"""
+import os
+import queue
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from uuid import uuid4
+
+import fitz  # PyMuPDF
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from models.pdf_ingest_job import PdfIngestJob
+from models.pdf_notes import PdfNote
+from models.pdf_pages import PdfPage
+from utils.thumbnail import generate_thumbnails, THUMBNAIL_EXT
+from services.blob_store import commit_blob, thumbnail_prefix
+from services.page_meta_service import get_page_meta, store_page_meta
+from utils.page_meta import PageMeta, extract_page_meta
+
+STAGES = ("pages", "text", "embeddings")
+
+# 페이지 단계에서 몇 페이지씩 썸네일을 배치 렌더링하고 커밋(=진행률 저장)할지
+PAGE_BATCH_SIZE = int(os.getenv("INGEST_PAGE_BATCH_SIZE", "64"))
+# running 상태인데 이 시간 동안 heartbeat(updated_at)가 없으면 죽은 작업으로 보고 다시 큐에 넣음
+STALE_AFTER = timedelta(minutes=int(os.getenv("INGEST_STALE_MINUTES", "10")))
+NUM_WORKERS = int(os.getenv("INGEST_WORKERS", "1"))
+# 썸네일 생성 방식
+# - lazy : 페이지 행(비율)만 한 번에 만들고 썸네일은 앞쪽 EAGER_THUMBNAIL_PAGES장만 렌더링,
+#          나머지는 /pdf/thumbnail 첫 요청 시 생성 (services/page_thumbnail_service.py)
+# - eager: 기존처럼 모든 페이지 썸네일을 ingest 중에 렌더링
+THUMBNAIL_MODE = os.getenv("INGEST_THUMBNAILS", "lazy").lower()
+EAGER_THUMBNAIL_PAGES = int(os.getenv("INGEST_EAGER_THUMBNAIL_PAGES", "3"))
+
+# 이 프로세스 식별자 (pid 는 컨테이너 재시작 시 재사용될 수 있어서 토큰을 붙임)
+_HOSTNAME = socket.gethostname()
+WORKER_ID = f"{_HOSTNAME}:{os.getpid()}:{uuid4().hex[:8]}"
+
+_job_queue: "queue.Queue[int]" = queue.Queue()
+_workers: list = []
+_workers_lock = threading.Lock()
+
+
+# ✅ 업로드된 파일(임시 파일) → blob 등록 + PdfNote 생성 + ingest 작업 등록
+def create_note_from_upload(
+    db: Session,
+    *,
+    user_id: int,
+    title: str,
+    folder_id: Optional[int],
+    tmp_path: str,
+    sha256: str,
+    size: int,
+):
+    """
+    /pdf/upload, 이어 올리기(resumable) 완료 처리가 공통으로 사용
+
+    Returns:
+        (PdfNote, PdfIngestJob)
+    """
+    # 1️⃣ 페이지 수 확인 + 첫 페이지 비율 계산 (렌더링 없이 메타데이터만)
+    try:
+        doc = fitz.open(tmp_path)
+    except Exception as e:
+        os.remove(tmp_path)
+        raise HTTPException(status_code=400, detail=f"PDF 파일을 열 수 없습니다: {e}")
+
+    with doc:
+        total_pages = doc.page_count
+        aspect_ratio = None
+        if total_pages > 0:
+            rect = doc[0].rect
+            if rect.height != 0:
+                aspect_ratio = round(rect.width / rect.height, 5)
+
+    # 2️⃣ 같은 내용의 파일이 있으면 그 blob을 공유 (임시 파일은 버림)
+    blob = commit_blob(db, sha256, tmp_path, size)
+
+    # 3️⃣ PdfNote DB 등록
+    new_note = PdfNote(
+        title=title,
+        file_path=blob.file_path,
+        blob_sha256=blob.sha256,
+        total_pages=total_pages,
+        user_id=user_id,
+        folder_id=folder_id,
+        aspect_ratio=aspect_ratio
+    )
+    db.add(new_note)
+    db.commit()
+    db.refresh(new_note)
+
+    # 4️⃣ 페이지/썸네일 + RAG는 백그라운드 작업으로
+    job = enqueue_ingest_job(db, new_note)
+    return new_note, job
+
+
+def thumbnail_output_pattern(note: PdfNote) -> str:
+    """blob 노트는 같은 파일끼리 썸네일을 공유하고, 구버전 노트는 pdf_id 기준"""
+    prefix = thumbnail_prefix(note.blob_sha256) if note.blob_sha256 else f"thumb_{note.pdf_id}"
+    return f"static/thumbnails/{prefix}_{{page}}.{THUMBNAIL_EXT}"
+
+
+def lazy_thumbnail_url(pdf_id: int, page_number: int) -> str:
+    """지연 생성 썸네일 URL (PdfPage.image_preview_url, 프론트는 기존처럼 baseUrl + url 로 사용)"""
+    return f"/pdf/thumbnail/{pdf_id}/{page_number}"
+
+
+# ✅ 작업 등록
+def enqueue_ingest_job(db: Session, note: PdfNote) -> PdfIngestJob:
+    """PdfNote에 대한 ingest 작업을 DB에 기록하고 워커 큐에 넣는다."""
+    job = PdfIngestJob(
+        pdf_id=note.pdf_id,
+        user_id=note.user_id,
+        status="queued",
+        pages_total=note.total_pages or 0,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    _job_queue.put(job.job_id)
+    print(f"📥 ingest 작업 등록: job_id={job.job_id}, pdf_id={note.pdf_id}")
+    return job
+
+
+# ✅ 워커 시작 (main.py startup 에서 호출)
+def start_ingest_workers(num_workers: int = NUM_WORKERS):
+    with _workers_lock:
+        if _workers:
+            return
+        for i in range(max(1, num_workers)):
+            t = threading.Thread(target=_worker_loop, name=f"pdf-ingest-{i}", daemon=True)
+            t.start()
+            _workers.append(t)
+    resume_pending_jobs()
+    print(f"[Ingest] 워커 {len(_workers)}개 시작")
+
+
+def _worker_alive(worker_id: Optional[str]) -> Optional[bool]:
+    """작업을 잡은 프로세스가 살아 있는지 (다른 호스트라 알 수 없으면 None)"""
+    if not worker_id:
+        return False
+    try:
+        host, pid, token = worker_id.rsplit(":", 2)
+        pid = int(pid)
+    except ValueError:
+        return None
+    if host != _HOSTNAME:
+        return None
+    if pid == os.getpid():
+        return worker_id == WORKER_ID  # 같은 pid 를 받은 이전 실행이면 죽은 것
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _requeue_running(db: Session, jobs: List[PdfIngestJob]) -> List[int]:
+    """
+    running 작업 중 잡은 프로세스가 죽었거나 heartbeat 가 끊긴 것 → queued
+    (조건부 UPDATE 라 여러 프로세스가 동시에 정리해도 한 번만 바뀜)
+    """
+    stale_before = datetime.utcnow() - STALE_AFTER
+    requeued = []
+    for job in jobs:
+        alive = _worker_alive(job.worker_id)
+        stale = not job.updated_at or job.updated_at <= stale_before
+        if alive or (alive is None and not stale):
+            continue  # 다른 프로세스가 아직 처리 중
+        changed = (
+            db.query(PdfIngestJob)
+            .filter(
+                PdfIngestJob.job_id == job.job_id,
+                PdfIngestJob.status == "running",
+                PdfIngestJob.worker_id == job.worker_id,  # None 이면 IS NULL
+            )
+            .update({PdfIngestJob.status: "queued", PdfIngestJob.worker_id: None}, synchronize_session=False)
+        )
+        if changed:
+            requeued.append(job.job_id)
+    db.commit()
+    return requeued
+
+
+def resume_pending_jobs():
+    """재시작 시 끝나지 않은 작업(queued / 잡은 프로세스가 죽은 running)을 다시 큐에 넣는다."""
+    with SessionLocal() as db:
+        jobs = (
+            db.query(PdfIngestJob)
+            .filter(PdfIngestJob.status.in_(["queued", "running"]))
+            .order_by(PdfIngestJob.job_id)
+            .all()
+        )
+        queued = [job.job_id for job in jobs if job.status == "queued"]
+        requeued = _requeue_running(db, [job for job in jobs if job.status == "running"])
+    for job_id in sorted(queued + requeued):
+        _job_queue.put(job_id)
+    if queued or requeued:
+        print(f"🔁 미완료 ingest 작업 {len(queued) + len(requeued)}개 재개 (중단된 running {len(requeued)}개)")
+
+
+# ✅ 중단된 running 작업 정리 (main.py 스케줄러에서 주기적으로 호출)
+def requeue_stale_jobs():
+    if not _workers:
+        return
+    with SessionLocal() as db:
+        jobs = db.query(PdfIngestJob).filter(PdfIngestJob.status == "running").all()
+        requeued = _requeue_running(db, jobs)
+    for job_id in requeued:
+        _job_queue.put(job_id)
+    if requeued:
+        print(f"🔁 중단된 ingest 작업 {len(requeued)}개 다시 큐에 넣음: {requeued}")
+
+
+def _worker_loop():
+    while True:
+        job_id = _job_queue.get()
+        try:
+            run_ingest_job(job_id)
+        except Exception as e:
+            print(f"❌ ingest 워커 오류: job_id={job_id} | {e}")
+        finally:
+            _job_queue.task_done()
+
+
+def _claim_job(db: Session, job_id: int) -> bool:
+    """queued → running 을 조건부 UPDATE로 바꿔서 여러 워커가 같은 작업을 잡지 않게 한다."""
+    claimed = (
+        db.query(PdfIngestJob)
+        .filter(PdfIngestJob.job_id == job_id, PdfIngestJob.status == "queued")
+        .update(
+            {
+                PdfIngestJob.status: "running",
+                PdfIngestJob.attempts: PdfIngestJob.attempts + 1,
+                PdfIngestJob.worker_id: WORKER_ID,
+                PdfIngestJob.updated_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return claimed == 1
+
+
+# ✅ 작업 실행
+def run_ingest_job(job_id: int):
+    with SessionLocal() as db:
+        if not _claim_job(db, job_id):
+            return
+
+        job = db.query(PdfIngestJob).filter(PdfIngestJob.job_id == job_id).first()
+        note = db.query(PdfNote).filter(PdfNote.pdf_id == job.pdf_id).first()
+        if not note:
+            _fail(db, job, "PDF 노트가 삭제되었습니다.")
+            return
+
+        print(f"🚀 ingest 시작: job_id={job.job_id}, pdf_id={note.pdf_id}, 시도={job.attempts}")
+        try:
+            _run_pages_stage(db, job, note)
+            _run_text_and_embedding_stages(db, job, note)
+        except Exception as e:
+            db.rollback()
+            _fail(db, job, str(e))
+            return
+
+        job.status = "done"
+        job.stage = None
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        print(f"✅ ingest 완료: job_id={job.job_id}")
+
+
+def _fail(db: Session, job: PdfIngestJob, message: str):
+    print(f"❌ ingest 실패: job_id={job.job_id} | {message}")
+    job.status = "failed"
+    job.error = message[:2000]
+    job.finished_at = datetime.utcnow()
+    db.commit()
+
+
+def _set_stage(db: Session, job: PdfIngestJob, stage: str):
+    job.stage = stage
+    db.commit()
+
+
+# 1️⃣ 페이지 행 + 썸네일
+def _run_pages_stage(db: Session, job: PdfIngestJob, note: PdfNote):
+    _set_stage(db, job, "pages")
+
+    existing = {
+        n for (n,) in db.query(PdfPage.page_number).filter(PdfPage.pdf_id == note.pdf_id).all()
+    }
+
+    # 전 페이지 크기/회전/텍스트 유무/이미지 수를 한 번에 수집 → 이후 비율이 필요한 곳은 fitz를 열지 않음
+    with fitz.open(note.file_path) as doc:
+        metas = extract_page_meta(doc)
+    store_page_meta(note, metas)
+
+    job.pages_total = len(metas)
+    job.pages_done = len(existing)
+    db.commit()
+
+    # 이전 시도에서 이미 커밋된 페이지는 건너뜀
+    pending = [n for n in range(1, len(metas) + 1) if n not in existing]
+    if THUMBNAIL_MODE == "eager":
+        _materialize_pages_eager(db, job, note, metas, pending)
+    else:
+        _materialize_pages_lazy(db, job, note, metas, pending)
+
+
+def _page_rows(note: PdfNote, metas: Optional[List[PageMeta]], page_numbers: Iterable[int], image_urls: Dict[int, Optional[str]], page_orders: Optional[Dict[int, int]] = None) -> List[dict]:
+    page_orders = page_orders or {}
+    metas = metas or []
+    return [
+        {
+            "pdf_id": note.pdf_id,
+            "page_number": page_number,
+            "page_order": page_orders.get(page_number, page_number),
+            "image_preview_url": image_urls.get(page_number),
+            "aspect_ratio": metas[page_number - 1].aspect_ratio if 1 <= page_number <= len(metas) else None,
+            "created_at": datetime.utcnow(),
+        }
+        for page_number in page_numbers
+    ]
+
+
+# ✅ 페이지 행 일괄 INSERT
+def bulk_insert_pages(db: Session, rows: List[dict]):
+    """
+    PdfPage 행들을 ORM 객체 없이 한 번의 executemany로 INSERT (커밋은 호출자)
+    - PyMySQL은 executemany를 여러 행 VALUES 하나로 합쳐서 보냄 → 페이지 수와 상관없이 왕복 1~2회
+    - page_id가 필요하면 INSERT 후 (pdf_id, page_number)로 조회
+    """
+    if rows:
+        db.execute(insert(PdfPage), rows)
+
+
+def create_pages(db: Session, note: PdfNote, page_numbers: List[int], page_orders: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+    """
+    /pdf/pages 등에서 페이지 행을 직접 만들 때 사용 (비율은 저장된 페이지 메타데이터에서 읽음)
+    - 썸네일은 ingest와 같은 규칙: lazy면 지연 생성 URL, eager면 지금 렌더링
+
+    Returns:
+        {page_number: page_id}
+    """
+    metas = get_page_meta(db, note) or []
+
+    # 원본 PDF 범위 밖 페이지(뒤에 추가한 빈 페이지)는 비율/썸네일 없이 행만 생성
+    in_pdf = [n for n in page_numbers if 1 <= n <= len(metas)]
+    if not in_pdf:
+        image_urls = {}
+    elif THUMBNAIL_MODE == "eager":
+        results = generate_thumbnails(note.file_path, in_pdf, thumbnail_output_pattern(note))["results"]
+        image_urls = {n: "/" + path for n, path in results.items() if path}
+    else:
+        image_urls = {n: lazy_thumbnail_url(note.pdf_id, n) for n in in_pdf}
+
+    bulk_insert_pages(db, _page_rows(note, metas, page_numbers, image_urls, page_orders))
+    db.commit()
+
+    return {
+        page_number: page_id
+        for page_id, page_number in (
+            db.query(PdfPage.page_id, PdfPage.page_number)
+            .filter(PdfPage.pdf_id == note.pdf_id, PdfPage.page_number.in_(page_numbers))
+            .order_by(PdfPage.page_id)
+        )
+    }
+
+
+def _materialize_pages_lazy(db: Session, job: PdfIngestJob, note: PdfNote, metas: List[PageMeta], pending: list):
+    """페이지 크기(메타데이터)만 읽어서 행을 한 번에 생성, 썸네일은 앞쪽 몇 장만"""
+    from services.page_thumbnail_service import _claim, _release
+
+    output_pattern = thumbnail_output_pattern(note)
+    # /pdf/thumbnail 이나 prefetch 가 같은 파일을 만드는 중이면 건너뜀 (경로 claim 을 같이 씀)
+    paths = _claim(output_pattern.format(page=n) for n in pending if n <= EAGER_THUMBNAIL_PAGES)
+    if paths:
+        claimed = set(paths)
+        eager = [n for n in pending if output_pattern.format(page=n) in claimed]
+        try:
+            generate_thumbnails(note.file_path, eager, output_pattern, workers=1)
+        finally:
+            _release(paths)
+
+    image_urls = {n: lazy_thumbnail_url(note.pdf_id, n) for n in pending}
+    bulk_insert_pages(db, _page_rows(note, metas, pending, image_urls))
+    job.pages_done += len(pending)
+    db.commit()
+
+
+def _materialize_pages_eager(db: Session, job: PdfIngestJob, note: PdfNote, metas: List[PageMeta], pending: list):
+    output_pattern = thumbnail_output_pattern(note)
+
+    for start in range(0, len(pending), PAGE_BATCH_SIZE):
+        batch = pending[start:start + PAGE_BATCH_SIZE]
+
+        # 같은 blob의 다른 노트가 이미 만든 썸네일은 그대로 공유
+        rendered = {n: output_pattern.format(page=n) for n in batch if os.path.exists(output_pattern.format(page=n))}
+        to_render = [n for n in batch if n not in rendered]
+        if to_render:
+            rendered.update(generate_thumbnails(note.file_path, to_render, output_pattern)["results"])
+
+        image_urls = {n: "/" + path for n, path in rendered.items() if path}
+        bulk_insert_pages(db, _page_rows(note, metas, batch, image_urls))
+
+        # 페이지 행과 진행 카운터를 같은 트랜잭션으로 커밋
+        job.pages_done += len(batch)
+        db.commit()
+
+
+# 2️⃣ 텍스트 추출 → 쪼개기, 3️⃣ 임베딩 → 벡터 DB 저장
+def _run_text_and_embedding_stages(db: Session, job: PdfIngestJob, note: PdfNote):
+    from services.embedding_service import embed_chunk_stream
+    from services.text_pipeline import iter_chunk_batches
+
+    # 텍스트 단계는 빠르고 부작용이 없으므로 재시도 시 처음부터 다시 수행
+    # 추출·분할(백그라운드 스레드)과 임베딩 요청이 배치 단위로 겹쳐서 진행됨 (services/text_pipeline.py)
+    _set_stage(db, job, "text")
+    job.text_pages_total = note.total_pages or 0
+    job.text_pages_done = 0
+    job.chunks_total = 0
+    job.chunks_done = 0
+    db.commit()
+
+    def _batches():
+        # DB 세션은 이 스레드에서만 사용 (추출 스레드는 큐에 배치만 넣음)
+        for pages_done, batch in iter_chunk_batches(note.file_path, note.pdf_id):
+            job.text_pages_done = pages_done
+            job.chunks_total += len(batch)
+            db.commit()
+            yield [c.text for c in batch], [c.meta for c in batch]
+        job.text_pages_done = job.text_pages_total
+        _set_stage(db, job, "embeddings")
+        print(f"🔍 텍스트 분할: {job.text_pages_total}페이지, 청크 수: {job.chunks_total}")
+
+    def _on_progress(done: int, seen: int):
+        job.chunks_done = done
+        db.commit()
+
+    # 사용자별 인덱스에 이 노트 청크만 추가 (다른 노트 인덱스는 그대로)
+    embs = embed_chunk_stream(
+        _batches(), on_progress=_on_progress, blob_sha256=note.blob_sha256,
+        user_id=note.user_id, pdf_id=note.pdf_id,
+    )
+    if len(embs) == 0:
+        return
+    # 임베딩 도중 노트가 삭제됐으면 방금 추가한 벡터도 제거
+    if not db.query(PdfNote.pdf_id).filter(PdfNote.pdf_id == note.pdf_id).first():
+        from services.vector_index_manager import remove_document
+        remove_document(note.user_id, note.pdf_id)
+        return
+    job.chunks_done = job.chunks_total
+    db.commit()
+
+
+def get_ingest_job(db: Session, job_id: int) -> Optional[PdfIngestJob]:
+    return db.query(PdfIngestJob).filter(PdfIngestJob.job_id == job_id).first()
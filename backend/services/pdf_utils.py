@@ -1,12 +1,111 @@
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
 import fitz  # PyMuPDF
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """PDF 파일에서 전체 텍스트 추출"""
-    text = ""
+# 텍스트 추출용 프로세스 수 (0 또는 1이면 현재 프로세스에서 처리)
+TEXT_WORKERS = int(os.getenv("TEXT_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 이 페이지 수보다 작으면 프로세스 풀을 쓰지 않음 (텍스트 추출은 빨라서 프로세스 기동/전달 비용이 더 큼)
+MIN_PAGES_FOR_POOL = int(os.getenv("TEXT_EXTRACT_MIN_PAGES_FOR_POOL", "200"))
+# 워커에 한 번에 넘기는 페이지 구간 크기
+PAGES_PER_TASK = int(os.getenv("TEXT_EXTRACT_PAGES_PER_TASK", "32"))
+
+
+def _page_text(doc, index: int) -> str:
+    try:
+        return doc.load_page(index).get_text()
+    except Exception as e:
+        print(f"⚠️ 텍스트 추출 오류 (페이지 {index + 1}): {e}")
+        return ""
+
+
+# 워커 프로세스마다 자기 fitz 핸들을 유지 (같은 문서의 다음 구간이 오면 재사용)
+_worker_doc = None
+_worker_doc_path = None
+
+
+def _extract_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """워커에서 실행: [start, end) 구간(0부터) 페이지 텍스트 목록"""
+    global _worker_doc, _worker_doc_path
+    if _worker_doc is None or _worker_doc_path != pdf_path:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        _worker_doc = fitz.open(pdf_path)
+        _worker_doc_path = pdf_path
+    return [_page_text(_worker_doc, i) for i in range(start, end)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        # fork 대신 spawn: 서버 스레드/커넥션 상태를 자식에 복제하지 않도록
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+
+def _iter_ranges_parallel(pdf_path: str, page_count: int, workers: int) -> Iterator[Tuple[int, str]]:
+    """
+    페이지 구간을 프로세스 풀에 나눠서 추출하고 페이지 순서대로 반환
+    동시에 띄워 두는 구간은 workers × 2개까지 → 소비가 느려도 추출 결과가 메모리에 쌓이지 않음
+    """
+    pool = _get_pool(workers)
+    ranges = iter([(s, min(s + PAGES_PER_TASK, page_count)) for s in range(0, page_count, PAGES_PER_TASK)])
+    in_flight = deque()
+
+    def _submit_next():
+        r = next(ranges, None)
+        if r is not None:
+            in_flight.append((r[0], pool.submit(_extract_range, pdf_path, *r)))
+
+    for _ in range(workers * 2):
+        _submit_next()
+    try:
+        while in_flight:
+            start, future = in_flight.popleft()
+            texts = future.result()
+            _submit_next()
+            for offset, text in enumerate(texts):
+                yield start + offset + 1, text
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+
+
+def iter_page_texts(pdf_path: str, workers: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    페이지를 하나씩 열어서 (페이지 번호, 텍스트) 반환 → 문서 전체 문자열을 만들지 않음
+    페이지가 MIN_PAGES_FOR_POOL 이상이면 구간별로 프로세스 풀에서 추출 (workers: None이면 TEXT_WORKERS)
+    """
     try:
         doc = fitz.open(pdf_path)
-        for page in doc:
-            text += page.get_text()
     except Exception as e:
         print(f"⚠️ 텍스트 추출 오류: {e}")
-    return text.strip()
+        return
+
+    workers = TEXT_WORKERS if workers is None else workers
+    if workers > 1 and doc.page_count >= MIN_PAGES_FOR_POOL:
+        page_count = doc.page_count
+        doc.close()
+        yield from _iter_ranges_parallel(os.path.abspath(pdf_path), page_count, workers)
+        return
+
+    try:
+        for index in range(doc.page_count):
+            yield index + 1, _page_text(doc, index)
+    finally:
+        doc.close()
+
+
+def extract_text_from_pdf(pdf_path: str) -> str:
+    """PDF 파일에서 전체 텍스트 추출"""
+    return "".join(text for _, text in iter_page_texts(pdf_path)).strip()
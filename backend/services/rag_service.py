@@ -1,17 +1,131 @@
 # services/rag_service.py
+"""
+채팅 질문 → 관련 청크 검색
 
+RETRIEVAL_MODE
+- hybrid (기본): 벡터 검색 + BM25 키워드 검색(services/lexical_index.py) 결과를
+  RRF(reciprocal rank fusion, 순위 역수 합)로 합침 → 장/절 번호, 용어, 수식처럼 글자 그대로 맞아야 하는 질문 보완
+- vector : 벡터 검색만 (예전 방식)
+- lexical: 키워드 검색만
+"""
+import os
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.pdf_folder import Folder
+from models.pdf_notes import PdfNote
 from services.embedding_service import get_embedding
-from utils.vector_db_utils import search_similar_chunks
+from services.vector_index_manager import lexical_search, search
+
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+# 각 검색에서 후보를 몇 개씩 가져와서 합칠지, RRF 상수 k (클수록 하위 순위도 비중↑)
+RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", "20"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+
+def resolve_search_scope(
+    db: Session, user_id: int, folder_id: Optional[int] = None, pdf_ids: Optional[List[int]] = None
+) -> Optional[List[int]]:
+    """폴더/노트 필터 → 검색할 내 노트 pdf_id 목록 (필터가 없으면 None = 내 모든 노트)"""
+    if folder_id is None and pdf_ids is None:
+        return None
+
+    query = db.query(PdfNote.pdf_id).filter(PdfNote.user_id == user_id)
+    if folder_id is not None:
+        folder = db.query(Folder).filter(Folder.folder_id == folder_id, Folder.user_id == user_id).first()
+        if not folder:
+            raise HTTPException(status_code=404, detail="폴더를 찾을 수 없습니다.")
+        query = query.filter(PdfNote.folder_id == folder_id)
+    if pdf_ids is not None:
+        query = query.filter(PdfNote.pdf_id.in_(pdf_ids))  # 남의 노트 id는 여기서 걸러짐
+    return [pdf_id for (pdf_id,) in query.all()]
+
+
+def reciprocal_rank_fusion(result_lists: List[List[dict]], top_k: int, k: int = RRF_K) -> List[dict]:
+    """여러 검색 결과 목록 → (pdf_id, chunk_no) 별 Σ 1/(k + 순위) 높은 순 top_k"""
+    fused: Dict[tuple, dict] = {}
+    scores: Dict[tuple, float] = {}
+    for results in result_lists:
+        for rank, r in enumerate(results, start=1):
+            key = (r["pdf_id"], r["chunk_no"])
+            fused.setdefault(key, {}).update(r)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [{**fused[key], "rrf_score": scores[key]} for key in ranked]
+
+
+def search_chunks(
+    question: str, user_id: int, pdf_ids: Optional[List[int]] = None, top_k: int = 3, mode: Optional[str] = None
+) -> List[dict]:
+    """
+    모드별 검색 (실패하면 예외), 결과 형식은 vector_index_manager.search 와 같음
+    hybrid 는 양쪽 후보를 RETRIEVAL_CANDIDATES 개씩 가져와서 RRF 로 top_k 개 선택
+    """
+    mode = mode or RETRIEVAL_MODE
+    if mode == "lexical":
+        return lexical_search(user_id, question, top_k=top_k, pdf_ids=pdf_ids)
 
-def retrieve_relevant_chunks(question: str, top_k=3) -> list[str]:
     q_embedding = get_embedding(question)
     if q_embedding is None:
+        if mode == "hybrid":
+            print("⚠️ 질문 임베딩 실패 → 키워드 검색만 사용")
+            return lexical_search(user_id, question, top_k=top_k, pdf_ids=pdf_ids)
         print("❌ 질문 임베딩 실패")
         return []
+    if mode == "vector":
+        return search(user_id, q_embedding, top_k=top_k, pdf_ids=pdf_ids)
 
-    chunks = search_similar_chunks(q_embedding, top_k=top_k)
-    if not chunks:  # None 또는 빈 리스트 방어
+    candidates = max(top_k, RETRIEVAL_CANDIDATES)
+    return reciprocal_rank_fusion([
+        search(user_id, q_embedding, top_k=candidates, pdf_ids=pdf_ids),
+        lexical_search(user_id, question, top_k=candidates, pdf_ids=pdf_ids),
+    ], top_k)
+
+
+def retrieve_relevant_chunks(question: str, user_id: int, pdf_ids: Optional[List[int]] = None, top_k=3) -> list[str]:
+    started = time.perf_counter()
+    try:
+        results = search_chunks(question, user_id, pdf_ids=pdf_ids, top_k=top_k)
+    except Exception as e:
+        print(f"❌ 검색 실패: {e}")
+        return []
+    if not results:
         print("⚠️ 관련 청크 없음")
         return []
 
-    return chunks
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"🔍 검색 완료 ({RETRIEVAL_MODE}, {elapsed:.1f}ms): {[(r['pdf_id'], r['chunk_no']) for r in results]}")
+    return [r["text"] for r in results]
+
+
+def build_chat_prompt(question: str, chunks: List[str]) -> str:
+    """검색된 청크 유무에 따라 프롬프트 구성 (/api/chat, /api/chat/stream 공통)"""
+    if not chunks:
+        # 🔁 GPT only, but 정직하게 (너가 원하는 fallback)
+        return f"""
+당신은 친절한 학습 도우미입니다. 
+사용자가 올린 문서에서 관련 내용을 찾지 못했습니다. 
+그렇기 때문에 당신이 알고 있는 범위에서만 답변해주세요.
+모르면 모른다고 답하세요.
+
+[질문]
+{question}
+
+[답변]
+"""
+    # ✅ RAG + GPT 결합 응답
+    context = "\n".join(chunks)
+    return f"""
+당신은 친절한 학습 도우미입니다. 아래 문맥을 참고하여 사용자 질문에 답변해주세요.
+
+[문맥]
+{context}
+
+[질문]
+{question}
+
+[답변]
+"""
@@ -0,0 +1,306 @@
+# backend/services/resumable_upload_service.py
+"""
+대용량 PDF 이어 올리기 (tus 방식 참고)
+
+1) 세션 생성 → upload_id
+2) PUT 으로 바이트 구간 전송 (반드시 현재 offset부터, 순서대로)
+3) 끊기면 HEAD/GET 으로 서버가 받은 offset 확인 후 거기서부터 다시 전송
+4) 다 받으면 finalize → 기존 업로드와 같은 create_note_from_upload()로 노트 생성
+
+- 받은 구간은 part 파일 하나에 제자리(offset 위치)로 기록 → 마지막에 합치는 과정 없음
+- sha256은 받는 즉시 이어서 계산 (서버가 중간에 재시작되어 해시 상태를 잃은 경우에만 finalize에서 파일을 다시 읽음)
+  · 해시 상태는 복사본에 이어 계산하고 DB 커밋이 끝난 뒤에만 바꿔 넣음 (413 등으로 되돌린 구간이 섞이지 않게)
+- 업로드 하나에 PUT 은 한 번에 하나만 (전송 중에 같은 업로드로 또 PUT 하면 409)
+"""
+import hashlib
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from db import SessionLocal
+from models.pdf_upload_session import PdfUploadSession
+from services.blob_store import TMP_DIR, MAX_UPLOAD_BYTES, PDF_MAGIC, hash_file
+from services.pdf_ingest_service import create_note_from_upload
+
+SESSION_TTL = timedelta(hours=int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24")))
+RECOMMENDED_CHUNK_SIZE = 5 * 1024 * 1024  # 클라이언트 권장 PUT 크기 (모바일 기준 5MB)
+WRITE_BUFFER_BYTES = 1024 * 1024  # 이만큼 모아서 스레드풀에서 part 파일에 기록
+
+# upload_id → (해시가 반영된 offset, sha256 객체)
+_hash_states: dict = {}
+_hash_lock = threading.Lock()
+_active_uploads: set = set()  # 지금 PUT 을 받는 중인 upload_id (_hash_lock 으로 보호)
+
+
+# ✅ 1. 세션 생성
+def create_upload_session(db: Session, user_id: int, title: str, folder_id: Optional[int], total_size: int) -> PdfUploadSession:
+    if total_size <= 0:
+        raise HTTPException(status_code=400, detail="파일 크기가 올바르지 않습니다.")
+    if total_size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="파일이 너무 큽니다.")
+
+    upload_id = uuid4().hex
+    os.makedirs(TMP_DIR, exist_ok=True)
+    part_path = f"{TMP_DIR}/resumable_{upload_id}.part"
+    open(part_path, "wb").close()
+
+    session = PdfUploadSession(
+        upload_id=upload_id,
+        user_id=user_id,
+        title=title,
+        folder_id=folder_id,
+        total_size=total_size,
+        offset=0,
+        part_path=part_path,
+        status="open",
+        expires_at=datetime.utcnow() + SESSION_TTL,
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+
+    with _hash_lock:
+        _hash_states[upload_id] = (0, hashlib.sha256())
+    return session
+
+
+def get_upload_session(db: Session, upload_id: str, user_id: int) -> PdfUploadSession:
+    session = db.query(PdfUploadSession).filter(PdfUploadSession.upload_id == upload_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    if session.user_id != user_id:
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+    if session.status == "open" and session.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=410, detail="업로드 세션이 만료되었습니다.")
+    return session
+
+
+# ✅ 2. 구간 전송
+async def append_chunk(db: Session, session: PdfUploadSession, offset: int, stream: AsyncIterator[bytes]) -> int:
+    """
+    offset 위치부터 stream 내용을 part 파일에 기록하고 확정된 offset 반환
+    - offset이 서버 기준과 다르면 409 (클라이언트는 HEAD로 offset을 다시 확인)
+    - 같은 업로드로 다른 PUT 이 전송 중이면 409 (모바일 재시도가 앞 요청과 겹친 경우)
+    - 전송 도중 연결이 끊겨도 그때까지 받은 바이트는 확정
+    - 본문은 이벤트 루프에서 받고, DB/파일 쓰기/해시는 WRITE_BUFFER_BYTES 단위로 스레드풀에서
+    """
+    with _hash_lock:
+        if session.upload_id in _active_uploads:
+            raise HTTPException(
+                status_code=409,
+                detail="같은 업로드의 다른 구간을 받는 중입니다. 잠시 후 offset을 확인하고 다시 보내세요.",
+                headers={"Upload-Offset": str(session.offset)},
+            )
+        _active_uploads.add(session.upload_id)
+    try:
+        writer = await run_in_threadpool(_ChunkWriter, db, session, offset)
+        try:
+            disconnected = await _receive(writer, stream)
+        except Exception:
+            await run_in_threadpool(writer.abort)
+            raise
+        return await run_in_threadpool(writer.commit, disconnected)
+    finally:
+        with _hash_lock:
+            _active_uploads.discard(session.upload_id)
+
+
+async def _receive(writer: "_ChunkWriter", stream: AsyncIterator[bytes]) -> bool:
+    """본문을 모아서 writer 에 넘김 → 연결이 끊겼으면 True (받은 데까지는 기록)"""
+    buf = bytearray()
+    disconnected = False
+    try:
+        async for block in stream:
+            buf += block
+            if len(buf) >= WRITE_BUFFER_BYTES:
+                await run_in_threadpool(writer.write, bytes(buf))
+                buf.clear()
+    except HTTPException:
+        raise
+    except Exception as e:  # 클라이언트 연결 끊김 등 → 받은 만큼만 확정
+        print(f"⚠️ 업로드 구간 수신 중단: {writer.session.upload_id} | {e}")
+        disconnected = True
+    if buf:
+        await run_in_threadpool(writer.write, bytes(buf))
+    return disconnected
+
+
+class _ChunkWriter:
+    """PUT 하나의 part 파일 쓰기 (메서드는 모두 블로킹 → 스레드풀에서 호출)"""
+
+    def __init__(self, db: Session, session: PdfUploadSession, offset: int):
+        db.refresh(session)  # 잠금 전에 읽은 값이면 앞 요청이 확정한 offset 이 빠져 있을 수 있음
+        if session.status != "open":
+            raise HTTPException(status_code=409, detail="이미 완료된 업로드입니다.")
+        if offset != session.offset:
+            raise HTTPException(
+                status_code=409,
+                detail=f"offset 불일치: 서버 offset={session.offset}",
+                headers={"Upload-Offset": str(session.offset)},
+            )
+        self.db = db
+        self.session = session
+        self.start = session.offset
+        self.written = 0
+
+        with _hash_lock:
+            state = _hash_states.get(session.upload_id)
+        # 복사본에 이어 계산 → 이 요청이 실패해도 저장된 상태는 session.offset 기준 그대로
+        self.hasher = state[1].copy() if state and state[0] == session.offset else None
+
+        self.f = open(session.part_path, "r+b")
+        # 이전 요청이 DB 반영 전에 죽었을 수 있으므로 확정된 offset 이후는 버림
+        self.f.truncate(self.start)
+        self.f.seek(self.start)
+
+    def write(self, data: bytes):
+        if self.start + self.written + len(data) > self.session.total_size:
+            raise HTTPException(status_code=413, detail="선언한 파일 크기를 초과했습니다.")
+        if self.start == 0 and self.written == 0 and not data.startswith(PDF_MAGIC[:len(data)]):
+            raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
+        self.f.write(data)
+        if self.hasher:
+            self.hasher.update(data)
+        self.written += len(data)
+
+    def abort(self):
+        try:
+            self.f.truncate(self.start)
+        finally:
+            self.f.close()
+
+    def commit(self, disconnected: bool) -> int:
+        session = self.session
+        try:
+            self.f.flush()
+            os.fsync(self.f.fileno())
+        finally:
+            self.f.close()
+
+        # 다른 서버 프로세스가 같은 업로드를 받았는지 행 잠금으로 다시 확인
+        self.db.refresh(session, with_for_update=True)
+        if session.offset != self.start or session.status != "open":
+            self.db.rollback()
+            with _hash_lock:
+                _hash_states.pop(session.upload_id, None)  # part 파일이 섞였을 수 있음 → finalize 에서 다시 계산
+            raise HTTPException(
+                status_code=409,
+                detail=f"offset 불일치: 서버 offset={session.offset}",
+                headers={"Upload-Offset": str(session.offset)},
+            )
+        session.offset = self.start + self.written
+        session.expires_at = datetime.utcnow() + SESSION_TTL
+        self.db.commit()
+
+        with _hash_lock:
+            if self.hasher:
+                _hash_states[session.upload_id] = (session.offset, self.hasher)
+            else:
+                _hash_states.pop(session.upload_id, None)
+
+        if disconnected:
+            print(f"🔌 {session.upload_id}: {session.offset}/{session.total_size} 바이트까지 확정")
+        return session.offset
+
+
+# ✅ 3. 완료 처리
+def finalize_upload(db: Session, session: PdfUploadSession):
+    """
+    세션 행을 잠그고 open → finalizing 으로 바꾼 뒤 노트 생성 (동시에 finalize 해도 노트는 하나)
+    - PDF 가 아니라서 400 이면 failed 로 바꾸고 part 파일 정리 (다시 finalize 하면 409)
+    - 그 밖의 오류면 part 파일이 남아 있는 한 open 으로 되돌려서 다시 시도할 수 있게 함
+
+    Returns:
+        (PdfNote, PdfIngestJob)
+    """
+    db.refresh(session, with_for_update=True)
+    if session.status != "open":
+        db.rollback()
+        detail = {
+            "finalizing": "완료 처리 중인 업로드입니다.",
+            "failed": "PDF 파일이 아니어서 실패한 업로드입니다. 새로 업로드하세요.",
+        }.get(session.status, "이미 완료된 업로드입니다.")
+        raise HTTPException(status_code=409, detail=detail)
+    if session.offset != session.total_size:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"아직 업로드가 끝나지 않았습니다. ({session.offset}/{session.total_size})",
+            headers={"Upload-Offset": str(session.offset)},
+        )
+    session.status = "finalizing"
+    db.commit()
+
+    try:
+        with _hash_lock:
+            state = _hash_states.pop(session.upload_id, None)
+        if state and state[0] == session.total_size:
+            sha256 = state[1].hexdigest()
+        else:
+            print(f"🔁 해시 상태 없음(서버 재시작 등) → 파일 다시 읽어서 계산: {session.upload_id}")
+            sha256 = hash_file(session.part_path)
+
+        note, job = create_note_from_upload(
+            db,
+            user_id=session.user_id,
+            title=session.title,
+            folder_id=session.folder_id,
+            tmp_path=session.part_path,
+            sha256=sha256,
+            size=session.total_size,
+        )
+    except Exception as e:
+        db.rollback()
+        failed = isinstance(e, HTTPException) and e.status_code == 400
+        session.status = "failed" if failed or not os.path.exists(session.part_path) else "open"
+        if session.status == "failed":
+            _remove_part(session)
+        db.commit()
+        print(f"❌ 이어 올리기 완료 처리 실패: {session.upload_id} → {session.status} | {e}")
+        raise
+
+    session.status = "finalized"
+    session.pdf_id = note.pdf_id
+    db.commit()
+    return note, job
+
+
+def abort_upload(db: Session, session: PdfUploadSession):
+    db.refresh(session, with_for_update=True)
+    if session.status == "finalizing":
+        db.rollback()
+        raise HTTPException(status_code=409, detail="완료 처리 중인 업로드는 취소할 수 없습니다.")
+    _remove_part(session)
+    db.delete(session)
+    db.commit()
+
+
+def _remove_part(session: PdfUploadSession):
+    with _hash_lock:
+        _hash_states.pop(session.upload_id, None)
+    # finalized 면 part 파일은 이미 blob 으로 옮겨졌거나 지워짐
+    if session.status != "finalized" and os.path.exists(session.part_path):
+        os.remove(session.part_path)
+
+
+# ✅ 만료 세션 정리 (main.py 스케줄러에서 주기적으로 호출)
+def cleanup_expired_upload_sessions():
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        expired = (
+            db.query(PdfUploadSession)
+            .filter(PdfUploadSession.status.in_(["open", "failed"]), PdfUploadSession.expires_at < now)
+            .all()
+        )
+        for session in expired:
+            _remove_part(session)
+            db.delete(session)
+        db.commit()
+    if expired:
+        print(f"🧹 만료된 업로드 세션 {len(expired)}개 정리")
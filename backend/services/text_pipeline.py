@@ -0,0 +1,90 @@
+# backend/services/text_pipeline.py
+"""
+텍스트 추출 → 분할 → 임베딩 파이프라인 (ingest, 인덱스 재구성 스크립트용)
+
+추출·분할은 백그라운드 스레드에서 돌리고, 청크를 배치로 묶어 크기가 정해진 큐에 넣는다.
+소비하는 쪽(임베딩 요청)이 한 배치를 처리하는 동안 다음 페이지들을 추출하므로
+네트워크 대기와 PDF 파싱이 겹치고, 큐가 차면 추출이 멈춰서 메모리는 큐 크기만큼만 씀.
+
+    for pages_done, batch in iter_chunk_batches(path, pdf_id):
+        ...  # batch: List[TextChunk], pages_done: 지금까지 추출이 끝난 페이지 수
+"""
+import os
+import queue
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+from services.pdf_utils import iter_page_texts
+from services.text_splitter import TextChunk, split_page
+
+# 임베딩 쪽으로 넘기는 배치 크기(청크 수)와 큐에 쌓아 둘 수 있는 배치 수
+PIPELINE_BATCH_CHUNKS = int(os.getenv("PIPELINE_BATCH_CHUNKS", "256"))
+PIPELINE_QUEUE_BATCHES = int(os.getenv("PIPELINE_QUEUE_BATCHES", "4"))
+# 텍스트가 없는 페이지(스캔/필기)만 골라서 OCR (services/ocr_service.iter_page_texts_with_ocr, PaddleOCR 필요)
+INGEST_OCR = os.getenv("INGEST_OCR", "0").lower() in ("1", "true", "yes")
+
+_DONE = object()
+
+
+def iter_chunk_batches(
+    pdf_path: str,
+    pdf_id: int,
+    batch_size: int = PIPELINE_BATCH_CHUNKS,
+    queue_size: int = PIPELINE_QUEUE_BATCHES,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[int, List[TextChunk]]]:
+    """
+    PDF → (추출 끝난 페이지 수, 청크 배치) 스트림
+
+    - 추출 스레드에서 난 예외는 소비하는 쪽에서 다시 발생
+    - 소비를 중간에 멈추면(break/예외) 추출 스레드도 다음 배치에서 멈춤
+    - workers: 텍스트 추출 프로세스 수 (pdf_utils.iter_page_texts 참고, INGEST_OCR 이면 사용 안 함)
+    """
+    q: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _pages():
+        if INGEST_OCR:
+            from services.ocr_service import iter_page_texts_with_ocr
+            return iter_page_texts_with_ocr(pdf_path)
+        return iter_page_texts(pdf_path, workers=workers)
+
+    def _produce():
+        try:
+            batch: List[TextChunk] = []
+            pages_done = 0
+            for page_number, text in _pages():
+                batch.extend(split_page(text, pdf_id, page_number))
+                pages_done = page_number
+                if len(batch) >= batch_size:
+                    if not _put((pages_done, batch)):
+                        return
+                    batch = []
+            if batch and not _put((pages_done, batch)):
+                return
+            _put(_DONE)
+        except Exception as e:
+            _put(e)
+
+    producer = threading.Thread(target=_produce, name=f"text-pipeline-{pdf_id}", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join(timeout=5)
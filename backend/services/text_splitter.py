@@ -1,4 +1,134 @@
 # services/text_splitter.py
+"""
+텍스트 분할
+
+- split_pages: 페이지를 하나씩 받아서 문장/문단 경계로 자르고 토큰 예산 안에서 묶음 (ingest용)
+  · 문서 전체 문자열을 만들지 않음 → 페이지 수가 많아도 메모리는 페이지 하나 분량
+  · 청크마다 (pdf_id, 페이지, 페이지 안 글자 위치) 출처를 같이 돌려줌
+  · 청크는 페이지를 넘지 않음, 겹침은 앞 청크의 마지막 문장들(overlap_tokens 이내)
+  · 예산보다 긴 문장은 어절(공백) 단위로, 그래도 긴 어절은 글자 단위로 자름
+- split_text_into_chunks: 예전 방식 (고정 글자 수 + 겹침)
+"""
+import os
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from services.embedding_client import count_tokens
+from utils.chunk_store import ChunkMeta
+
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "300"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))
+
+# 문장 끝(마침표/물음표/느낌표 + 닫는 따옴표·괄호 + 공백) 또는 빈 줄(문단)
+_BOUNDARY = re.compile(r"[.!?。！？…]+[\"'”’)\]]*(?=\s|$)\s*|\n[ \t]*\n\s*")
+_WORD = re.compile(r"\S+\s*")
+
+
+class TextChunk(NamedTuple):
+    text: str
+    pdf_id: int
+    page: int    # 1부터
+    offset: int  # 페이지 텍스트 안 시작 글자 위치
+    end: int     # 페이지 텍스트 안 끝 글자 위치 (미포함)
+
+    @property
+    def meta(self) -> ChunkMeta:
+        return ChunkMeta(self.pdf_id, self.page, self.offset, self.end)
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """문장/문단 단위 (시작, 끝) 위치 목록 (앞뒤 공백 제외)"""
+    spans, start = [], 0
+    for m in _BOUNDARY.finditer(text):
+        spans.append((start, m.end()))
+        start = m.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+
+    trimmed = []
+    for s, e in spans:
+        segment = text[s:e]
+        s += len(segment) - len(segment.lstrip())
+        e -= len(segment) - len(segment.rstrip())
+        if s < e:
+            trimmed.append((s, e))
+    return trimmed
+
+
+def _split_long(text: str, start: int, end: int, max_tokens: int) -> List[Tuple[int, int, int]]:
+    """예산보다 긴 문장 → 어절 단위 조각 (시작, 끝, 토큰 수), 어절 하나가 넘치면 글자 단위"""
+    pieces, piece_start, piece_tokens = [], start, 0
+    for m in _WORD.finditer(text, start, end):
+        word_start, word_end = m.start(), min(m.end(), end)
+        tokens = count_tokens(text[word_start:word_end])
+        if tokens > max_tokens:
+            if piece_tokens:
+                pieces.append((piece_start, word_start, piece_tokens))
+            step = max(1, (word_end - word_start) * max_tokens // tokens)
+            for s in range(word_start, word_end, step):
+                e = min(s + step, word_end)
+                pieces.append((s, e, count_tokens(text[s:e])))
+            piece_start, piece_tokens = word_end, 0
+            continue
+        if piece_tokens and piece_tokens + tokens > max_tokens:
+            pieces.append((piece_start, word_start, piece_tokens))
+            piece_start, piece_tokens = word_start, 0
+        piece_tokens += tokens
+    if piece_tokens:
+        pieces.append((piece_start, end, piece_tokens))
+    return [(s, e - (len(text[s:e]) - len(text[s:e].rstrip())), t) for s, e, t in pieces]
+
+
+def split_page(
+    text: str,
+    pdf_id: int,
+    page: int,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> Iterator[TextChunk]:
+    """페이지 텍스트 하나 → 청크들"""
+    units = []  # (시작, 끝, 토큰 수)
+    for s, e in split_sentences(text):
+        tokens = count_tokens(text[s:e])
+        units.extend(_split_long(text, s, e, max_tokens) if tokens > max_tokens else [(s, e, tokens)])
+
+    window: List[Tuple[int, int, int]] = []
+    window_tokens = 0
+    fresh = 0  # window 중 앞 청크와 겹치지 않는 새 문장 수
+
+    def _emit():
+        s, e = window[0][0], window[-1][1]
+        return TextChunk(" ".join(text[s:e].split()), pdf_id, page, s, e)
+
+    for unit in units:
+        if window and window_tokens + unit[2] > max_tokens:
+            if fresh:
+                yield _emit()
+            # 끝에서부터 overlap_tokens 이내 문장만 남김 (전부 남기면 진행이 안 되므로 최소 하나는 버림)
+            keep, kept_tokens = [], 0
+            for u in reversed(window[1:]):
+                if kept_tokens + u[2] > overlap_tokens or kept_tokens + u[2] + unit[2] > max_tokens:
+                    break
+                keep.insert(0, u)
+                kept_tokens += u[2]
+            window, window_tokens, fresh = keep, kept_tokens, 0
+        window.append(unit)
+        window_tokens += unit[2]
+        fresh += 1
+    if window and fresh:
+        yield _emit()
+
+
+def split_pages(
+    pages: Iterable[Tuple[int, str]],
+    pdf_id: int,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> Iterator[TextChunk]:
+    """(페이지 번호, 텍스트) 스트림 → 청크 스트림 (pdf_utils.iter_page_texts 와 함께 사용)"""
+    for page, text in pages:
+        yield from split_page(text, pdf_id, page, max_tokens, overlap_tokens)
+
 
 def split_text_into_chunks(text: str, max_chunk_size=300, overlap=50):
     """
@@ -0,0 +1,370 @@
+# backend/services/vector_index_manager.py
+"""
+사용자별 벡터 인덱스 관리
+
+기존에는 업로드할 때마다 vector_db/faiss.index 하나를 새로 만들어 덮어써서
+마지막 업로드만 남고 모든 사용자가 같은 인덱스를 검색했다.
+
+- 사용자마다 인덱스 하나: vector_db/users/{user_id}/index.faiss (flat/HNSW 는 IndexIDMap2, IVF 는 자체 id)
+- 벡터 id = (pdf_id << CHUNK_BITS) | 청크 번호 → pdf_id 단위로 추가/삭제/검색 범위 지정
+- 청크 원문/메타(페이지, 글자 위치)는 pdf별 mmap 저장소: vector_db/users/{user_id}/chunks/{pdf_id}.cstore
+  (utils/chunk_store.py, 예전 {pdf_id}.pkl 도 읽음)
+- 노트 추가 시 기존 벡터는 그대로 두고 해당 pdf 것만 add (재임베딩/재구성 없음)
+- 폴더 필터는 검색 시점에 DB에서 pdf_id 목록으로 바꿔서 전달 (노트를 다른 폴더로 옮겨도 인덱스 수정 불필요)
+- 검색은 상주 인덱스(services/vector_index_registry.py)로, 추가/삭제는 디스크 사본을 고쳐 쓴 뒤 세대를 올림
+- 인덱스 종류(flat/IVF/HNSW/IVF-PQ)는 코퍼스 크기로 자동 선택 (services/ann_index.py)
+  종류가 바뀌어야 하거나 HNSW에서 지워야 할 때는 pdf별 원본 벡터(vectors/{pdf_id}.npy)로 재구성
+- 키워드 검색용 BM25 역색인도 pdf별로 같이 저장: lexical/{pdf_id}.npz (services/lexical_index.py)
+"""
+import os
+import pickle
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from services import ann_index, vector_index_registry
+from services.embedding_service import VECTOR_DIR
+from services.lexical_index import LexicalIndex, bm25_search
+from utils.chunk_store import ChunkMeta, ChunkStore, chunk_count, write_chunk_store
+
+USER_INDEX_DIR = os.path.join(VECTOR_DIR, "users")
+CHUNK_BITS = 20  # pdf 하나당 청크 최대 약 100만 개
+_CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+_user_locks: Dict[int, threading.Lock] = {}
+_user_locks_guard = threading.Lock()
+
+
+def make_chunk_id(pdf_id: int, chunk_no: int) -> int:
+    return (int(pdf_id) << CHUNK_BITS) | int(chunk_no)
+
+
+def split_chunk_id(chunk_id: int) -> tuple:
+    return int(chunk_id) >> CHUNK_BITS, int(chunk_id) & _CHUNK_MASK
+
+
+def _user_lock(user_id: int) -> threading.Lock:
+    with _user_locks_guard:
+        return _user_locks.setdefault(user_id, threading.Lock())
+
+
+def _user_dir(user_id: int) -> str:
+    return os.path.join(USER_INDEX_DIR, str(user_id))
+
+
+def index_path(user_id: int) -> str:
+    return os.path.join(_user_dir(user_id), "index.faiss")
+
+
+def _chunks_path(user_id: int, pdf_id: int) -> str:
+    return os.path.join(_user_dir(user_id), "chunks", f"{pdf_id}.cstore")
+
+
+def _legacy_chunks_path(user_id: int, pdf_id: int) -> str:
+    return os.path.join(_user_dir(user_id), "chunks", f"{pdf_id}.pkl")
+
+
+def _has_chunks(user_id: int, pdf_id: int) -> bool:
+    return os.path.exists(_chunks_path(user_id, pdf_id)) or os.path.exists(_legacy_chunks_path(user_id, pdf_id))
+
+
+def _remove_chunks(user_id: int, pdf_id: int):
+    _remove_file(_chunks_path(user_id, pdf_id))
+    _remove_file(_legacy_chunks_path(user_id, pdf_id))
+    _remove_file(_lexical_path(user_id, pdf_id))
+
+
+def _lexical_path(user_id: int, pdf_id: int) -> str:
+    return os.path.join(_user_dir(user_id), "lexical", f"{pdf_id}.npz")
+
+
+def _vectors_path(user_id: int, pdf_id: int) -> str:
+    return os.path.join(_user_dir(user_id), "vectors", f"{pdf_id}.npy")
+
+
+def _pdf_range(pdf_id: int):
+    import faiss
+    return faiss.IDSelectorRange(make_chunk_id(pdf_id, 0), make_chunk_id(pdf_id + 1, 0))
+
+
+def _read_index(user_id: int):
+    """쓰기용 사본 (검색 중인 상주 인덱스는 건드리지 않음)"""
+    import faiss
+    path = index_path(user_id)
+    return faiss.read_index(path) if os.path.exists(path) else None
+
+
+def _write_index(user_id: int, index):
+    import faiss
+    path = index_path(user_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, path)
+    vector_index_registry.bump_generation(path)
+
+
+def _write_chunks(user_id: int, pdf_id: int, chunks: List[str], metas: Optional[List[ChunkMeta]] = None):
+    if metas is None:
+        metas = [ChunkMeta(pdf_id=pdf_id)] * len(chunks)
+    write_chunk_store(_chunks_path(user_id, pdf_id), chunks, metas)
+    _remove_file(_legacy_chunks_path(user_id, pdf_id))
+    LexicalIndex.build(chunks).save(_lexical_path(user_id, pdf_id))
+
+
+def _write_vectors(user_id: int, pdf_id: int, arr: np.ndarray):
+    path = _vectors_path(user_id, pdf_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, arr)
+    os.replace(tmp_path, path)
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def indexed_pdf_ids(user_id: int) -> List[int]:
+    chunks_dir = os.path.join(_user_dir(user_id), "chunks")
+    if not os.path.isdir(chunks_dir):
+        return []
+    return sorted({
+        int(name.rsplit(".", 1)[0]) for name in os.listdir(chunks_dir)
+        if name.endswith((".cstore", ".pkl")) and name.rsplit(".", 1)[0].isdigit()
+    })
+
+
+def _load_vectors(user_id: int, pdf_id: int, index=None) -> Optional[np.ndarray]:
+    """재구성용 원본 벡터 (예전 인덱스라 .npy가 없으면 flat/hnsw 인덱스에서 복원)"""
+    try:
+        return np.load(_vectors_path(user_id, pdf_id))
+    except FileNotFoundError:
+        pass
+    if index is None or ann_index.index_kind(index) not in ("flat", "hnsw"):
+        return None
+    count = count_chunks(user_id, pdf_id)
+    try:
+        return np.vstack([index.reconstruct(make_chunk_id(pdf_id, i)) for i in range(count)]) if count else None
+    except RuntimeError:
+        return None
+
+
+def _rebuild_locked(user_id: int, index=None):
+    """pdf별 원본 벡터를 모아서 인덱스를 새로 만듦 (사용자 락 안에서 호출)"""
+    parts, ids = [], []
+    for pdf_id in indexed_pdf_ids(user_id):
+        vectors = _load_vectors(user_id, pdf_id, index)
+        if vectors is None:
+            print(f"⚠️ 원본 벡터 없음 → 재구성에서 제외: user={user_id}, pdf_id={pdf_id}")
+            continue
+        parts.append(vectors)
+        ids.append(np.arange(make_chunk_id(pdf_id, 0), make_chunk_id(pdf_id, len(vectors)), dtype="int64"))
+    if not parts:
+        _remove_file(index_path(user_id))
+        vector_index_registry.bump_generation(index_path(user_id))
+        return None
+
+    new_index = ann_index.build_index(np.vstack(parts), np.concatenate(ids))
+    _write_index(user_id, new_index)
+    print(f"🔁 벡터 인덱스 재구성: user={user_id}, {ann_index.index_kind(new_index)}, {new_index.ntotal}개")
+    return new_index
+
+
+def rebuild_index(user_id: int):
+    """저장된 원본 벡터로 사용자 인덱스 재구성 (VECTOR_INDEX_KIND/AUTO 설정을 바꾼 뒤 적용할 때)"""
+    with _user_lock(user_id):
+        return _rebuild_locked(user_id, _read_index(user_id))
+
+
+def count_chunks(user_id: int, pdf_id: int) -> int:
+    try:
+        return chunk_count(_chunks_path(user_id, pdf_id))
+    except FileNotFoundError:
+        return len(load_chunks(user_id, pdf_id))
+
+
+def load_chunks(user_id: int, pdf_id: int) -> Sequence[str]:
+    """청크 저장소 (len() / [i] 로 조회, 전체를 읽지 않음). 예전 pkl 이면 리스트"""
+    try:
+        return ChunkStore(_chunks_path(user_id, pdf_id))
+    except FileNotFoundError:
+        pass
+    try:
+        with open(_legacy_chunks_path(user_id, pdf_id), "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def load_lexical(user_id: int, pdf_id: int) -> LexicalIndex:
+    """BM25 역색인 (예전에 저장돼서 파일이 없으면 청크 원문으로 메모리에서 만듦)"""
+    try:
+        return LexicalIndex.load(_lexical_path(user_id, pdf_id))
+    except FileNotFoundError:
+        return LexicalIndex.build(list(load_chunks(user_id, pdf_id)))
+
+
+# ✅ 추가 (같은 pdf를 다시 넣으면 기존 벡터를 교체 → ingest 재시도에도 안전)
+def add_document(
+    user_id: int, pdf_id: int, embeddings, chunks: List[str], metas: Optional[List[ChunkMeta]] = None
+) -> int:
+    arr = np.asarray(embeddings, dtype="float32")
+    if arr.ndim != 2 or len(arr) != len(chunks):
+        raise ValueError("임베딩 개수와 청크 개수가 다릅니다.")
+    if not len(arr):
+        return 0
+    ids = np.array([make_chunk_id(pdf_id, i) for i in range(len(chunks))], dtype="int64")
+
+    with _user_lock(user_id):
+        index = _read_index(user_id)
+        if index is not None and index.d != arr.shape[1]:
+            raise ValueError(f"임베딩 차원이 기존 인덱스와 다릅니다. ({arr.shape[1]} != {index.d})")
+        replacing = _has_chunks(user_id, pdf_id)
+        _write_vectors(user_id, pdf_id, arr)
+        _write_chunks(user_id, pdf_id, chunks, metas)
+
+        if index is None:
+            index = ann_index.build_index(arr, ids)
+            _write_index(user_id, index)
+        elif replacing and not ann_index.supports_remove(index):
+            index = _rebuild_locked(user_id, index)  # HNSW 등: 기존 벡터를 뺄 수 없으니 원본 벡터로 재구성
+        else:
+            if replacing:
+                index.remove_ids(_pdf_range(pdf_id))
+            if ann_index.needs_rebuild(index, index.ntotal + len(arr)):
+                index = _rebuild_locked(user_id, index)
+            else:
+                index.add_with_ids(arr, ids)
+                _write_index(user_id, index)
+
+    print(f"🗂️ 벡터 인덱스 추가: user={user_id}, pdf_id={pdf_id}, {len(chunks)}개 (전체 {index.ntotal}개)")
+    return len(chunks)
+
+
+# ✅ 삭제 (노트/폴더 삭제 시)
+def remove_document(user_id: int, pdf_id: int) -> int:
+    with _user_lock(user_id):
+        index = _read_index(user_id)
+        had_chunks = _has_chunks(user_id, pdf_id)
+        removed = 0
+        if index is not None and not ann_index.supports_remove(index):
+            if had_chunks:
+                removed = count_chunks(user_id, pdf_id)
+                _remove_chunks(user_id, pdf_id)
+                _rebuild_locked(user_id, index)
+        elif index is not None:
+            removed = index.remove_ids(_pdf_range(pdf_id))
+            if removed and ann_index.needs_rebuild(index, index.ntotal):
+                _remove_chunks(user_id, pdf_id)
+                _rebuild_locked(user_id, index)
+            elif removed:
+                _write_index(user_id, index)
+        _remove_chunks(user_id, pdf_id)
+        _remove_file(_vectors_path(user_id, pdf_id))
+
+    if removed:
+        print(f"🗑️ 벡터 인덱스 삭제: user={user_id}, pdf_id={pdf_id}, {removed}개")
+    return removed
+
+
+def remove_documents(user_id: int, pdf_ids: List[int]):
+    for pdf_id in pdf_ids:
+        remove_document(user_id, pdf_id)
+
+
+# ✅ 검색
+def search(
+    user_id: int,
+    query_embedding,
+    top_k: int = 3,
+    pdf_ids: Optional[List[int]] = None,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+) -> List[dict]:
+    """
+    사용자 인덱스에서 검색 (pdf_ids를 주면 그 노트들 안에서만)
+    nprobe(IVF) / ef_search(HNSW): 크게 줄수록 재현율↑ 속도↓ (기본값은 ann_index.NPROBE / EF_SEARCH)
+
+    Returns:
+        [{"pdf_id", "chunk_no", "text", "page", "char_start", "char_end", "distance"}, ...] (가까운 순)
+        page 를 모르면 -1 (메타 없이 저장된 예전 청크)
+    """
+    import faiss
+
+    if pdf_ids is not None and not pdf_ids:
+        return []
+    resident = vector_index_registry.get_index(index_path(user_id))
+    if resident is None or resident.index.ntotal == 0:
+        return []
+    index = resident.index
+
+    selector = None
+    if pdf_ids is not None:
+        # 청크 개수(저장소 헤더)로 해당 pdf의 id 범위를 만들어서 그 안에서만 검색
+        ids = np.concatenate([
+            np.arange(make_chunk_id(p, 0), make_chunk_id(p, 0) + count_chunks(user_id, p), dtype="int64")
+            for p in pdf_ids
+        ])
+        if not len(ids):
+            return []
+        selector = faiss.IDSelectorBatch(ids)
+    params = ann_index.search_params(index, selector, nprobe=nprobe, ef_search=ef_search)
+
+    query = np.asarray([query_embedding], dtype="float32")
+    distances, labels = index.search(query, top_k, params=params)
+
+    results = []
+    for distance, label in zip(distances[0], labels[0]):
+        if label < 0:
+            continue
+        result = _result(resident, user_id, *split_chunk_id(label), distance=float(distance))
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def _result(resident, user_id: int, pdf_id: int, chunk_no: int, **score) -> Optional[dict]:
+    # 청크/역색인 파일은 인덱스보다 먼저 쓰므로 같은 세대 동안은 캐시해도 어긋나지 않음
+    chunks = resident.cached(("chunks", pdf_id), lambda: load_chunks(user_id, pdf_id))
+    if chunk_no >= len(chunks):
+        return None
+    meta = chunks.meta(chunk_no) if isinstance(chunks, ChunkStore) else ChunkMeta(pdf_id=pdf_id)
+    return {
+        "pdf_id": pdf_id,
+        "chunk_no": chunk_no,
+        "text": chunks[chunk_no],
+        "page": meta.page,
+        "char_start": meta.char_start,
+        "char_end": meta.char_end,
+        **score,
+    }
+
+
+def lexical_search(user_id: int, query: str, top_k: int = 3, pdf_ids: Optional[List[int]] = None) -> List[dict]:
+    """
+    BM25 키워드 검색 (pdf_ids를 주면 그 노트들 안에서만, 점수는 범위 안 노트들을 한 코퍼스로 보고 계산)
+
+    Returns:
+        search() 와 같은 형식, distance 대신 score (높은 순)
+    """
+    if pdf_ids is not None and not pdf_ids:
+        return []
+    resident = vector_index_registry.get_index(index_path(user_id))
+    if resident is None:
+        return []
+
+    scope = indexed_pdf_ids(user_id) if pdf_ids is None else pdf_ids
+    indexes = {
+        pdf_id: resident.cached(("lexical", pdf_id), lambda p=pdf_id: load_lexical(user_id, p))
+        for pdf_id in scope
+    }
+    results = []
+    for pdf_id, chunk_no, score in bm25_search(indexes, query, top_k):
+        result = _result(resident, user_id, pdf_id, chunk_no, score=score)
+        if result is not None:
+            results.append(result)
+    return results
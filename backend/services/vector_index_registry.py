@@ -0,0 +1,179 @@
+# backend/services/vector_index_registry.py
+"""
+프로세스 상주 FAISS 인덱스 레지스트리
+
+채팅 요청마다 faiss.read_index(디스크 읽기 + 역직렬화)를 하지 않도록 인덱스를 한 번 읽어서 메모리에 둔다.
+
+- 세대(generation): 인덱스를 쓰는 쪽이 옆 파일(*.gen)의 숫자를 올리면, 다음 검색 때 다시 읽음
+  (세대 파일이 없으면 인덱스 파일의 mtime/크기를 세대로 사용)
+- VECTOR_INDEX_MMAP=1 이면 faiss IO_FLAG_MMAP 으로 읽음 → 벡터는 페이지 캐시에 두고 힙에 복사하지 않음
+  (os.replace 로 교체된 파일도 기존 매핑은 예전 inode를 계속 보므로 검색 중인 요청은 안전)
+- 다시 읽을 때는 새 엔트리를 만들어서 통째로 바꿔 끼움 → 검색 중인 스레드는 예전 인덱스로 끝까지 진행
+  (faiss CPU 인덱스의 search 는 읽기 전용이라 여러 스레드가 동시에 호출해도 됨)
+- 상주 개수 상한(VECTOR_INDEX_MAX_RESIDENT)을 넘으면 오래 안 쓴 것부터 내림
+- 로드 시간/크기/적중 횟수는 stats() 로 확인 (/debug/vector-index)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+MMAP = os.getenv("VECTOR_INDEX_MMAP", "0").lower() in ("1", "true", "yes")
+MAX_RESIDENT = int(os.getenv("VECTOR_INDEX_MAX_RESIDENT", "64"))
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, ResidentIndex]" = OrderedDict()
+_load_locks: Dict[str, threading.Lock] = {}
+_stats = {"hits": 0, "loads": 0, "reloads": 0, "evictions": 0, "load_seconds": 0.0}
+
+
+class ResidentIndex:
+    """읽기 전용으로 공유되는 인덱스 하나 (세대가 바뀌면 새 객체로 교체)"""
+
+    def __init__(self, path: str, generation, index, payload: Any, load_seconds: float, mmap: bool):
+        self.path = path
+        self.generation = generation
+        self.index = index
+        self.payload = payload  # 로더가 같이 돌려준 메타 (예: 전역 인덱스의 청크 목록)
+        self.load_seconds = load_seconds
+        self.mmap = mmap
+        self.bytes = os.path.getsize(path) if os.path.exists(path) else 0
+        self.loaded_at = time.time()
+        self._cache: Dict[Any, Any] = {}
+        self._cache_lock = threading.Lock()
+
+    def cached(self, key, loader: Callable[[], Any]):
+        """이 세대 동안만 유효한 부가 데이터 (pdf별 청크 목록 등)"""
+        value = self._cache.get(key)
+        if value is None:
+            with self._cache_lock:
+                value = self._cache.get(key)
+                if value is None:
+                    value = loader()
+                    self._cache[key] = value
+        return value
+
+
+def generation_path(index_path: str) -> str:
+    return f"{index_path}.gen"
+
+
+def read_generation(index_path: str):
+    """세대 파일 숫자 (없으면 인덱스 파일 mtime/크기), 인덱스 파일이 없으면 None"""
+    try:
+        st = os.stat(index_path)
+    except FileNotFoundError:
+        return None
+    try:
+        with open(generation_path(index_path), "r") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return (st.st_mtime_ns, st.st_size)
+
+
+def bump_generation(index_path: str) -> int:
+    """인덱스 파일을 새로 쓴 뒤 호출 → 모든 프로세스의 레지스트리가 다음 검색 때 다시 읽음"""
+    try:
+        with open(generation_path(index_path), "r") as f:
+            generation = int(f.read().strip() or 0) + 1
+    except (FileNotFoundError, ValueError):
+        generation = 1
+    path = generation_path(index_path)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(generation))
+    os.replace(tmp_path, path)
+    return generation
+
+
+def _read_faiss(path: str) -> Tuple[Any, None]:
+    import faiss
+    flags = faiss.IO_FLAG_MMAP if MMAP else 0
+    return faiss.read_index(path, flags), None
+
+
+def get_index(path: str, loader: Callable[[str], Tuple[Any, Any]] = _read_faiss) -> Optional[ResidentIndex]:
+    """
+    상주 인덱스 반환 (없거나 세대가 바뀌었으면 읽어서 교체), 파일이 없으면 None
+
+    loader(path) → (index, payload): 기본은 faiss.read_index
+    """
+    path = os.path.abspath(path)
+    generation = read_generation(path)
+    if generation is None:
+        drop(path)
+        return None
+
+    with _lock:
+        entry = _entries.get(path)
+        if entry is not None and entry.generation == generation:
+            _entries.move_to_end(path)
+            _stats["hits"] += 1
+            return entry
+        load_lock = _load_locks.setdefault(path, threading.Lock())
+
+    # 같은 인덱스를 여러 스레드가 동시에 읽지 않도록 (다른 인덱스는 병렬로 로드)
+    with load_lock:
+        with _lock:
+            entry = _entries.get(path)
+            if entry is not None and entry.generation == generation:
+                _stats["hits"] += 1
+                return entry
+        reloading = entry is not None
+
+        started = time.perf_counter()
+        index, payload = loader(path)
+        elapsed = time.perf_counter() - started
+        entry = ResidentIndex(path, generation, index, payload, elapsed, MMAP and loader is _read_faiss)
+
+        with _lock:
+            _entries[path] = entry
+            _entries.move_to_end(path)
+            _stats["reloads" if reloading else "loads"] += 1
+            _stats["load_seconds"] += elapsed
+            while len(_entries) > MAX_RESIDENT:
+                _entries.popitem(last=False)
+                _stats["evictions"] += 1
+
+    print(f"📚 벡터 인덱스 {'다시 ' if reloading else ''}로드: {path} ({getattr(index, 'ntotal', '?')}개, {elapsed * 1000:.1f}ms)")
+    return entry
+
+
+def drop(path: str):
+    with _lock:
+        _entries.pop(os.path.abspath(path), None)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def stats() -> dict:
+    with _lock:
+        entries = list(_entries.values())
+        snapshot = dict(_stats)
+    snapshot["load_seconds"] = round(snapshot["load_seconds"], 4)
+    snapshot.update({
+        "mmap": MMAP,
+        "max_resident": MAX_RESIDENT,
+        "resident": len(entries),
+        "vectors": sum(getattr(e.index, "ntotal", 0) for e in entries),
+        # mmap 인덱스는 벡터가 페이지 캐시에 있으므로 힙 사용량에서 제외
+        "heap_bytes": sum(e.bytes for e in entries if not e.mmap),
+        "mapped_bytes": sum(e.bytes for e in entries if e.mmap),
+        "indexes": [
+            {
+                "path": e.path,
+                "generation": e.generation if isinstance(e.generation, int) else None,
+                "vectors": getattr(e.index, "ntotal", None),
+                "bytes": e.bytes,
+                "mmap": e.mmap,
+                "load_ms": round(e.load_seconds * 1000, 2),
+                "loaded_at": e.loaded_at,
+            }
+            for e in entries
+        ],
+    })
+    return snapshot
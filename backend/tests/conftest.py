@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# backend 디렉터리 밖에서 pytest 를 실행해도 services/utils 를 import 할 수 있게
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
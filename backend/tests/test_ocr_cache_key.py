@@ -0,0 +1,43 @@
+# backend/tests/test_ocr_cache_key.py
+import fitz  # PyMuPDF
+
+from services.ocr_service import page_cache_key
+
+
+def _form_xobject_pdf(count: int, nested: bool = False):
+    """show_pdf_page 로 만든 페이지들 (콘텐츠 스트림이 전부 "q /fzFrm0 Do Q")"""
+    src = fitz.open()
+    for i in range(count):
+        page = src.new_page(width=300, height=300)
+        for j in range(25):  # 손필기 흉내
+            page.draw_line((10 + j * 5, 10 + i * 40), (200 - j * 3, 250 - i * 30))
+    doc = fitz.open()
+    for i in range(count):
+        page = doc.new_page(width=300, height=300)
+        page.show_pdf_page(page.rect, src, i)
+    if not nested:
+        return doc
+    outer = fitz.open()
+    for i in range(count):
+        page = outer.new_page(width=300, height=300)
+        page.show_pdf_page(page.rect, doc, i)
+    return outer
+
+
+def test_form_xobject_pages_get_different_keys():
+    doc = _form_xobject_pdf(3)
+    assert {doc[i].read_contents() for i in range(3)} == {doc[0].read_contents()}
+    keys = {page_cache_key(doc[i], 2.0, "korean") for i in range(3)}
+    assert len(keys) == 3
+
+
+def test_nested_form_xobject_pages_get_different_keys():
+    doc = _form_xobject_pdf(2, nested=True)
+    assert page_cache_key(doc[0], 2.0, "korean") != page_cache_key(doc[1], 2.0, "korean")
+
+
+def test_same_page_same_key():
+    a = _form_xobject_pdf(2)
+    b = _form_xobject_pdf(2)
+    assert page_cache_key(a[1], 2.0, "korean") == page_cache_key(b[1], 2.0, "korean")
+    assert page_cache_key(a[1], 2.0, "korean") != page_cache_key(a[1], 3.0, "korean")
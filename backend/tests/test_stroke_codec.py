@@ -0,0 +1,151 @@
+# backend/tests/test_stroke_codec.py
+import pytest
+
+from utils.stroke_codec import (
+    COORD_SCALE, StrokeCodecError, _HEADER, decode_strokes, encode_strokes, iter_strokes,
+)
+
+COORD_TOL = 0.5 / COORD_SCALE + 1e-9
+PRESSURE_TOL = 0.5 / 255 + 1e-4
+
+
+def _assert_same(original: list, decoded: list):
+    """좌표/필압은 양자화 오차 안에서, 나머지 키는 정확히 같아야 함"""
+    assert len(decoded) == len(original)
+    for src, dst in zip(original, decoded):
+        assert set(dst) == set(src)
+        assert len(dst["points"]) == len(src["points"])
+        for a, b in zip(src["points"], dst["points"]):
+            assert set(b) == set(a)
+            assert abs(a["x"] - b["x"]) <= COORD_TOL
+            assert abs(a["y"] - b["y"]) <= COORD_TOL
+            if "pressure" in a:
+                assert abs(min(max(a["pressure"], 0.0), 1.0) - b["pressure"]) <= PRESSURE_TOL
+        for key in set(src) - {"points"}:
+            assert dst[key] == src[key]
+
+
+def _round_trip(lines: list, **kwargs) -> bytes:
+    packed = encode_strokes(lines, **kwargs)
+    decoded = decode_strokes(packed)
+    _assert_same(lines, decoded)
+    assert encode_strokes(decoded, **kwargs) == packed  # 다시 인코딩하면 바이트까지 같음
+    return packed
+
+
+def _line(n=50, x0=100.0, y0=200.0, step=1.37, **fields):
+    points = [{"x": x0 + i * step, "y": y0 + (i % 7) * 0.61} for i in range(n)]
+    return {"points": points, **fields}
+
+
+@pytest.mark.parametrize("compress", [None, False, True])
+def test_round_trip(compress):
+    lines = [
+        _line(color="ff000000", strokeWidth=3.0, penType="pen"),
+        _line(80, color="ff2196f3", strokeWidth=4.5, penType="highlighter", opacity=0.4, tool={"id": 3}),
+    ]
+    for i, point in enumerate(lines[1]["points"]):
+        point["pressure"] = (i % 10) / 9
+    _round_trip(lines, compress=compress)
+
+
+def test_missing_fields_stay_missing():
+    lines = [_line(5), _line(3, color="ff000000")]
+    decoded = decode_strokes(_round_trip(lines))
+    assert "strokeWidth" not in decoded[0] and "penType" not in decoded[0] and "color" not in decoded[0]
+    assert all("pressure" not in p for p in decoded[0]["points"])
+
+
+def test_partial_pressure():
+    line = _line(20, strokeWidth=2.0)
+    for point in line["points"][::3]:
+        point["pressure"] = 0.25
+    decoded = decode_strokes(_round_trip([line]))
+    assert [("pressure" in p) for p in decoded[0]["points"]] == [("pressure" in p) for p in line["points"]]
+    stroke = next(iter_strokes(encode_strokes([line])))
+    assert stroke.pressure is not None and stroke.pressure[1] != stroke.pressure[1]  # 없는 점은 NaN
+
+
+def test_pressure_is_clipped():
+    line = _line(3)
+    for point, p in zip(line["points"], (-0.5, 0.5, 1.7)):
+        point["pressure"] = p
+    decoded = decode_strokes(encode_strokes([line]))
+    assert [p["pressure"] for p in decoded[0]["points"]] == [0.0, 0.502, 1.0]
+
+
+def test_wide_deltas_use_int32():
+    line = _line(4, color="ff000000")
+    line["points"][2] = {"x": 5000.25, "y": -3000.5}  # 이전 점과 2048px 이상 차이 → int16 범위 밖
+    packed = _round_trip([line], compress=False)
+    narrow = encode_strokes([_line(4, color="ff000000")], compress=False)
+    assert len(packed) - len(narrow) == 3 * 2 * 2  # 차이 3개 × (dx, dy) × 2바이트 늘어남
+
+
+def test_empty_input_and_strokes():
+    assert decode_strokes(encode_strokes([])) == []
+    lines = [{"points": []}, {"points": [], "color": "ff000000", "strokeWidth": 2.0}, _line(1, penType="pen")]
+    _round_trip(lines)
+
+
+@pytest.mark.parametrize("color", ["FF000000", "00ff0000", "#ff0000", "red", "1ffffffff", None, 4278190080])
+def test_non_canonical_colors_are_kept(color):
+    line = _line(5, color=color, strokeWidth=3.0)
+    decoded = decode_strokes(_round_trip([line]))
+    assert decoded[0]["color"] == color
+
+
+@pytest.mark.parametrize("width", [3.14159, 1e-7, "3", None, True])
+def test_unusual_stroke_width_is_kept(width):
+    decoded = decode_strokes(_round_trip([_line(3, strokeWidth=width)]))
+    assert decoded[0]["strokeWidth"] == width and type(decoded[0]["strokeWidth"]) is type(width)
+
+
+def test_unusual_pen_type_is_kept():
+    lines = [_line(3, penType="가" * 100), _line(3, penType=None), _line(3, penType=7)]
+    _round_trip(lines)
+
+
+def test_list_points():
+    decoded = decode_strokes(encode_strokes([{"points": [[1.0, 2.0], [3.0, 4.0, 0.5]]}]))
+    assert decoded == [{"points": [{"x": 1.0, "y": 2.0}, {"x": 3.0, "y": 4.0, "pressure": 0.502}]}]
+
+
+def test_version_1_data_is_readable():
+    packed = bytearray(encode_strokes([_line(3, color="ff000000", strokeWidth=2.5, penType="brush")]))
+    packed[3] = 1  # 헤더 version
+    assert decode_strokes(bytes(packed))[0]["penType"] == "brush"
+
+
+def _corrupt_inputs():
+    good = encode_strokes([_line(40, color="ff000000", strokeWidth=2.0)], compress=False)
+    zipped = encode_strokes([_line(40)], compress=True)
+    with_extra = encode_strokes([_line(3, opacity=1)], compress=False)
+    magic, version, flags, scale, count = _HEADER.unpack_from(good)
+    return {
+        "empty": b"",
+        "short": good[:5],
+        "magic": b"XYZ" + good[3:],
+        "version": _HEADER.pack(magic, 99, flags, scale, count) + good[_HEADER.size:],
+        "scale": _HEADER.pack(magic, version, flags, 0, count) + good[_HEADER.size:],
+        "truncated": good[:-3],
+        "trailing": good + b"\x00",
+        "count": _HEADER.pack(magic, version, flags, scale, count + 1) + good[_HEADER.size:],
+        "zlib": zipped[:_HEADER.size] + b"not zlib",
+        "extra_json": with_extra.replace(b'{"opacity":1}', b'{"opacity":1x'),
+    }
+
+
+@pytest.mark.parametrize("name", sorted(_corrupt_inputs()))
+def test_corrupt_input_raises(name):
+    with pytest.raises(StrokeCodecError):
+        decode_strokes(_corrupt_inputs()[name])
+
+
+def test_bad_strokes_raise():
+    with pytest.raises(StrokeCodecError):
+        encode_strokes([{"points": [{"x": 1.0}]}])
+    with pytest.raises(StrokeCodecError):
+        encode_strokes([{"points": [{"x": 1e12, "y": 0.0}]}])
+    with pytest.raises(StrokeCodecError):
+        encode_strokes([{"points": [{"x": 1.0, "y": 1.0}], "opacity": object()}])  # JSON 으로 못 바꾸는 extra
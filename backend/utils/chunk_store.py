@@ -0,0 +1,111 @@
+# backend/utils/chunk_store.py
+"""
+청크 원문 저장 포맷 (메모리 매핑, pickle 대체)
+
+검색 결과 top_k개를 글로 바꾸려고 청크 목록 전체를 언피클하지 않도록
+고정 길이 레코드(오프셋 + 메타) 배열과 UTF-8 본문을 한 파일에 담고 mmap 으로 연다.
+i번째 청크 조회 = 레코드 1개 + 본문 슬라이스 1개 → O(1), 파일 전체를 읽지 않음.
+
+포맷 (little-endian):
+    헤더 16바이트: magic b"CSTR", version uint16, reserved uint16, count uint32, reserved uint32
+    레코드 count × 32바이트: offset uint64, length uint32, page int32 (1부터, 모르면 -1),
+                            char_start uint32, char_end uint32 (해당 페이지 텍스트 안 위치), pdf_id int64
+    본문: 모든 청크의 UTF-8 바이트를 이어 붙인 것
+"""
+import mmap
+import os
+import struct
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+MAGIC = b"CSTR"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+RECORD_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("length", "<u4"),
+    ("page", "<i4"),
+    ("char_start", "<u4"),
+    ("char_end", "<u4"),
+    ("pdf_id", "<i8"),
+])
+
+
+class ChunkMeta(NamedTuple):
+    pdf_id: int = -1
+    page: int = -1  # 1부터, 모르면 -1
+    char_start: int = 0  # 페이지 텍스트 안 위치
+    char_end: int = 0
+
+
+def write_chunk_store(path: str, texts: List[str], metas: Optional[Iterable[ChunkMeta]] = None):
+    """청크 목록 → 저장 파일 (임시 파일에 쓴 뒤 교체)"""
+    metas = list(metas) if metas is not None else [ChunkMeta()] * len(texts)
+    if len(metas) != len(texts):
+        raise ValueError("청크 개수와 메타 개수가 다릅니다.")
+
+    encoded = [t.encode("utf-8") for t in texts]
+    records = np.zeros(len(texts), dtype=RECORD_DTYPE)
+    lengths = np.fromiter((len(b) for b in encoded), dtype="<u8", count=len(encoded))
+    records["offset"] = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(encoded) else []
+    records["length"] = lengths
+    for field in ("pdf_id", "page", "char_start", "char_end"):
+        records[field] = [getattr(m, field) for m in metas]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(texts), 0))
+        f.write(records.tobytes())
+        for b in encoded:
+            f.write(b)
+    os.replace(tmp_path, path)
+
+
+def chunk_count(path: str) -> int:
+    """헤더만 읽어서 청크 개수 (매핑 없이)"""
+    with open(path, "rb") as f:
+        magic, version, _, count, _ = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"청크 저장 파일 형식이 아닙니다: {path}")
+    return count
+
+
+class ChunkStore:
+    """
+    읽기 전용 청크 저장소 (list 처럼 len() / store[i] 로 원문 조회)
+
+    파일이 os.replace 로 교체돼도 이미 연 매핑은 예전 내용을 계속 봄
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"청크 저장 파일 형식이 아닙니다: {path}")
+        self._records = np.frombuffer(self._mm, dtype=RECORD_DTYPE, count=count, offset=_HEADER.size)
+        self._blob_start = _HEADER.size + count * RECORD_DTYPE.itemsize
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self._records):
+            raise IndexError(i)
+        record = self._records[i]
+        start = self._blob_start + int(record["offset"])
+        return self._mm[start:start + int(record["length"])].decode("utf-8")
+
+    def meta(self, i: int) -> ChunkMeta:
+        record = self._records[i]
+        return ChunkMeta(int(record["pdf_id"]), int(record["page"]), int(record["char_start"]), int(record["char_end"]))
+
+    def texts(self) -> List[str]:
+        return [self[i] for i in range(len(self))]
+
+    def metas(self) -> List[ChunkMeta]:
+        return [self.meta(i) for i in range(len(self))]
@@ -0,0 +1,127 @@
+# backend/utils/image_format.py
+"""
+페이지 이미지/썸네일 출력 포맷 협상 + 인코딩
+
+- PNG/JPEG는 PyMuPDF만으로 인코딩, WebP/AVIF는 Pillow가 있을 때만 사용
+  (Pillow가 없거나 AVIF 코덱이 없으면 해당 포맷은 자동으로 후보에서 빠짐)
+- 우선순위: ?format= 쿼리 > Accept 헤더 > 기본값(PNG, 기존 클라이언트 호환)
+"""
+import os
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))  # 손실 포맷 공통 품질 (1~100)
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp", "avif": "avif"}
+_ALIASES = {"jpg": "jpeg", "image/jpg": "jpeg"}
+
+# Accept 헤더에 여러 개가 같은 q로 있을 때의 선호 순서 (작은 파일 우선)
+_PREFERENCE = ("avif", "webp", "jpeg", "png")
+
+
+def _detect_supported() -> tuple:
+    supported = ["png", "jpeg"]
+    try:
+        from PIL import features
+        if features.check("webp"):
+            supported.append("webp")
+        if features.check("avif"):
+            supported.append("avif")
+        else:
+            try:
+                import pillow_avif  # noqa: F401  (Pillow 11.2 이전 플러그인)
+                supported.append("avif")
+            except ImportError:
+                pass
+    except ImportError:
+        pass
+    return tuple(supported)
+
+
+SUPPORTED_FORMATS = _detect_supported()
+
+
+def normalize_format(fmt: Optional[str]) -> Optional[str]:
+    if not fmt:
+        return None
+    fmt = fmt.strip().lower()
+    fmt = _ALIASES.get(fmt, fmt)
+    if fmt.startswith("image/"):
+        fmt = fmt[len("image/"):]
+    return fmt if fmt in SUPPORTED_FORMATS else None
+
+
+def negotiate_format(accept: Optional[str], requested: Optional[str] = None, default: str = "png") -> str:
+    """
+    응답 이미지 포맷 결정
+    - requested(쿼리 파라미터)가 지원 포맷이면 그대로 사용
+    - Accept 헤더에 명시된 image/* 타입 중 q값이 가장 높고 지원되는 것
+      (와일드카드 */*, image/* 만 있으면 기본값)
+    """
+    fmt = normalize_format(requested)
+    if fmt:
+        return fmt
+
+    best, best_q = None, 0.0
+    for part in (accept or "").split(","):
+        fields = part.strip().split(";")
+        media = fields[0].strip().lower()
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        fmt = normalize_format(media) if media.startswith("image/") and media != "image/*" else None
+        if not fmt or q <= 0:
+            continue
+        if q > best_q or (q == best_q and _PREFERENCE.index(fmt) < _PREFERENCE.index(best)):
+            best, best_q = fmt, q
+    return best or default
+
+
+def encode_pixmap(pix, fmt: str = "png", quality: int = IMAGE_QUALITY) -> bytes:
+    """fitz.Pixmap → 지정 포맷 바이트"""
+    if fmt == "png":
+        return pix.tobytes("png")
+    if fmt == "jpeg":
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)  # JPEG는 알파 채널 불가
+        return pix.tobytes("jpg", jpg_quality=quality)
+
+    from PIL import Image
+    import io
+
+    mode = "RGBA" if pix.alpha else "RGB"
+    img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    buf = io.BytesIO()
+    if fmt == "webp":
+        img.save(buf, format="WEBP", quality=quality, method=4)
+    elif fmt == "avif":
+        img.save(buf, format="AVIF", quality=quality)
+    else:
+        raise ValueError(f"지원하지 않는 이미지 포맷: {fmt}")
+    return buf.getvalue()
+
+
+def reencode_image_bytes(data: bytes, fmt: str, quality: int = IMAGE_QUALITY) -> bytes:
+    """이미 저장된 이미지(PNG 등)를 다른 포맷으로 다시 인코딩 (썸네일 마이그레이션용)"""
+    from PIL import Image
+    import io
+
+    img = Image.open(io.BytesIO(data))
+    if fmt in ("jpeg",) and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    save_kwargs = {"quality": quality} if fmt != "png" else {"optimize": True}
+    img.save(buf, format={"jpeg": "JPEG", "webp": "WEBP", "avif": "AVIF", "png": "PNG"}[fmt], **save_kwargs)
+    return buf.getvalue()
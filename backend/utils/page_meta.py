@@ -0,0 +1,79 @@
+# backend/utils/page_meta.py
+"""
+문서 단위 페이지 메타데이터(크기/회전/텍스트 유무/이미지 수) 압축 포맷
+
+PDF를 한 번 훑어서 모든 페이지 정보를 고정 길이 레코드로 묶어 PdfNote.page_meta(BLOB)에 저장한다.
+이후 비율/크기가 필요한 곳은 fitz를 열지 않고 이 값만 읽는다.
+
+포맷: [버전 1바이트] + 페이지마다 12바이트 (little-endian)
+    width float32, height float32 (회전 적용 후 포인트 단위)
+    rotation uint8 (0/90/180/270 → 0~3), flags uint8 (bit0 = 텍스트 있음), image_count uint16
+"""
+import struct
+from typing import List, NamedTuple, Optional
+
+import fitz  # PyMuPDF
+
+FORMAT_VERSION = 1
+_RECORD = struct.Struct("<ffBBH")
+_FLAG_HAS_TEXT = 0x01
+
+
+class PageMeta(NamedTuple):
+    page_number: int
+    width: float
+    height: float
+    rotation: int
+    has_text: bool
+    image_count: int
+
+    @property
+    def aspect_ratio(self) -> Optional[float]:
+        """너비 / 높이 (PdfPage.aspect_ratio 와 같은 기준)"""
+        return round(self.width / self.height, 5) if self.height else None
+
+
+def extract_page_meta(doc: "fitz.Document") -> List[PageMeta]:
+    """열려 있는 문서에서 렌더링 없이 전 페이지 메타데이터를 한 번에 수집"""
+    metas = []
+    for index, page in enumerate(doc):
+        rect = page.rect
+        metas.append(PageMeta(
+            page_number=index + 1,
+            width=round(rect.width, 2),
+            height=round(rect.height, 2),
+            rotation=page.rotation % 360,
+            has_text=bool(page.get_text("text").strip()),
+            image_count=len(page.get_images(full=False)),
+        ))
+    return metas
+
+
+def pack_page_meta(metas: List[PageMeta]) -> bytes:
+    out = bytearray([FORMAT_VERSION])
+    for m in metas:
+        out += _RECORD.pack(
+            m.width,
+            m.height,
+            (m.rotation // 90) % 4,
+            _FLAG_HAS_TEXT if m.has_text else 0,
+            min(m.image_count, 0xFFFF),
+        )
+    return bytes(out)
+
+
+def unpack_page_meta(data: Optional[bytes]) -> Optional[List[PageMeta]]:
+    """모르는 버전이거나 깨진 값이면 None (호출자가 다시 계산)"""
+    if not data or data[0] != FORMAT_VERSION or (len(data) - 1) % _RECORD.size:
+        return None
+    return [
+        PageMeta(
+            page_number=index + 1,
+            width=round(width, 2),
+            height=round(height, 2),
+            rotation=rot * 90,
+            has_text=bool(flags & _FLAG_HAS_TEXT),
+            image_count=image_count,
+        )
+        for index, (width, height, rot, flags, image_count) in enumerate(_RECORD.iter_unpack(data[1:]))
+    ]
@@ -3,13 +3,21 @@
 import fitz  # PyMuPDF
 from fastapi import HTTPException
 
-def render_pdf_page(pdf_path: str, page_number: int) -> dict:
+from utils.image_format import encode_pixmap, IMAGE_QUALITY
+
+def render_pdf_page(
+    pdf_path: str,
+    page_number: int,
+    scale_factor: float = 2.0,
+    fmt: str = "png",
+    quality: int = IMAGE_QUALITY,
+) -> dict:
     """
     지정된 PDF 경로에서 특정 페이지를 렌더링하여 이미지 바이트와 종횡비를 반환한다.
 
     Returns:
         dict: {
-            "image_bytes": PNG 이미지 바이트,
+            "image_bytes": fmt(png/jpeg/webp/avif) 이미지 바이트,
             "aspect_ratio": 높이 / 너비
         }
     """
@@ -23,15 +31,97 @@ def render_pdf_page(pdf_path: str, page_number: int) -> dict:
         height = page.rect.height
         aspect_ratio = height / width if width != 0 else 1.0
 
-        # 비율에 따라 동적 matrix 설정 (기본 해상도 기준)
-        scale_factor = 2.0  # 필요에 따라 조절
+        # 비율에 따라 동적 matrix 설정 (기본 해상도 기준, 기본 2배)
         matrix = fitz.Matrix(scale_factor, scale_factor)
         pix = page.get_pixmap(matrix=matrix)
 
         return {
-            "image_bytes": pix.tobytes("png"),
+            "image_bytes": encode_pixmap(pix, fmt, quality),
             "aspect_ratio": round(aspect_ratio, 4),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF 렌더링 실패: {e}")
+
+
+# ---------------------------------------------------------------------------
+# 타일 렌더링 (확대 보기용 deep-zoom 피라미드)
+# - zoom 1 = 72dpi(PDF 포인트 1:1). 레벨마다 페이지를 TILE_SIZE 픽셀 격자로 나누고
+#   요청된 타일의 clip 영역만 래스터라이즈한다.
+# ---------------------------------------------------------------------------
+TILE_SIZE = 256
+ZOOM_LEVELS = (1, 2, 4, 8)
+
+
+def get_tile_grid(page_width: float, page_height: float, tile_size: int = TILE_SIZE) -> list:
+    """레벨별 전체 픽셀 크기와 타일 행/열 수"""
+    levels = []
+    for zoom in ZOOM_LEVELS:
+        width = int(round(page_width * zoom))
+        height = int(round(page_height * zoom))
+        levels.append({
+            "zoom": zoom,
+            "width": width,
+            "height": height,
+            "cols": max(1, -(-width // tile_size)),
+            "rows": max(1, -(-height // tile_size)),
+        })
+    return levels
+
+
+def render_pdf_tile(
+    pdf_path: str,
+    page_number: int,
+    zoom: int,
+    col: int,
+    row: int,
+    tile_size: int = TILE_SIZE,
+    fmt: str = "png",
+    quality: int = IMAGE_QUALITY,
+) -> dict:
+    """
+    페이지의 (col, row) 타일 하나만 렌더링한다. 가장자리 타일은 페이지 경계에서 잘린다.
+
+    Returns:
+        dict: {
+            "image_bytes": fmt 이미지 바이트,
+            "width": 타일 픽셀 너비,
+            "height": 타일 픽셀 높이
+        }
+    """
+    if zoom not in ZOOM_LEVELS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 zoom 입니다. {list(ZOOM_LEVELS)} 중 하나를 사용하세요.")
+    if col < 0 or row < 0:
+        raise HTTPException(status_code=400, detail="Invalid tile index")
+
+    try:
+        with fitz.open(pdf_path) as doc:
+            if page_number < 1 or page_number > doc.page_count:
+                raise HTTPException(status_code=400, detail="Invalid page number")
+            page = doc.load_page(page_number - 1)
+            rect = page.rect
+
+            # 타일 격자(픽셀) → 페이지 좌표(포인트)
+            step = tile_size / zoom
+            clip = fitz.Rect(
+                rect.x0 + col * step,
+                rect.y0 + row * step,
+                min(rect.x0 + (col + 1) * step, rect.x1),
+                min(rect.y0 + (row + 1) * step, rect.y1),
+            )
+            if clip.is_empty:
+                raise HTTPException(status_code=400, detail="Invalid tile index")
+
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, alpha=False)
+            return {
+                "image_bytes": encode_pixmap(pix, fmt, quality),
+                "width": pix.width,
+                "height": pix.height,
+            }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF 타일 렌더링 실패: {e}")
@@ -0,0 +1,157 @@
+# backend/utils/render_cache.py
+"""
+렌더링된 페이지 이미지 디스크 캐시 (content-addressed + 용량 제한 LRU)
+
+- 키: PDF 파일 내용 해시 + 페이지 + 배율 + 포맷 → sha256
+  (같은 파일이면 노트가 달라도 같은 키, 파일이 바뀌면 자동으로 다른 키)
+- 키 자체가 이미지 내용을 결정하므로 그대로 강한 ETag로 쓴다.
+- 조회 시 파일 mtime을 갱신하고, 총 용량이 상한을 넘으면 mtime이 오래된 것부터 삭제한다.
+"""
+import hashlib
+import os
+import threading
+from typing import Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.abspath(os.path.join(BASE_DIR, "..", "cache", "render")))
+MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_MB", "512")) * 1024 * 1024
+# 응답 헤더용 (내용이 바뀌면 ETag가 바뀌므로 길게 잡아도 안전)
+CACHE_CONTROL = os.getenv("RENDER_CACHE_CONTROL", "private, max-age=86400")
+
+_lock = threading.Lock()
+_total_bytes: Optional[int] = None  # 첫 사용 시 디렉터리를 한 번 스캔해서 채움
+
+# 파일 해시 메모: (절대경로) → (size, mtime_ns, sha256)
+_digest_memo: dict = {}
+_DIGEST_MEMO_MAX = 1024
+
+
+def file_digest(path: str) -> str:
+    """PDF 파일 내용 sha256. 크기/mtime이 같으면 다시 읽지 않는다."""
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    memo = _digest_memo.get(abs_path)
+    if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+        return memo[2]
+
+    h = hashlib.sha256()
+    with open(abs_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    digest = h.hexdigest()
+
+    if len(_digest_memo) >= _DIGEST_MEMO_MAX:
+        _digest_memo.pop(next(iter(_digest_memo)))
+    _digest_memo[abs_path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def make_key(file_hash: str, *parts) -> str:
+    """파일 해시 + 렌더링 파라미터(페이지, 배율, 포맷 등)로 캐시 키 생성"""
+    raw = "|".join([file_hash, *[str(p) for p in parts]])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def make_etag(key: str) -> str:
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더 비교 (쉼표 목록, *, W/ 접두어 허용 - RFC 7232 약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _path_for(key: str, ext: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.{ext}")
+
+
+def _scan_total_bytes() -> int:
+    total = 0
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def get(key: str, ext: str) -> Optional[bytes]:
+    path = _path_for(key, ext)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)  # LRU: 최근 사용 시각 갱신
+    except OSError:
+        pass
+    return data
+
+
+def put(key: str, ext: str, data: bytes):
+    global _total_bytes
+    path = _path_for(key, ext)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # 같은 키를 동시에 쓰더라도 깨진 파일이 보이지 않도록 임시 파일 → rename
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    existed = os.path.exists(path)
+    os.replace(tmp_path, path)
+
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = _scan_total_bytes()
+        elif not existed:
+            _total_bytes += len(data)
+        if _total_bytes > MAX_BYTES:
+            _evict_locked()
+
+
+def _evict_locked():
+    """mtime이 오래된 파일부터 지워서 상한의 90%까지 줄인다."""
+    global _total_bytes
+    entries = []
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            p = os.path.join(root, name)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    target = int(MAX_BYTES * 0.9)
+    removed = 0
+    for _, size, p in entries:
+        if total <= target:
+            break
+        try:
+            os.remove(p)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    _total_bytes = total
+    print(f"🧹 렌더 캐시 정리: {removed}개 삭제, 현재 {total / 1024 / 1024:.1f}MB")
+
+
+def stats() -> dict:
+    with _lock:
+        total = _total_bytes if _total_bytes is not None else _scan_total_bytes()
+    return {"dir": CACHE_DIR, "bytes": total, "max_bytes": MAX_BYTES}
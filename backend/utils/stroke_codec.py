@@ -0,0 +1,253 @@
+# backend/utils/stroke_codec.py
+"""
+필기(펜 스트로크) 바이너리 압축 포맷
+
+PdfAnnotation.data(JSON) 에 점마다 {"x": .., "y": ..} 를 넣으면 필기가 많은 페이지는 수 MB JSON 이 되고
+저장/파싱/전송이 모두 느려진다. annotation_type == "pen_packed" 인 필기는 이 포맷으로 PdfAnnotation.stroke_data(BLOB)에 저장한다.
+
+- 좌표: 1/COORD_SCALE 단위로 양자화한 정수, 스트로크 첫 점만 int32 절대값이고 나머지는 이전 점과의 차이(int16)
+  (차이가 int16 을 넘는 스트로크만 int32 로 저장)
+- 필압: 0~1 → uint8 (점 중 하나라도 pressure 가 있으면 저장, 일부 점에만 있으면 있는 점 비트마스크도 저장)
+- 색/굵기/펜 종류는 스트로크마다 한 번, 그 밖의 키는 스트로크별 JSON(extra)으로 보존
+  · 원본에 없던 strokeWidth/penType/pressure 는 디코딩 결과에도 없음 (기본값을 채우지 않음)
+  · 고정 필드로 그대로 되살릴 수 없는 값(대문자 색, float32 로 안 맞는 굵기 등)은 extra 로
+- 본문이 COMPRESS_MIN_BYTES 이상이면 zlib 압축 (줄어들 때만)
+
+decode_strokes(encode_strokes(lines)) 는 아래 양자화 오차 말고는 원본과 같다:
+- 좌표 x, y: ±1/(2*COORD_SCALE) (float 로 돌려줌)
+- 필압: 0~1 로 잘라서 ±1/510, 소수 넷째 자리까지
+- 점은 x/y/pressure 만 보존 ([x, y, p] 목록 점도 dict 로, "pressure": null 은 없는 것으로)
+COORD_SCALE 이 2의 거듭제곱이라 디코딩한 값을 다시 인코딩하면 바이트까지 같다.
+
+포맷 (little-endian):
+    헤더   magic "STK", version u8, flags u8 (bit0 = zlib), scale u16, stroke_count u32
+    본문   스트로크마다
+           color u32, width f32, flags u8, pen_len u8, extra_len u32, n_points u32, x0 i32, y0 i32
+           pen_type (utf-8), extra (JSON utf-8)
+           (n_points-1) × (dx, dy)  int16 또는 int32 (flags bit1)
+           n_points × pressure u8 (flags bit0)
+           ceil(n_points/8) 바이트 pressure 있는 점 비트마스크 (flags bit5, little bit order)
+    flags: bit0 필압, bit1 int32 차이, bit2 색, bit3 굵기, bit4 펜 종류, bit5 필압 마스크
+    (version 1 데이터는 굵기/펜 종류가 항상 있는 것으로 읽음)
+"""
+import json
+import struct
+import zlib
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+MAGIC = b"STK"
+COORD_SCALE = 16            # 1/16 논리 픽셀
+COMPRESS_MIN_BYTES = 512
+
+_HEADER = struct.Struct("<3sBBHI")
+_STROKE = struct.Struct("<IfBBIIii")
+_FLAG_ZLIB = 0x01
+_STROKE_PRESSURE = 0x01
+_STROKE_WIDE = 0x02
+_STROKE_COLOR = 0x04
+_STROKE_WIDTH = 0x08
+_STROKE_PEN = 0x10
+_STROKE_PRESSURE_MASK = 0x20
+_KNOWN_KEYS = {"points", "color", "strokeWidth", "penType"}
+_INT16_MAX = 32767
+
+
+class StrokeCodecError(ValueError):
+    """깨졌거나 모르는 버전의 스트로크 데이터"""
+
+
+class Stroke(NamedTuple):
+    xs: np.ndarray                  # float64
+    ys: np.ndarray
+    pressure: Optional[np.ndarray]  # float64 0~1 (pressure 없는 점은 NaN), 하나도 없으면 None
+    color: Optional[str]            # "ff000000" (프런트의 toRadixString(16) 형식)
+    stroke_width: Optional[float]
+    pen_type: Optional[str]
+    extra: dict
+
+
+def _point_xyp(point):
+    if isinstance(point, dict):
+        return point["x"], point["y"], point.get("pressure")
+    return point[0], point[1], point[2] if len(point) > 2 else None
+
+
+def _encode_line(line: dict, scale: int) -> bytes:
+    points = line.get("points") or []
+    xyp = [_point_xyp(p) for p in points]
+    n = len(xyp)
+
+    flags = 0
+    extra = {k: v for k, v in line.items() if k not in _KNOWN_KEYS}
+    color = line.get("color")
+    color_value = 0
+    if isinstance(color, str):
+        try:
+            color_value = int(color, 16)
+            flags |= _STROKE_COLOR if 0 <= color_value <= 0xFFFFFFFF and format(color_value, "x") == color else 0
+        except ValueError:
+            pass
+    if "color" in line and not flags & _STROKE_COLOR:
+        extra["color"] = color  # 대문자/0 채움/null 등 그대로 못 되살리는 값은 JSON 으로
+        color_value = 0
+
+    width = 0.0
+    if "strokeWidth" in line:
+        value = line["strokeWidth"]
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and _width_round_trips(value):
+            flags |= _STROKE_WIDTH
+            width = float(value)
+        else:
+            extra["strokeWidth"] = value
+    pen = b""
+    if "penType" in line:
+        value = line["penType"]
+        pen = value.encode("utf-8") if isinstance(value, str) else b""
+        if isinstance(value, str) and len(pen) <= 255:
+            flags |= _STROKE_PEN
+        else:
+            extra["penType"] = value
+            pen = b""
+
+    q = np.rint(np.asarray([(x, y) for x, y, _ in xyp], dtype=np.float64).reshape(n, 2) * scale).astype(np.int64)
+    if n and np.abs(q[0]).max() > 2**31 - 1:
+        raise StrokeCodecError("좌표가 너무 큽니다")
+    deltas = np.diff(q, axis=0)
+    if deltas.size and np.abs(deltas).max() > _INT16_MAX:
+        flags |= _STROKE_WIDE
+    body = deltas.astype("<i4" if flags & _STROKE_WIDE else "<i2").tobytes()
+
+    has_pressure = [p is not None for _, _, p in xyp]
+    if any(has_pressure):
+        flags |= _STROKE_PRESSURE
+        pressure = np.asarray([0.0 if p is None else p for _, _, p in xyp], dtype=np.float64)
+        body += np.rint(np.clip(pressure, 0.0, 1.0) * 255).astype(np.uint8).tobytes()
+        if not all(has_pressure):
+            flags |= _STROKE_PRESSURE_MASK
+            body += np.packbits(np.asarray(has_pressure, dtype=bool), bitorder="little").tobytes()
+
+    extra_bytes = json.dumps(extra, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extra else b""
+    x0, y0 = (int(q[0, 0]), int(q[0, 1])) if n else (0, 0)
+    head = _STROKE.pack(color_value, width, flags, len(pen), len(extra_bytes), n, x0, y0)
+    return head + pen + extra_bytes + body
+
+
+def _width_round_trips(value) -> bool:
+    """float32 로 저장했다가 소수 넷째 자리로 돌려도 같은 굵기인지"""
+    packed = struct.unpack("<f", struct.pack("<f", value))[0]
+    return round(packed, 4) == value
+
+
+def encode_strokes(lines: List[dict], scale: int = COORD_SCALE, compress: Optional[bool] = None) -> bytes:
+    """프런트 JSON 의 lines 목록 → 바이트 (compress=None 이면 크기 보고 결정)"""
+    try:
+        body = b"".join(_encode_line(line, scale) for line in lines)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise StrokeCodecError(f"스트로크 형식 오류: {e}") from e
+
+    flags = 0
+    if compress or (compress is None and len(body) >= COMPRESS_MIN_BYTES):
+        packed = zlib.compress(body, 6)
+        if compress or len(packed) < len(body):
+            body, flags = packed, _FLAG_ZLIB
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, flags, scale, len(lines)) + body
+
+
+def iter_strokes(data: bytes) -> Iterator[Stroke]:
+    """바이트 → Stroke (좌표는 NumPy 배열, 점마다 dict 를 만들지 않음)"""
+    if not data or len(data) < _HEADER.size:
+        raise StrokeCodecError("데이터가 비어 있거나 너무 짧습니다")
+    magic, version, flags, scale, count = _HEADER.unpack_from(data)
+    if magic != MAGIC or version not in _READABLE_VERSIONS or not scale:
+        raise StrokeCodecError(f"모르는 스트로크 포맷 (magic={magic!r}, version={version})")
+    body = memoryview(data)[_HEADER.size:]
+    if flags & _FLAG_ZLIB:
+        try:
+            body = memoryview(zlib.decompress(body))
+        except zlib.error as e:
+            raise StrokeCodecError(f"압축 해제 실패: {e}") from e
+
+    offset = 0
+    try:
+        for _ in range(count):
+            color, width, sflags, pen_len, extra_len, n, x0, y0 = _STROKE.unpack_from(body, offset)
+            offset += _STROKE.size
+            if version == 1:
+                sflags |= _STROKE_WIDTH | _STROKE_PEN
+            pen = bytes(body[offset:offset + pen_len]).decode("utf-8")
+            offset += pen_len
+            extra = json.loads(bytes(body[offset:offset + extra_len])) if extra_len else {}
+            offset += extra_len
+
+            dtype = np.dtype("<i4" if sflags & _STROKE_WIDE else "<i2")
+            q = np.empty((n, 2), dtype=np.int64)
+            if n:
+                deltas = np.frombuffer(body, dtype=dtype, count=(n - 1) * 2, offset=offset).reshape(n - 1, 2)
+                offset += deltas.nbytes
+                q[0] = (x0, y0)
+                np.cumsum(deltas, axis=0, out=q[1:])
+                q[1:] += q[0]
+
+            pressure = None
+            if sflags & _STROKE_PRESSURE:
+                pressure = np.frombuffer(body, dtype=np.uint8, count=n, offset=offset) / 255.0
+                offset += n
+                if sflags & _STROKE_PRESSURE_MASK:
+                    mask_len = (n + 7) // 8
+                    mask = np.unpackbits(
+                        np.frombuffer(body, dtype=np.uint8, count=mask_len, offset=offset), count=n, bitorder="little"
+                    )
+                    offset += mask_len
+                    pressure[mask == 0] = np.nan
+
+            yield Stroke(
+                xs=q[:, 0] / scale,
+                ys=q[:, 1] / scale,
+                pressure=pressure,
+                color=format(color, "x") if sflags & _STROKE_COLOR else _pop_typed(extra, "color", str),
+                stroke_width=round(width, 4) if sflags & _STROKE_WIDTH else _pop_typed(extra, "strokeWidth", (int, float)),
+                pen_type=pen if sflags & _STROKE_PEN else _pop_typed(extra, "penType", str),
+                extra=extra,
+            )
+    except (struct.error, ValueError) as e:
+        raise StrokeCodecError(f"스트로크 데이터가 깨졌습니다: {e}") from e
+    if offset != len(body):
+        raise StrokeCodecError("스트로크 데이터 길이가 맞지 않습니다")
+
+
+def _pop_typed(extra: dict, key: str, types):
+    """extra 로 빠졌던 고정 필드: 타입이 맞으면 꺼내고, null 등은 extra 에 남겨서 그대로 되살림"""
+    value = extra.get(key)
+    if isinstance(value, types) and not isinstance(value, bool):
+        return extra.pop(key)
+    return None
+
+
+def decode_strokes(data: bytes) -> List[dict]:
+    """바이트 → 프런트 JSON 과 같은 모양의 lines 목록 ({"x", "y"[, "pressure"]} 점, 원본에 없던 키는 넣지 않음)"""
+    lines = []
+    for s in iter_strokes(data):
+        xs, ys = s.xs.tolist(), s.ys.tolist()
+        if s.pressure is not None:
+            ps = np.round(s.pressure, 4).tolist()
+            points = [
+                {"x": x, "y": y} if p != p else {"x": x, "y": y, "pressure": p}  # NaN: pressure 없던 점
+                for x, y, p in zip(xs, ys, ps)
+            ]
+        else:
+            points = [{"x": x, "y": y} for x, y in zip(xs, ys)]
+        line = {"points": points}
+        if s.color is not None:
+            line["color"] = s.color
+        if s.stroke_width is not None:
+            line["strokeWidth"] = s.stroke_width
+        if s.pen_type is not None:
+            line["penType"] = s.pen_type
+        line.update(s.extra)
+        lines.append(line)
+    return lines
+
@@ -2,11 +2,24 @@
 
 import fitz  # PyMuPDF
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Dict, Iterable, List, Optional
 
-def generate_thumbnail(pdf_path: str, page_number: int, output_path: str, base_height: int = 400):
-    doc = fitz.open(pdf_path)
-    page = doc[page_number - 1]
+from utils.image_format import encode_pixmap, normalize_format, EXTENSIONS, IMAGE_QUALITY
+
+# 배치 썸네일 렌더링용 프로세스 수 (0 또는 1이면 현재 프로세스에서 처리)
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 이 페이지 수보다 작으면 프로세스 풀을 쓰지 않음 (프로세스 간 전달 비용이 더 큼)
+MIN_PAGES_FOR_POOL = 16
+# 썸네일 저장 포맷 (WebP를 못 쓰는 환경이면 PNG로 대체)
+THUMBNAIL_FORMAT = normalize_format(os.getenv("THUMBNAIL_FORMAT", "webp")) or "png"
+THUMBNAIL_EXT = EXTENSIONS[THUMBNAIL_FORMAT]
 
+
+def _render_thumbnail(page, output_path: str, base_height: int = 400, fmt: Optional[str] = None, quality: int = IMAGE_QUALITY):
     # 원본 비율 계산
     width = page.rect.width
     height = page.rect.height
@@ -24,7 +37,136 @@ def generate_thumbnail(pdf_path: str, page_number: int, output_path: str, base_h
     # 렌더링 (배경 흰색, 여백 없음)
     pix = page.get_pixmap(matrix=matrix, alpha=False)
 
-    # 저장
+    # 저장 (fmt를 안 주면 확장자 기준)
+    fmt = fmt or normalize_format(os.path.splitext(output_path)[1].lstrip(".")) or "png"
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    pix.save(output_path)
+    # 지연 생성 시 다른 요청이 쓰다 만 파일을 읽지 않도록 임시 파일 → rename
+    # (워커 프로세스끼리, 같은 프로세스의 스레드끼리도 겹치지 않게 pid + 스레드 id)
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_pixmap(pix, fmt, quality))
+    os.replace(tmp_path, output_path)
+
+
+def generate_thumbnail(pdf_path: str, page_number: int, output_path: str, base_height: int = 400):
+    doc = fitz.open(pdf_path)
+    page = doc[page_number - 1]
+    _render_thumbnail(page, output_path, base_height)
     doc.close()
+
+
+# ---------------------------------------------------------------------------
+# 배치 썸네일: 문서를 한 번만 열고, 페이지 구간을 프로세스 풀에 나눠서 렌더링
+# ---------------------------------------------------------------------------
+
+# 워커 프로세스마다 자기 fitz 핸들을 유지 (같은 문서의 다음 구간이 오면 재사용)
+_worker_doc = None
+_worker_doc_path = None
+
+
+def _open_worker_doc(pdf_path: str):
+    global _worker_doc, _worker_doc_path
+    if _worker_doc is None or _worker_doc_path != pdf_path:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        _worker_doc = fitz.open(pdf_path)
+        _worker_doc_path = pdf_path
+    return _worker_doc
+
+
+def _render_range(pdf_path: str, page_numbers: List[int], output_pattern: str, base_height: int) -> Dict[int, Optional[str]]:
+    """워커에서 실행: 한 구간의 페이지들을 렌더링하고 {page_number: 저장경로 or None} 반환"""
+    doc = _open_worker_doc(pdf_path)
+    results: Dict[int, Optional[str]] = {}
+    for page_number in page_numbers:
+        output_path = output_pattern.format(page=page_number)
+        try:
+            _render_thumbnail(doc[page_number - 1], output_path, base_height)
+            results[page_number] = output_path
+        except Exception as e:
+            print(f"⚠️ 페이지 {page_number} 썸네일 생성 실패: {e}")
+            results[page_number] = None
+    return results
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        # fork 대신 spawn: 서버 스레드/커넥션 상태를 자식에 복제하지 않도록
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+
+def _split_ranges(page_numbers: List[int], parts: int) -> List[List[int]]:
+    size = max(1, -(-len(page_numbers) // parts))  # ceil
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+
+def generate_thumbnails(
+    pdf_path: str,
+    page_numbers: Iterable[int],
+    output_pattern: str,
+    base_height: int = 400,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    여러 페이지 썸네일을 한 번에 생성한다.
+
+    Args:
+        page_numbers: 1부터 시작하는 페이지 번호들
+        output_pattern: 저장 경로 포맷 문자열, 예) "static/thumbnails/thumb_12_{page}.webp"
+                        (확장자로 저장 포맷 결정)
+        workers: 프로세스 수 (None이면 THUMBNAIL_WORKERS)
+
+    Returns:
+        dict: {
+            "results": {page_number: 저장 경로 (실패 시 None)},
+            "pages": 처리한 페이지 수,
+            "elapsed": 걸린 시간(초),
+            "pages_per_sec": 초당 페이지 수,
+            "workers": 사용한 프로세스 수
+        }
+    """
+    pages = sorted(set(page_numbers))
+    workers = THUMBNAIL_WORKERS if workers is None else workers
+    started = time.perf_counter()
+
+    results: Dict[int, Optional[str]] = {}
+    if workers <= 1 or len(pages) < MIN_PAGES_FOR_POOL:
+        workers = 1
+        with fitz.open(pdf_path) as doc:
+            for page_number in pages:
+                output_path = output_pattern.format(page=page_number)
+                try:
+                    _render_thumbnail(doc[page_number - 1], output_path, base_height)
+                    results[page_number] = output_path
+                except Exception as e:
+                    print(f"⚠️ 페이지 {page_number} 썸네일 생성 실패: {e}")
+                    results[page_number] = None
+    else:
+        pool = _get_pool(workers)
+        # 워커 수보다 조금 잘게 나눠서 페이지마다 렌더 시간이 달라도 고르게 분배
+        futures = [
+            pool.submit(_render_range, os.path.abspath(pdf_path), chunk, output_pattern, base_height)
+            for chunk in _split_ranges(pages, workers * 2)
+        ]
+        for f in futures:
+            results.update(f.result())
+
+    elapsed = time.perf_counter() - started
+    pages_per_sec = round(len(pages) / elapsed, 2) if elapsed > 0 else 0.0
+    print(f"🖼️ 썸네일 {len(pages)}장 생성: {elapsed:.2f}s ({pages_per_sec} pages/sec, workers={workers})")
+    return {
+        "results": results,
+        "pages": len(pages),
+        "elapsed": round(elapsed, 3),
+        "pages_per_sec": pages_per_sec,
+        "workers": workers,
+    }
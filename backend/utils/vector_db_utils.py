@@ -2,11 +2,13 @@
 import os, pickle
 import numpy as np
 from services.embedding_service import SAVE_PATH  # 메타 pkl 경로
+from services import vector_index_registry
 
 def _load_index_and_metadata(meta_pkl_path: str):
     """
     메타 파일 로드:
-      - 신포맷: {"index_path": ".../faiss.index", "chunks": [...]}
+      - 신포맷: {"index_path": ".../faiss.index", "chunk_store": ".../faiss_db.cstore"} (청크는 mmap, 전체를 읽지 않음)
+      - (하위호환) {"index_path": ".../faiss.index", "chunks": [...]}
       - (하위호환) 구포맷: {"index": serialized_bytes, "chunks": [...]}
       - (더 옛날) 튜플 (index, metadata) / index 단독
     """
@@ -19,6 +21,9 @@ def _load_index_and_metadata(meta_pkl_path: str):
             # 지연 임포트
             import faiss
             index = faiss.read_index(obj["index_path"])
+            if obj.get("chunk_store") and os.path.exists(obj["chunk_store"]):
+                from utils.chunk_store import ChunkStore
+                return index, ChunkStore(obj["chunk_store"])
             metadata = obj.get("chunks", [])
             return index, metadata
 
@@ -48,15 +53,16 @@ def _load_index_and_metadata(meta_pkl_path: str):
 
 def search_similar_chunks(query_embedding, top_k=3, db_path: str = SAVE_PATH):
     """
-    쿼리 임베딩으로 유사 청크 검색
+    쿼리 임베딩으로 유사 청크 검색 (인덱스/메타는 상주 레지스트리에서, pkl이 바뀌었을 때만 다시 읽음)
     """
     try:
         meta_path = os.path.abspath(db_path)
-        if not os.path.exists(meta_path):
+        resident = vector_index_registry.get_index(meta_path, loader=_load_index_and_metadata)
+        if resident is None:
             print(f"❌ search_similar_chunks: 메타 pkl 없음 → {meta_path}")
             return []
 
-        index, metadata = _load_index_and_metadata(meta_path)
+        index, metadata = resident.index, resident.payload
 
         D, I = index.search(np.array([query_embedding], dtype="float32"), top_k)
         print(f"🔍 검색 완료: 인덱스={I[0]}, 거리={D[0]}")